@@ -0,0 +1,39 @@
+"""
+Move reviewed logs of closed years from daily_logs to daily_logs_archive
+(see utils/log_archive.py). Safe to re-run; run it after year end, e.g.
+from cron.
+
+Usage:
+    python archive_logs.py [--before YYYY-MM-DD] [--department-id N] [--dry-run]
+"""
+import argparse
+from datetime import datetime
+from handlers.registry import load_models
+from utils.bulk_delete import archive_department_log_rows
+from utils.helpers import safe_close
+from utils.log_archive import archive_closed_logs
+from utils.session_manager import get_session
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Archive daily logs of closed years")
+    parser.add_argument("--before", help="archive logs dated before this day, at most the start of the oldest open "
+                                         "year (the default)")
+    parser.add_argument("--department-id", type=int, help="only archive logs of this department's employees")
+    parser.add_argument("--dry-run", action="store_true", help="only count what would be moved")
+    args = parser.parse_args()
+    before = datetime.strptime(args.before, "%Y-%m-%d").date() if args.before else None
+
+    load_models()
+    session = get_session()
+    try:
+        if args.department_id is not None:
+            counts = archive_department_log_rows(session, args.department_id, before=before, dry_run=args.dry_run)
+        else:
+            counts = archive_closed_logs(session, before=before, dry_run=args.dry_run)
+    except ValueError as e:
+        parser.error(str(e))
+    finally:
+        safe_close(session)
+    action = "Would move" if args.dry_run else "Moved"
+    print(f"{action} {counts['daily_logs']} logs and {counts['daily_log_changes']} changes dated before {counts['before']}")
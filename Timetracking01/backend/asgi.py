@@ -0,0 +1,15 @@
+"""
+ASGI entry point, e.g. `uvicorn asgi:application --workers 4`.
+
+Flask itself is a WSGI app and WsgiToAsgi does not change that: every
+request, async twins included, occupies a thread until its response is
+built, so concurrency per worker is still bounded by threads. Set
+ASYNC_HANDLERS=1 so the handlers with async twins (dashboard init,
+employee info) run their independent queries concurrently instead of one
+after another (see utils/async_db.py); that shortens those requests, it
+does not free their threads.
+"""
+from asgiref.wsgi import WsgiToAsgi
+from app import app
+
+application = WsgiToAsgi(app)
@@ -0,0 +1,171 @@
+"""
+Micro-benchmark of the hot read paths: the Query-API form the handlers used
+before, lambda_stmt(), and the prebuilt statements in utils/statements.py.
+
+By default it seeds an in-memory SQLite database, so the numbers are close
+to pure Python overhead (building, compiling/cache lookup, loading rows).
+Point --database-uri at a copy of a real database to include driver and
+network time; nothing is written to it.
+
+Usage:
+    python bench_queries.py [--iterations 5000] [--database-uri URI --employee-id N --project-id N]
+"""
+import argparse
+import time
+from datetime import date, time as clock, timedelta
+from sqlalchemy import create_engine, func, lambda_stmt, select
+from sqlalchemy.orm import Session
+from config.config import QUERY_CACHE_SIZE
+from handlers.registry import load_models
+from models.base import Base
+from models.dailylogchanges import DailyLogChange
+from models.dailylogs import DailyLog
+from models.department import Department
+from models.employee import Employee
+from models.project import Project
+from utils import statements
+
+
+def _seed(engine, today):
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(Department(id=1, name="Engineering"))
+        session.add(Employee(id=1, employee_name="Bench", email="bench@example.com", department_id=1))
+        session.add(Project(id=1, name="Bench", description=""))
+        for offset in range(7):
+            for hour in (9, 13):
+                session.add(DailyLog(
+                    employee_id=1, project_id=1, log_date=today - timedelta(days=offset),
+                    start_time=clock(hour), end_time=clock(hour + 3), total_hours=3.0,
+                    task_description="Bench", status_review="Pending",
+                ))
+        session.flush()
+        for log in session.query(DailyLog).filter_by(log_date=today):
+            session.add(DailyLogChange(daily_log_id=log.id, project_id=1, new_description="Bench"))
+        session.commit()
+
+
+def _legacy_cases(employee_id, project_id, today):
+    def project(session):
+        return session.query(Project).filter_by(id=project_id).first()
+
+    def timezone(session):
+        return (
+            session.query(func.coalesce(Employee.timezone, Department.timezone))
+            .select_from(Employee)
+            .outerjoin(Department, Department.id == Employee.department_id)
+            .filter(Employee.id == employee_id)
+            .first()
+        )
+
+    def todays_logs(session):
+        logs = session.query(DailyLog).filter_by(employee_id=employee_id, log_date=today).all()
+        return (
+            session.query(DailyLogChange)
+            .filter(DailyLogChange.daily_log_id.in_([log.id for log in logs]))
+            .order_by(DailyLogChange.id)
+            .all()
+        )
+
+    def seven_days(session):
+        return (
+            session.query(DailyLog)
+            .filter(
+                DailyLog.employee_id == employee_id,
+                DailyLog.log_date >= today - timedelta(days=6),
+                DailyLog.log_date <= today
+            )
+            .order_by(DailyLog.log_date.desc())
+            .all()
+        )
+
+    return {"get_project": project, "employee_timezone": timezone,
+            "get_todays_logs": todays_logs, "seven_days": seven_days}
+
+
+def _lambda_cases(employee_id, project_id, today):
+    start = today - timedelta(days=6)
+
+    def project(session):
+        return session.execute(
+            lambda_stmt(lambda: select(Project).where(Project.id == project_id))
+        ).scalar_one_or_none()
+
+    def timezone(session):
+        return session.execute(lambda_stmt(
+            lambda: select(func.coalesce(Employee.timezone, Department.timezone))
+            .select_from(Employee)
+            .outerjoin(Department, Department.id == Employee.department_id)
+            .where(Employee.id == employee_id)
+        )).first()
+
+    def todays_logs(session):
+        logs = session.execute(lambda_stmt(
+            lambda: select(DailyLog).where(DailyLog.employee_id == employee_id, DailyLog.log_date == today)
+        )).scalars().all()
+        log_ids = [log.id for log in logs]
+        return session.execute(lambda_stmt(
+            lambda: select(DailyLogChange).where(DailyLogChange.daily_log_id.in_(log_ids)).order_by(DailyLogChange.id)
+        )).scalars().all()
+
+    def seven_days(session):
+        return session.execute(lambda_stmt(
+            lambda: select(DailyLog)
+            .where(DailyLog.employee_id == employee_id, DailyLog.log_date >= start, DailyLog.log_date <= today)
+            .order_by(DailyLog.log_date.desc())
+        )).scalars().all()
+
+    return {"get_project": project, "employee_timezone": timezone,
+            "get_todays_logs": todays_logs, "seven_days": seven_days}
+
+
+def _prebuilt_cases(employee_id, project_id, today):
+    def todays_logs(session):
+        logs = statements.logs_on_day(session, employee_id, today)
+        return statements.changes_for_logs(session, [log.id for log in logs])
+
+    return {
+        "get_project": lambda session: statements.project_by_id(session, project_id),
+        "employee_timezone": lambda session: statements.employee_timezone_row(session, employee_id),
+        "get_todays_logs": todays_logs,
+        "seven_days": lambda session: statements.logs_between(session, employee_id, today - timedelta(days=6), today),
+    }
+
+
+def _per_call(engine, fn, iterations):
+    """Microseconds per call, each call on a fresh session like a request."""
+    for _ in range(min(iterations, 100)):  # warm the statement cache and the pool
+        with Session(engine) as session:
+            fn(session)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with Session(engine) as session:
+            fn(session)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def run_benchmark(database_uri, iterations, employee_id, project_id, today):
+    load_models()
+    engine = create_engine(database_uri, query_cache_size=QUERY_CACHE_SIZE)
+    if database_uri == "sqlite://":
+        _seed(engine, today)
+    variants = [cases(employee_id, project_id, today) for cases in (_legacy_cases, _lambda_cases, _prebuilt_cases)]
+    results = {name: [_per_call(engine, variant[name], iterations) for variant in variants] for name in variants[0]}
+    engine.dispose()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compare Query-API, lambda and prebuilt statements")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--database-uri", default="sqlite://", help="default: seeded in-memory SQLite")
+    parser.add_argument("--employee-id", type=int, default=1)
+    parser.add_argument("--project-id", type=int, default=1)
+    parser.add_argument("--date", help="'today' for the log queries, YYYY-MM-DD (default: today)")
+    args = parser.parse_args()
+    today = date.fromisoformat(args.date) if args.date else date.today()
+
+    results = run_benchmark(args.database_uri, args.iterations, args.employee_id, args.project_id, today)
+    print(f"{'us per call':<20}{'query api':>11}{'lambda':>9}{'prebuilt':>10}{'speedup':>9}")
+    for name, (legacy_us, lambda_us, prebuilt_us) in results.items():
+        print(f"{name:<20}{legacy_us:>11.1f}{lambda_us:>9.1f}{prebuilt_us:>10.1f}{legacy_us / prebuilt_us:>8.2f}x")
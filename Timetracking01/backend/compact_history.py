@@ -0,0 +1,29 @@
+"""
+Compact daily log change history (see utils/history.py): move inline
+descriptions into description_blobs, squash intermediate versions of
+approved logs, and delete unreferenced blobs. Safe to re-run, e.g. nightly.
+
+Usage:
+    python compact_history.py [--older-than-days N]
+"""
+import argparse
+from config.config import HISTORY_COMPACT_AFTER_DAYS
+from handlers.registry import load_models
+from utils.helpers import safe_close
+from utils.history import compact_history
+from utils.session_manager import get_session
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Compact daily log change history")
+    parser.add_argument("--older-than-days", type=int, default=HISTORY_COMPACT_AFTER_DAYS,
+                        help="only squash approved logs unchanged for this many days")
+    args = parser.parse_args()
+
+    load_models()
+    session = get_session()
+    try:
+        counts = compact_history(session, older_than_days=args.older_than_days)
+    finally:
+        safe_close(session)
+    print(", ".join(f"{name.replace('_', ' ')}: {count}" for name, count in counts.items()))
@@ -11,6 +11,11 @@ import models.dailylogs
 import models.dailylogchanges
 import models.employeeproject
 import models.managerproject
+import models.employeelogversion
+import models.dailylogoccupancy
+import models.dailylogarchive
+import models.descriptionblob
+import models.idempotencykey
 
 engine = create_engine(SQLALCHEMY_DATABASE_URI)
 
@@ -0,0 +1,275 @@
+"""
+Export daily_logs, daily_log_changes, employees and projects to a columnar
+snapshot for offline analytics, so heavy queries do not hit the OLTP DB.
+
+Layout (Parquet by default, or Arrow IPC files with --format arrow, which
+can be memory-mapped with pyarrow.memory_map):
+
+    <out>/daily_logs/month=YYYY-MM/data.parquet          by log_date
+    <out>/daily_log_changes/month=YYYY-MM/data.parquet   by changed_at
+    <out>/employees/data.parquet
+    <out>/projects/data.parquet
+    <out>/_state.json
+
+Logs moved to daily_logs_archive (archive_logs.py) are exported with the
+live ones; ids are kept when rows are archived, so moving them does not
+touch any partition.
+
+Runs are incremental. _state.json keeps each log table's highest exported id
+and updated_at. The next run only rewrites the month partitions that hold
+rows with a higher id or a newer updated_at, because logs are edited after
+insert, plus the partitions that held an updated row before (its date may
+have moved to another month). employees and projects are small and
+rewritten every run. Deleted rows are only dropped from a partition when it
+is next rewritten; use --full to rebuild everything.
+
+Usage:
+    python export_snapshot.py --out /data/tms_snapshot [--format arrow] [--full]
+"""
+import argparse
+import json
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, select, func, or_, union_all
+from config.config import SQLALCHEMY_DATABASE_URI, FEED_OVERLAP_SECONDS
+from models.dailylogs import DailyLog
+from models.descriptionblob import DescriptionBlob
+from models.dailylogarchive import ArchivedDailyLog, ArchivedDailyLogChange
+from models.dailylogchanges import DailyLogChange
+from models.employee import Employee
+from models.project import Project
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # only needed by this script
+    pa = pc = pq = None
+
+
+BATCH_SIZE = 50000
+
+
+def _schemas():
+    return {
+        "daily_logs": pa.schema([
+            ("id", pa.int64()),
+            ("employee_id", pa.int64()),
+            ("project_id", pa.int64()),
+            ("log_date", pa.date32()),
+            ("start_time", pa.time32("s")),
+            ("end_time", pa.time32("s")),
+            ("total_hours", pa.float64()),
+            ("task_description", pa.string()),
+            ("status_review", pa.string()),
+            ("reviewer_id", pa.int64()),
+            ("rejection_reason", pa.string()),
+            ("updated_at", pa.timestamp("us")),
+        ]),
+        "daily_log_changes": pa.schema([
+            ("id", pa.int64()),
+            ("daily_log_id", pa.int64()),
+            ("project_id", pa.int64()),
+            ("changed_at", pa.timestamp("us")),
+            ("new_description", pa.string()),
+            ("status_review", pa.string()),
+            ("reviewer_id", pa.int64()),
+            ("rejection_reason", pa.string()),
+            ("updated_at", pa.timestamp("us")),
+        ]),
+        "employees": pa.schema([
+            ("id", pa.int64()),
+            ("employee_name", pa.string()),
+            ("email", pa.string()),
+            ("department_id", pa.int64()),
+            ("designation_id", pa.int64()),
+            ("reports_to_id", pa.int64()),
+            ("timezone", pa.string()),
+        ]),
+        "projects": pa.schema([
+            ("id", pa.int64()),
+            ("name", pa.string()),
+            ("description", pa.string()),
+        ]),
+    }
+
+
+# Core tables only: the export never needs the ORM mappers.
+# name -> ((hot table, archive table), column the partition month is taken from)
+PARTITIONED = {
+    "daily_logs": ((DailyLog.__table__, ArchivedDailyLog.__table__), "log_date"),
+    "daily_log_changes": ((DailyLogChange.__table__, ArchivedDailyLogChange.__table__), "changed_at"),
+}
+UNPARTITIONED = {
+    "employees": Employee.__table__,
+    "projects": Project.__table__,
+}
+
+
+def _column(table, name):
+    """table.c[name], with change descriptions resolved from description_blobs."""
+    if name == "new_description":
+        blobs = DescriptionBlob.__table__
+        body = select(blobs.c.body).where(blobs.c.hash == table.c.description_hash).scalar_subquery()
+        return func.coalesce(table.c.new_description, body).label(name)
+    return table.c[name]
+
+
+def _month_bounds(month):
+    start = datetime.strptime(month, "%Y-%m")
+    end = (start + timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def _write_table(path, batches, schema, fmt):
+    """Write record batches to path atomically (readers never see a partial file)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    if fmt == "arrow":
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+    else:
+        with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+    os.replace(tmp_path, path)
+
+
+def _record_batches(conn, statement, schema):
+    names = schema.names
+    result = conn.execution_options(stream_results=True, yield_per=BATCH_SIZE).execute(statement)
+    for rows in result.partitions(BATCH_SIZE):
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(column, type=schema.field(name).type) for name, column in zip(names, columns)],
+            schema=schema,
+        )
+
+
+def _export_month(conn, out_dir, name, month, schema, fmt):
+    tables, month_name = PARTITIONED[name]
+    start, end = _month_bounds(month)
+    if tables[0].c[month_name].type.python_type is not datetime:
+        start, end = start.date(), end.date()
+    # Filter each table before the union so both use their date index
+    rows = union_all(*[
+        select(*[_column(table, column) for column in schema.names])
+        .where(table.c[month_name] >= start, table.c[month_name] < end)
+        for table in tables
+    ]).subquery()
+    statement = select(*[rows.c[column] for column in schema.names]).order_by(rows.c.id)
+    path = os.path.join(out_dir, name, f"month={month}", f"data.{fmt}")
+    batches = _record_batches(conn, statement, schema)
+    _write_table(path, batches, schema, fmt)
+
+
+def _read_ids(path, fmt):
+    if fmt == "arrow":
+        with pa.memory_map(path) as source:
+            return pa.ipc.open_file(source).read_all().column("id")
+    return pq.read_table(path, columns=["id"]).column("id")
+
+
+def _months_holding(out_dir, name, ids, fmt):
+    """Exported months whose partition contains any of ids (only the id column is read)."""
+    root = os.path.join(out_dir, name)
+    if not ids or not os.path.isdir(root):
+        return set()
+    wanted = pa.array(sorted(ids), type=pa.int64())
+    months = set()
+    for entry in os.listdir(root):
+        path = os.path.join(root, entry, f"data.{fmt}")
+        if entry.startswith("month=") and os.path.exists(path):
+            if pc.any(pc.is_in(_read_ids(path, fmt), value_set=wanted)).as_py():
+                months.add(entry[len("month="):])
+    return months
+
+
+def _affected_months(conn, out_dir, name, fmt, last_id, last_updated_at):
+    """
+    Months to rewrite: those holding rows inserted or updated since the
+    previous run, plus the months the updated rows were exported under
+    before, so a log whose date moved to another month leaves no stale copy.
+    """
+    tables, month_name = PARTITIONED[name]
+    months, changed_ids = set(), set()
+    for table in tables:
+        statement = select(table.c[month_name], table.c.id)
+        if last_id is not None:
+            # Re-read FEED_OVERLAP_SECONDS before the watermark for late commits
+            since = datetime.fromisoformat(last_updated_at) - timedelta(seconds=FEED_OVERLAP_SECONDS)
+            statement = statement.where(or_(table.c.id > last_id, table.c.updated_at > since))
+        for value, row_id in conn.execute(statement):
+            if value:
+                months.add(value.strftime("%Y-%m"))
+            if last_id is not None and row_id <= last_id:
+                changed_ids.add(row_id)
+    months |= _months_holding(out_dir, name, changed_ids, fmt)
+    return sorted(months)
+
+
+def _watermark(conn, tables):
+    """Highest id and updated_at across the hot and archive tables."""
+    ids, stamps = [], []
+    for table in tables:
+        last_id, last_updated_at = conn.execute(select(func.max(table.c.id), func.max(table.c.updated_at))).one()
+        ids += [last_id] if last_id is not None else []
+        stamps += [last_updated_at] if last_updated_at is not None else []
+    return max(ids, default=None), max(stamps, default=None)
+
+
+def export_snapshot(out_dir, fmt="parquet", full=False, database_uri=SQLALCHEMY_DATABASE_URI):
+    if pa is None:
+        raise RuntimeError("pyarrow is required: pip install pyarrow")
+    schemas = _schemas()
+    state_path = os.path.join(out_dir, "_state.json")
+    state = {}
+    if not full and os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+        if state.get("format") != fmt:
+            state = {}  # format changed: rebuild everything
+    summary = {}
+
+    engine = create_engine(database_uri)
+    with engine.connect() as conn:
+        new_state = {"format": fmt, "tables": {}}
+        for name, (tables, _) in PARTITIONED.items():
+            previous = state.get("tables", {}).get(name, {})
+            # Take the watermark before reading so rows written meanwhile are caught next run
+            last_id, last_updated_at = _watermark(conn, tables)
+            months = _affected_months(
+                conn, out_dir, name, fmt, previous.get("last_id"), previous.get("last_updated_at")
+            )
+            for month in months:
+                _export_month(conn, out_dir, name, month, schemas[name], fmt)
+            new_state["tables"][name] = {
+                "last_id": last_id if last_id is not None else previous.get("last_id"),
+                "last_updated_at": (last_updated_at.isoformat() if last_updated_at
+                                    else previous.get("last_updated_at")),
+            }
+            summary[name] = months
+
+        for name, table in UNPARTITIONED.items():
+            schema = schemas[name]
+            statement = select(*[table.c[column] for column in schema.names]).order_by(table.c.id)
+            _write_table(os.path.join(out_dir, name, f"data.{fmt}"), _record_batches(conn, statement, schema), schema, fmt)
+            summary[name] = "full"
+
+    engine.dispose()
+    os.makedirs(out_dir, exist_ok=True)
+    with open(state_path + ".tmp", "w") as f:
+        json.dump(new_state, f, indent=2)
+    os.replace(state_path + ".tmp", state_path)
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export a columnar analytics snapshot")
+    parser.add_argument("--out", required=True, help="snapshot directory")
+    parser.add_argument("--format", choices=("parquet", "arrow"), default="parquet")
+    parser.add_argument("--full", action="store_true", help="ignore the previous state and rewrite every partition")
+    args = parser.parse_args()
+    for table, months in export_snapshot(args.out, args.format, args.full).items():
+        print(f"{table}: {months if months else 'up to date'}")
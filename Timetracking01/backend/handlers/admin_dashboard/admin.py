@@ -1,33 +1,30 @@
 from flask import request, jsonify
-from models.dailylogs import DailyLog
+from sqlalchemy import select, func, and_
+from models.employee import Employee
 from utils.session_manager  import get_session
+from utils.helpers import safe_close
+from utils.custom_responses import create_json_object_response
+from utils.hierarchy import subtree_cte
+from utils.filters import LogFilterSpec
+from utils.log_archive import log_source, query_logs
 
 
 
 
 # Handler for analytics on timesheets
 def analytics_timesheet():
-    status = request.args.get("status_review")  # e.g., "approved", "pending", "rejected"
-    start_date = request.args.get("start_date") # e.g., "2025-08-01"
-    end_date = request.args.get("end_date")     # e.g., "2025-08-31"
-    employee_id = request.args.get("employee_id")
-    project_id = request.args.get("project_id")
+    # status_review: "approved", "pending", "rejected" (any case); dates: "2025-08-01"
+    try:
+        spec = LogFilterSpec.from_args(
+            request.args,
+            allowed=("status_review", "start_date", "end_date", "employee_id", "project_id"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
     session = get_session()
     try:
-        query = session.query(DailyLog)
-        if status:
-            query = query.filter(DailyLog.status_review == status)
-        if start_date:
-            query = query.filter(DailyLog.log_date >= start_date)
-        if end_date:
-            query = query.filter(DailyLog.log_date <= end_date)
-        if employee_id:
-            query = query.filter(DailyLog.employee_id == employee_id)
-        if project_id:
-            query = query.filter(DailyLog.project_id == project_id)
-
-        logs = query.all()
+        logs = query_logs(session, spec)
         # Example analytics: count, total hours, group by status, etc.
         total_logs = len(logs)
         total_hours = sum([log.total_hours or 0 for log in logs])
@@ -36,11 +33,123 @@ def analytics_timesheet():
             key = log.status_review or "unknown"
             status_counts[key] = status_counts.get(key, 0) + 1
 
-        return jsonify({
-            "total_logs": total_logs,
-            "total_hours": total_hours,
-            "status_counts": status_counts,
-            "logs": [log.as_dict() for log in logs],  # Optional: remove if you want only analytics
-        })
+        # Streamed: the logs array can run to several megabytes
+        return create_json_object_response([
+            ("logs", [log.as_dict() for log in logs]),  # Optional: remove if you want only analytics
+            ("status_counts", status_counts),
+            ("total_hours", total_hours),
+            ("total_logs", total_logs),
+        ])
     finally:
         session.close()
+
+
+
+def _week_start(dialect_name, column):
+    """SQL expression for the Monday of column's ISO week."""
+    if dialect_name == "mysql":
+        return func.subdate(column, func.weekday(column))
+    if dialect_name == "postgresql":
+        return func.date(func.date_trunc("week", column))
+    return func.date(column, "-6 days", "weekday 1")
+
+
+# Handler for a manager's reporting-subtree hours
+def subtree_hours_rollup(manager_id):
+    """
+    Hours of a manager and everyone under them, by employee, project and week.
+
+    Query Parameters:
+      - start_date: string (YYYY-MM-DD, optional)
+      - end_date: string (YYYY-MM-DD, optional)
+    Returns:
+      {
+        "manager_id": int,
+        "total_hours": float,
+        "tree": {"id", "employee_name", "hours": [[project_id, week_start, hours], ...],
+                 "total_hours", "subtree_hours", "reports": [...]}
+      }
+    """
+    try:
+        spec = LogFilterSpec.from_args(request.args, allowed=("start_date", "end_date"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    start_date, end_date = spec.start_date, spec.end_date
+
+    session = get_session()
+    try:
+        tree = subtree_cte(manager_id)
+        # Hot table, or hot + archive when the range reaches closed years
+        logs = log_source(spec, "employee_id", "project_id", "log_date", "total_hours")
+        week = _week_start(session.get_bind().dialect.name, logs.c.log_date)
+        log_join = [logs.c.employee_id == tree.c.employee_id]
+        if start_date:
+            log_join.append(logs.c.log_date >= start_date)
+        if end_date:
+            log_join.append(logs.c.log_date <= end_date)
+
+        # One round trip: subtree resolution, names and the aggregate. The
+        # outer join keeps reports with no logs in the tree.
+        rows = session.execute(
+            select(
+                tree.c.employee_id,
+                tree.c.reports_to_id,
+                tree.c.depth,
+                Employee.employee_name,
+                logs.c.project_id,
+                week.label("week_start"),
+                func.sum(logs.c.total_hours),
+            )
+            .join(Employee, Employee.id == tree.c.employee_id)
+            .outerjoin(logs, and_(*log_join))
+            .group_by(
+                tree.c.employee_id, tree.c.reports_to_id, tree.c.depth,
+                Employee.employee_name, logs.c.project_id, week
+            )
+            .order_by(tree.c.depth, tree.c.employee_id)
+        ).all()
+        if not rows:
+            return jsonify({"error": "Manager not found"}), 404
+
+        nodes = {}
+        for employee_id, reports_to_id, depth, name, project_id, week_start, hours in rows:
+            node = nodes.get(employee_id)
+            if node is None:
+                node = nodes[employee_id] = {
+                    "id": employee_id,
+                    "employee_name": name,
+                    "depth": depth,
+                    "parent": reports_to_id,
+                    "hours": [],
+                    "total_hours": 0.0,
+                    "reports": []
+                }
+            if hours is not None:
+                node["hours"].append([project_id, str(week_start), round(hours, 2)])
+                node["total_hours"] += hours
+
+        # Walk deepest-first so every child's subtree total is final before
+        # it is attached to its parent.
+        ordered = sorted(nodes.values(), key=lambda n: n["depth"], reverse=True)
+        for node in ordered:
+            node["total_hours"] = round(node["total_hours"], 2)
+            node["subtree_hours"] = round(
+                node["total_hours"] + sum(child["subtree_hours"] for child in node["reports"]), 2
+            )
+            parent = nodes.get(node.pop("parent"))
+            if node["id"] != manager_id and parent is not None:
+                parent["reports"].append(node)
+            node.pop("depth")
+
+        root = nodes[manager_id]
+        return jsonify({
+            "manager_id": manager_id,
+            "start_date": start_date.isoformat() if start_date else None,
+            "end_date": end_date.isoformat() if end_date else None,
+            "total_hours": root["subtree_hours"],
+            "tree": root
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        safe_close(session)
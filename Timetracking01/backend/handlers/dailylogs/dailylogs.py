@@ -3,333 +3,378 @@ from utils.helpers import safe_close
 from models.dailylogs import DailyLog 
 from models.dailylogchanges import DailyLogChange
 from models.employee import Employee
-from flask import Flask, jsonify, request
+from flask import jsonify, request, Response, stream_with_context
 from datetime import datetime,timedelta 
-from pytz import timezone 
 from utils.helpers import get_total_hours, parse_time, validate_time
-from sqlalchemy.exc import IntegrityError
 from models.project import Project
-
-
-
+from config.config import FEED_OVERLAP_SECONDS, FEED_MAX_LIMIT, REPLICA_STICKY_SECONDS
+from utils.event_bus import publish, subscribe
+from utils.custom_responses import create_json_array_response
+from utils.filters import LogFilterSpec
+from utils.log_archive import log_models, query_logs
+from utils.history import record_change
+from utils.statements import changes_for_logs, logs_between, logs_on_day
+from utils.autosave import autosave_buffer
+from utils.idempotency import idempotent, stage_outcome
+from utils.occupancy import claim_log_interval, masks_by_date
+from utils.timezones import get_employee_timezone, local_today
+from utils.log_versions import bump_log_versions, log_cache_validators, is_not_modified, not_modified_response, add_cache_validators
+import json
+import base64
+from sqlalchemy import and_, or_
 
 
 
 def get_daily_logs_by_employeee():
+    try:
+        spec = LogFilterSpec.from_args(request.args, allowed=("employee_id",), required=("employee_id",))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    employee_id = spec.employee_id
+
     session = get_session()
     try:
-        employee_id = request.args.get("employee_id", type=int)
-        if not employee_id:
-            return jsonify({"error": "employee_id is required"}), 400
+        etag, last_modified = log_cache_validators(session, employee_id)
+        if is_not_modified(etag):
+            return not_modified_response(etag, last_modified)
         employee = session.get(Employee, employee_id)
         if not employee:
             return jsonify({"error": "Employee not found"}), 404
-        daily_logs = session.query(DailyLog).filter_by(employee_id=employee_id).order_by(DailyLog.log_date.desc()).all()
-        return jsonify([log.as_dict() for log in daily_logs]), 200
+        # No date range: every log of the employee, archived years included
+        daily_logs = query_logs(session, spec, newest_first=True)
+        response = create_json_array_response([log.as_dict() for log in daily_logs])
+        return add_cache_validators(response, etag, last_modified)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     finally:
         safe_close(session)
 
 
+def _session_after_autosave_flush(employee_id):
+    """
+    Flush the employee's buffered autosaves and return a session for reading
+    their logs: the primary if autosaves were written just now or within
+    REPLICA_STICKY_SECONDS, since a lagging replica would still return the
+    logs from before.
+    """
+    wrote = autosave_buffer.flush_employees([employee_id])
+    if wrote or autosave_buffer.written_within([employee_id], REPLICA_STICKY_SECONDS):
+        return get_session(use_replica=False)
+    return get_session()
+
+
 def get_latest_seven_days_daily_logs(employee_id):
-    session = get_session()
+    session = _session_after_autosave_flush(employee_id)
     try:
-        today = datetime.now(timezone('Asia/Kolkata')).date()
-        seven_days_ago = today - timedelta(days=6)
-        logs = (
-            session.query(DailyLog)
-            .filter(
-                DailyLog.employee_id == employee_id,
-                DailyLog.log_date >= seven_days_ago,
-                DailyLog.log_date <= today
-            )
-            .order_by(DailyLog.log_date.desc())
-            .all()
-        )
-        if not session.get(Employee, employee_id):
+        tz_name = get_employee_timezone(session, employee_id)
+        if tz_name is None:
             return jsonify({"error": "Employee not found"}), 404
-        return jsonify([log.as_dict() for log in logs]), 200
+        # log_date is the employee's local calendar date, so "today" is
+        # resolved in their zone and the range stays a plain date scan.
+        today = local_today(tz_name).local_date
+        seven_days_ago = today - timedelta(days=6)
+        # The window rolls daily, so the date is part of the ETag
+        etag, last_modified = log_cache_validators(session, employee_id, today)
+        if is_not_modified(etag):
+            return not_modified_response(etag, last_modified)
+        logs = logs_between(session, employee_id, seven_days_ago, today)
+        return add_cache_validators(jsonify([log.as_dict() for log in logs]), etag, last_modified)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
     finally:
         safe_close(session)
 
 
-# def save_daily_logs():
-#     data = request.get_json()
-#     if not isinstance(data, list):
-#         return jsonify({"error": "Input must be a list of logs"}), 400
-#     session = get_session()
-#     try:
-#         for log_data in data:
-#             log_id = log_data.get("id")
-#             employee_id = log_data.get("employee_id")
-#             log_date = log_data.get("log_date")
-#             project_id = log_data.get("project_id")
-#             start_time = log_data.get("start_time")
-#             end_time = log_data.get("end_time")
-#             task_description = log_data.get("task_description")
-#             status_review = log_data.get("status_review", "Pending")
-#             reviewer_id = log_data.get("reviewer_id")
-#             if not all([employee_id, log_date, project_id, start_time, end_time, task_description]):
-#                 return jsonify({"error": "Missing required fields"}), 400
-#             if not validate_time(start_time) or not validate_time(end_time):
-#                 return jsonify({"error": "Invalid time format for start_time or end_time. Use HH:MM."}), 400
-#             try:
-#                 log_date = datetime.strptime(log_date, "%Y-%m-%d").date()
-#                 start_time_obj = parse_time(start_time)
-#                 end_time_obj = parse_time(end_time)
-#                 total_hours_float = get_total_hours(start_time_obj, end_time_obj)
-#             except ValueError as e:
-#                 return jsonify({"error": f"Invalid date or time format: {str(e)}"}), 400
-#             if total_hours_float <= 0:
-#                 return jsonify({"error": "End time must be after start time"}), 400
-#             employee = session.get(Employee, employee_id)
-#             if not employee:
-#                 return jsonify({"error": f"Employee with id {employee_id} not found"}), 404
-#             project = session.get(Project, project_id)
-#             if not project:
-#                 return jsonify({"error": f"Project with id {project_id} not found"}), 404
-#             if reviewer_id:
-#                 reviewer = session.get(Employee, reviewer_id)
-#                 if not reviewer:
-#                     return jsonify({"error": f"Reviewer with id {reviewer_id} not found"}), 404
-#             existing_logs = session.query(DailyLog).filter(
-#                 DailyLog.employee_id == employee_id,
-#                 DailyLog.log_date == log_date,
-#                 DailyLog.id != log_id if log_id else True
-#             ).all()
-#             for existing_log in existing_logs:
-#                 existing_start = existing_log.start_time
-#                 existing_end = existing_log.end_time
-#                 if start_time_obj < existing_end and end_time_obj > existing_start:
-#                     return jsonify({"error": f"Time range overlaps with existing log ID {existing_log.id}"}), 400
-#             if log_id and str(log_id).lower() != "null":
-#                 log = session.get(DailyLog, log_id)
-#                 if not log or log.employee_id != employee_id:
-#                     return jsonify({"error": f"Log with id {log_id} not found or does not belong to employee"}), 404
-#                 old_description = log.task_description
-#                 log.project_id = project_id
-#                 log.log_date = log_date
-#                 log.start_time = start_time_obj
-#                 log.end_time = end_time_obj
-#                 log.total_hours = total_hours_float
-#                 log.task_description = task_description
-#                 log.status_review = status_review
-#                 log.reviewer_id = reviewer_id
-#                 if old_description != task_description:
-#                     change = DailyLogChange(
-#                         daily_log_id=log.id,
-#                         project_id=project_id,
-#                         new_description=task_description,
-#                         status_review=status_review,
-#                         reviewer_id=reviewer_id,
-#                         changed_at=datetime.utcnow()
-#                     )
-#                     session.add(change)
-#             else:
-#                 log = DailyLog(
-#                     employee_id=employee_id,
-#                     log_date=log_date,
-#                     project_id=project_id,
-#                     start_time=start_time_obj,
-#                     end_time=end_time_obj,
-#                     total_hours=total_hours_float,
-#                     task_description=task_description,
-#                     status_review=status_review,
-#                     reviewer_id=reviewer_id
-#                 )
-#                 session.add(log)
-#                 session.flush()
-#                 change = DailyLogChange(
-#                     daily_log_id=log.id,
-#                     project_id=project_id,
-#                     new_description=task_description,
-#                     status_review=status_review,
-#                     reviewer_id=reviewer_id,
-#                     changed_at=datetime.utcnow()
-#                 )
-#                 session.add(change)
-#         session.commit()
-#         return jsonify({"message": "Logs saved successfully"}), 201
-#     except IntegrityError as e:
-#         session.rollback()
-#         return jsonify({"error": "Integrity error (possible duplicate or invalid foreign key)"}), 400
-#     except Exception as e:
-#         session.rollback()
-#         return jsonify({"error": str(e)}), 500
-#     finally:
-#         safe_close(session)
-
-
 def get_todays_logs(employee_id):
-    session = get_session()
+    session = _session_after_autosave_flush(employee_id)
     try:
-        today = datetime.now(timezone("Asia/Kolkata")).date()
-        logs = session.query(DailyLog).filter_by(employee_id=employee_id, log_date=today).all()
-        if not session.get(Employee, employee_id):
-            return jsonify({"error": "Employee not found"}), 404
-        response = [
-            {
-                **log.as_dict(),
-                "changes": [c.as_dict() for c in session.query(DailyLogChange).filter_by(daily_log_id=log.id).all()]
-            }
-            for log in logs
-        ]
+        tz_name = get_employee_timezone(session, employee_id)
+        if tz_name is None:
+            return jsonify([]), 200
+        today = local_today(tz_name).local_date
+        logs = logs_on_day(session, employee_id, today)
+        changes_by_log = {}
+        if logs:
+            for change in changes_for_logs(session, [log.id for log in logs]):
+                changes_by_log.setdefault(change.daily_log_id, []).append(change)
+        response = [{
+            'id': log.id,
+            'project_id': log.project_id,
+            'task_description': log.task_description,
+            'start_time': log.start_time.strftime('%H:%M') if log.start_time else '',
+            'end_time': log.end_time.strftime('%H:%M') if log.end_time else '',
+            'total_hours': log.total_hours,
+            'log_date': log.log_date.isoformat() if log.log_date else '',
+            'status_review':log.status_review,
+            'changes': [{
+                'id': change.id,
+                'project_id': change.project_id,
+                'new_description': change.description,
+                'changed_at': change.changed_at.isoformat(),
+                'status_review':change.status_review
+            } for change in changes_by_log.get(log.id, [])]
+        } for log in logs]
         return jsonify(response), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return jsonify({'error': str(e)}), 500
     finally:
         safe_close(session)
 
 
+def _overlap_message(session, employee_id, interval, exclude_log_id):
+    # Only runs after a rejected claim, to name the log that was in the way
+    taken = masks_by_date([interval])
+    candidates = session.query(DailyLog).filter(
+        DailyLog.employee_id == employee_id,
+        DailyLog.log_date >= min(taken) - timedelta(days=1),
+        DailyLog.log_date <= max(taken),
+        DailyLog.id != exclude_log_id
+    )
+    for existing_log in candidates:
+        existing = masks_by_date([(existing_log.log_date, existing_log.start_time, existing_log.end_time)])
+        if any(a & b for day in taken.keys() & existing.keys() for a, b in zip(taken[day], existing[day])):
+            return f'Time range overlaps with existing log for project {existing_log.project_id}'
+    return 'Time range overlaps with an existing log'
+
+
+def _parse_log(log_data):
+    """Validate one posted log; returns (fields, None) or (None, (error, status))."""
+    if not isinstance(log_data, dict):
+        return None, ('Each log must be an object', 400)
+    log_id = log_data.get('id')
+    employee_id = log_data.get('employee_id')
+    log_date = log_data.get('log_date')
+    project_id = log_data.get('project_id')
+    start_time = log_data.get('start_time')
+    end_time = log_data.get('end_time')
+    task_description = log_data.get('task_description')
+
+    if not all([employee_id, log_date, project_id, start_time, end_time, task_description]):
+        return None, ('Missing required fields', 400)
+
+    # Validate time formats
+    if not validate_time(start_time) or not validate_time(end_time):
+        return None, ('Invalid time format for start_time or end_time. Use HH:MM.', 400)
 
-def save_daily_logs():
-    data = request.get_json()
-    if not isinstance(data, list):
-        return jsonify({'error': 'Input must be a list of logs'}), 400
+    try:
+        log_date = datetime.strptime(log_date, '%Y-%m-%d').date()
+        start_time_obj = parse_time(start_time)
+        end_time_obj = parse_time(end_time)
+        total_hours_float = get_total_hours(start_time_obj, end_time_obj)
+    except ValueError as e:
+        return None, (f'Invalid date or time format: {str(e)}', 400)
+
+    if total_hours_float <= 0:
+        return None, ('End time must be after start time', 400)
 
-    session = get_session()
     try:
-        for log_data in data:
-            log_id = log_data.get('id')
-            employee_id = log_data.get('employee_id')
-            log_date = log_data.get('log_date')
-            project_id = log_data.get('project_id')
-            start_time = log_data.get('start_time')
-            end_time = log_data.get('end_time')
-            task_description = log_data.get('task_description')
-
-            if not all([employee_id, log_date, project_id, start_time, end_time, task_description]):
-                return jsonify({'error': 'Missing required fields'}), 400
-
-            # Validate time formats
-            if not validate_time(start_time) or not validate_time(end_time):
-                return jsonify({'error': 'Invalid time format for start_time or end_time. Use HH:MM.'}), 400
-
-            try:
-                log_date = datetime.strptime(log_date, '%Y-%m-%d').date()
-                start_time_obj = parse_time(start_time)
-                end_time_obj = parse_time(end_time)
-                total_hours_float = get_total_hours(start_time_obj, end_time_obj)
-            except ValueError as e:
-                return jsonify({'error': f'Invalid date or time format: {str(e)}'}), 400
-
-            if total_hours_float <= 0:
-                return jsonify({'error': 'End time must be after start time'}), 400
-
-            employee = session.query(Employee).filter_by(id=employee_id).first()
-            if not employee:
-                return jsonify({'error': f'Employee with id {employee_id} not found'}), 404
-
-            project = session.query(Project).filter_by(id=project_id).first()
-            if not project:
-                return jsonify({'error': f'Project with id {project_id} not found'}), 404
-
-            # Check for overlapping time ranges
-            existing_logs = session.query(DailyLog).filter(
-                DailyLog.employee_id == employee_id,
-                DailyLog.log_date == log_date,
-                DailyLog.id != log_id  # Exclude the current log if updating
-            ).all()
-            for existing_log in existing_logs:
-                existing_start = existing_log.start_time
-                existing_end = existing_log.end_time
-                if start_time_obj < existing_end and end_time_obj > existing_start:
-                    return jsonify({'error': f'Time range overlaps with existing log for project {existing_log.project_id}'}), 400
-
-            if log_id and log_id != 'null':
-                log = session.query(DailyLog).filter_by(id=log_id, employee_id=employee_id).first()
-                if not log:
-                    return jsonify({'error': f'Log with id {log_id} not found'}), 404
-                old_description = log.task_description
-                log.project_id = project_id
-                log.log_date = log_date
-                log.start_time = start_time_obj
-                log.end_time = end_time_obj
-                log.total_hours = total_hours_float
-                log.task_description = task_description
-                if old_description != task_description:
-                    change = DailyLogChange(
-                        daily_log_id=log_id,
-                        project_id=project_id,
-                        new_description=task_description,
-                        changed_at=datetime.utcnow()
-                    )
-                    session.add(change)
-            else:
-                log = DailyLog(
-                    employee_id=employee_id,
-                    log_date=log_date,
-                    project_id=project_id,
-                    start_time=start_time_obj,
-                    end_time=end_time_obj,
-                    total_hours=total_hours_float,
-                    task_description=task_description
-                )
-                session.add(log)
-                session.flush()  # Flush to get the log.id
-                # Store initial description in daily_log_changes
-                change = DailyLogChange(
-                    daily_log_id=log.id,
-                    project_id=project_id,
-                    new_description=task_description,
-                    changed_at=datetime.utcnow()
-                )
-                session.add(change)
+        employee_id, project_id = int(employee_id), int(project_id)
+        log_id = int(log_id) if log_id and log_id != 'null' else None
+    except (TypeError, ValueError):
+        return None, ('id, employee_id and project_id must be integers', 400)
+
+    return {
+        'id': log_id,
+        'employee_id': employee_id,
+        'project_id': project_id,
+        'log_date': log_date,
+        'start_time': start_time_obj,
+        'end_time': end_time_obj,
+        'total_hours': total_hours_float,
+        'task_description': task_description,
+    }, None
+
+
+def _unchanged(log, fields, reviewer_id):
+    return (
+        log.project_id == fields['project_id'] and log.log_date == fields['log_date']
+        and log.start_time == fields['start_time'] and log.end_time == fields['end_time']
+        and log.task_description == fields['task_description'] and log.reviewer_id == reviewer_id
+    )
+
+
+def _apply_logs(session, logs):
+    """
+    Write parsed logs in the caller's transaction. Returns (events, None), or
+    (None, (error, status)) after which the caller must roll back.
 
+    Buffered autosaves (fields with received_at) are skipped when they would
+    change nothing or the log was saved after they arrived.
+    """
+    employees, projects = {}, {}
+    events = []
+    for fields in logs:
+        employee_id, project_id = fields['employee_id'], fields['project_id']
+        if employee_id not in employees:
+            employees[employee_id] = session.query(Employee).filter_by(id=employee_id).first()
+        employee = employees[employee_id]
+        if not employee:
+            return None, (f'Employee with id {employee_id} not found', 404)
+
+        if project_id not in projects:
+            projects[project_id] = session.query(Project).filter_by(id=project_id).first()
+        if not projects[project_id]:
+            return None, (f'Project with id {project_id} not found', 404)
+
+        # Get reviewer_id from employee's manager
+        reviewer_id = employee.reports_to_id
+
+        log_id = fields['id']
+        is_update = log_id is not None
+        log = None
+        old_interval = None
+        if is_update:
+            log = session.query(DailyLog).filter_by(id=log_id, employee_id=employee_id).first()
+            if not log:
+                return None, (f'Log with id {log_id} not found', 404)
+            received_at = fields.get('received_at')
+            if received_at and (log.updated_at > received_at or _unchanged(log, fields, reviewer_id)):
+                continue
+            old_interval = (log.log_date, log.start_time, log.end_time)
+
+        # Check for overlapping time ranges and claim the new one atomically
+        new_interval = (fields['log_date'], fields['start_time'], fields['end_time'])
+        conflict_date = claim_log_interval(session, employee_id, new=new_interval, old=old_interval)
+        if conflict_date:
+            session.rollback()
+            return None, (_overlap_message(session, employee_id, new_interval, log.id if log else None), 400)
+
+        if is_update:
+            old_description = log.task_description
+            log.project_id = project_id
+            log.log_date = fields['log_date']
+            log.start_time = fields['start_time']
+            log.end_time = fields['end_time']
+            log.total_hours = fields['total_hours']
+            log.task_description = fields['task_description']
+            log.reviewer_id = reviewer_id  # <-- Set reviewer
+            if old_description != fields['task_description']:
+                record_change(session, log, reviewer_id)
+        else:
+            log = DailyLog(
+                employee_id=employee_id,
+                log_date=fields['log_date'],
+                project_id=project_id,
+                start_time=fields['start_time'],
+                end_time=fields['end_time'],
+                total_hours=fields['total_hours'],
+                task_description=fields['task_description'],
+                reviewer_id=reviewer_id  # <-- Set reviewer
+            )
+            session.add(log)
+            session.flush()  # Flush to get the log.id
+            # Store initial description in daily_log_changes
+            record_change(session, log, reviewer_id)
+        events.append((reviewer_id, {
+            "type": "log_updated" if is_update else "log_submitted",
+            "log_id": log.id,
+            "employee_id": employee_id,
+            "log_date": fields['log_date'].isoformat(),
+            "status_review": log.status_review or "Pending"
+        }))
+    return events, None
+
+
+def _write_logs(logs, outcome=None):
+    """
+    Save parsed logs in one transaction and notify reviewers; returns None or
+    (error, status). outcome, a (status, body) pair, is stored for the
+    request's Idempotency-Key in the same transaction (utils/idempotency.py).
+    """
+    session = get_session(use_replica=False)
+    try:
+        events, error = _apply_logs(session, logs)
+        if error:
+            session.rollback()
+            return error
+        bump_log_versions(session, [event["employee_id"] for _, event in events])
+        if outcome:
+            stage_outcome(session, *outcome)
         session.commit()
-        return jsonify({'message': 'Logs saved successfully'})
+        # Notify reviewers only once the logs are visible to their queries
+        for reviewer_id, event in events:
+            publish(reviewer_id, event)
+        return None
     except Exception as e:
         session.rollback()
-        return jsonify({'error': str(e)}), 500
+        return str(e), 500
     finally:
         safe_close(session)
 
 
+def _autosave(logs):
+    """
+    Buffer edits of existing logs (utils/autosave.py); new logs are written
+    now so they get an id. The 202 only means the edits are in this worker's
+    memory: they are lost if the worker crashes before writing them.
+    """
+    autosave_buffer.start(_write_logs)
+    new_logs = [fields for fields in logs if fields['id'] is None]
+    buffered = autosave_buffer.add([fields for fields in logs if fields['id'] is not None])
+    errors = autosave_buffer.pop_errors({fields['employee_id'] for fields in logs})
+    result = {'message': 'Logs buffered', 'buffered': buffered, 'errors': errors}
+    if new_logs:
+        error = _write_logs(new_logs, outcome=(202, result))
+        if error:
+            return jsonify({'error': error[0], 'errors': errors}), error[1]
+    return jsonify(result), 202
+
+
+@idempotent
+def save_daily_logs():
+    """
+    Save a list of logs. With ?autosave=1 (sent by the today page while the
+    user edits saved logs), edits of existing logs are coalesced and written
+    shortly after the user stops editing. Retries sent with the same
+    Idempotency-Key get the first outcome back.
+    """
+    data = request.get_json()
+    if not isinstance(data, list):
+        return jsonify({'error': 'Input must be a list of logs'}), 400
 
-# def update_log_review_status():
-#     data = request.get_json()
-#     log_id = data.get("log_id")
-#     reviewer_id = data.get("reviewer_id")
-#     status_review = data.get("status_review")  # "Approved" or "Rejected"
-#     rejection_reason = data.get("rejection_reason", "")
-
-#     if not all([log_id, reviewer_id, status_review]):
-#         return jsonify({"error": "log_id, reviewer_id, and status_review are required"}), 400
-
-#     session = get_session()
-#     try:
-#         log = session.query(DailyLog).filter_by(id=log_id, reviewer_id=reviewer_id).first()
-#         if not log:
-#             return jsonify({"error": "Log not found or reviewer mismatch"}), 404
-
-#         log.status_review = status_review
-#         log.rejection_reason = rejection_reason if status_review == "Rejected" else None
-#         session.commit()
-#         return jsonify({"message": "Review status updated", "log": log.as_dict()}), 200
-#     except Exception as e:
-#         session.rollback()
-#         return jsonify({"error": str(e)}), 500
-#     finally:
-#         safe_close(session)
+    logs = []
+    for log_data in data:
+        fields, error = _parse_log(log_data)
+        if error:
+            return jsonify({'error': error[0]}), error[1]
+        logs.append(fields)
 
-# def get_logs_by_reviewer():
-#     reviewer_id = request.args.get("reviewer_id", type=int)
-#     if not reviewer_id:
-#         return jsonify({"error": "reviewer_id is required"}), 400
-#     session = get_session()
-#     try:
-#         logs = session.query(DailyLog).filter(DailyLog.reviewer_id == reviewer_id).order_by(DailyLog.log_date.desc()).all()
-#         return jsonify([log.as_dict() for log in logs]), 200
-#     except Exception as e:
-#         return jsonify({"error": str(e)}), 500
-#     finally:
-#         safe_close(session)
+    if request.args.get('autosave', '').lower() in ('1', 'true'):
+        return _autosave(logs)
 
+    # Earlier autosaves go first so this save is the latest version
+    autosave_buffer.flush_employees({fields['employee_id'] for fields in logs})
+    result = {'message': 'Logs saved successfully'}
+    error = _write_logs(logs, outcome=(200, result))
+    if error:
+        return jsonify({'error': error[0]}), error[1]
+    return jsonify(result)
 
 
+def flush_autosaved_logs():
+    """
+    Payload: {"employee_id": int, "logs": [...] (optional, saved logs only)}.
+    Buffers logs like ?autosave=1, then writes the employee's buffered
+    autosaves now. The today page sends it with navigator.sendBeacon when it
+    is hidden or closed, so the body arrives as text/plain (no CORS preflight).
+    """
+    data = request.get_json(silent=True, force=True) or {}
+    employee_id = data.get('employee_id')
+    if not employee_id:
+        return jsonify({'error': 'employee_id is required'}), 400
+    logs = []
+    for log_data in data.get('logs') or []:
+        fields, error = _parse_log(log_data)
+        if error:
+            return jsonify({'error': error[0]}), error[1]
+        if fields['id'] is None or fields['employee_id'] != employee_id:
+            return jsonify({'error': 'Only saved logs of employee_id can be flushed'}), 400
+        logs.append(fields)
+    if logs:
+        autosave_buffer.start(_write_logs)
+        autosave_buffer.add(logs)
+    autosave_buffer.flush_employees([employee_id])
+    return jsonify({'message': 'Autosaved logs flushed', 'errors': autosave_buffer.pop_errors([employee_id])}), 200
 
 def update_log_review_status():
     """
@@ -356,7 +401,15 @@ def update_log_review_status():
 
         log.status_review = status_review
         log.rejection_reason = rejection_reason if status_review == "Rejected" else None
+        bump_log_versions(session, [log.employee_id])
         session.commit()
+        publish(reviewer_id, {
+            "type": "log_reviewed",
+            "log_id": log.id,
+            "employee_id": log.employee_id,
+            "log_date": log.log_date.isoformat(),
+            "status_review": log.status_review
+        })
         return jsonify({"message": "Review status updated", "log": log.as_dict()}), 200
     except Exception as e:
         session.rollback()
@@ -365,144 +418,323 @@ def update_log_review_status():
         safe_close(session)
 
 
+def get_daily_logs_by_reviewer():
+    """
+    Query Parameters:
+      - reviewer_id: int (required)
+      - start_date: string (YYYY-MM-DD, optional)
+      - end_date: string (YYYY-MM-DD, optional)
+      - project_id: int (optional)
+      - status_review: string (optional)
+    Returns:
+      {
+        "logs": [...],
+        "projects": [...]
+      }
+    """
+    try:
+        spec = LogFilterSpec.from_args(
+            request.args,
+            allowed=("reviewer_id", "start_date", "end_date", "project_id", "status_review"),
+            required=("reviewer_id",),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    reviewer_id = spec.reviewer_id
 
+    session = get_session()
+    try:
+        # Archived tables too when the date range reaches them
+        models = log_models(spec)
+
+        # 🔹 Step 1: Find employees linked to this reviewer
+        employee_ids = set()
+        for log_model, change_model in models:
+            # Current employees
+            employee_ids.update(
+                emp_id for (emp_id,) in session.query(log_model.employee_id)
+                .filter(log_model.reviewer_id == reviewer_id).distinct()
+            )
+            # Employees who had this reviewer in history
+            employee_ids.update(
+                emp_id for (emp_id,) in session.query(log_model.employee_id)
+                .join(change_model, change_model.daily_log_id == log_model.id)
+                .filter(change_model.reviewer_id == reviewer_id).distinct()
+            )
 
+        if not employee_ids:
+            return jsonify({"logs": [], "projects": []}), 200
+
+        # 🔹 Step 2: Fetch the matching logs for these employees in one query
+        # per table (reviewer_id only selects the employees; their logs may
+        # have moved to another reviewer since)
+        logs = query_logs(session, spec.without("reviewer_id"), employee_ids=employee_ids)
+
+        if not logs:
+            return jsonify({"logs": [], "projects": []}), 200
+
+        log_ids = [log.id for log in logs]
+
+        # 🔹 Step 3: Fetch all history for these logs (ids are kept when archived)
+        changes_by_log = {}
+        for _, change_model in models:
+            for ch in session.query(change_model).filter(change_model.daily_log_id.in_(log_ids)):
+                changes_by_log.setdefault(ch.daily_log_id, []).append(ch.as_dict())
+
+        # Attach changes to logs
+        logs_with_history = []
+        for log in logs:
+            log_dict = log.as_dict()
+            log_dict["reviewer_changes"] = sorted(
+                changes_by_log.get(log.id, []),
+                key=lambda x: x["changed_at"],
+                reverse=True
+            )
+            logs_with_history.append(log_dict)
 
+        # 🔹 Step 4: Fetch unique projects
+        project_ids = {log["project_id"] for log in logs_with_history if log["project_id"]}
+        projects = session.query(Project).filter(Project.id.in_(project_ids)).all()
+        projects_data = [proj.as_dict() for proj in projects]
 
+        return jsonify({
+            "logs": logs_with_history,
+            "projects": projects_data
+        }), 200
 
-
-# def get_logs_by_reviewer():
-#     """
-#     Query Parameters:
-#       - reviewer_id: int (optional if reviewer_email given)
-#       - reviewer_email: string (optional if reviewer_id given)
-
-#     Returns all logs where the reviewer is/was assigned (current or historical).
-#     """
-#     session = get_session()
-#     try:
-#         reviewer_id = request.args.get("reviewer_id", type=int)
-#         reviewer_email = request.args.get("reviewer_email", type=str)
-
-#         if not reviewer_id and not reviewer_email:
-#             return jsonify({"error": "Either reviewer_id or reviewer_email is required"}), 400
-
-#         if not reviewer_id and reviewer_email:
-#             reviewer = session.query(Employee).filter(Employee.email == reviewer_email).first()
-#             if not reviewer:
-#                 return jsonify({"error": "Reviewer not found"}), 404
-#             reviewer_id = reviewer.id
-
-#         # Only logs where reviewer is/was assigned
-#         current_logs = session.query(DailyLog).filter(DailyLog.reviewer_id == reviewer_id).all()
-#         previous_changes = session.query(DailyLogChange).filter(DailyLogChange.reviewer_id == reviewer_id).all()
-#         previous_logs = [change.daily_log for change in previous_changes]
-#         all_logs = current_logs + previous_logs
-
-#         project_ids = list(set([log.project_id for log in all_logs if log.project_id]))
-
-#         logs_with_history = []
-#         for log in all_logs:
-#             changes = (
-#                 session.query(DailyLogChange)
-#                 .filter(DailyLogChange.daily_log_id == log.id)
-#                 .order_by(DailyLogChange.changed_at.desc())
-#                 .all()
-#             )
-#             log_dict = log.as_dict()
-#             log_dict["reviewer_changes"] = [ch.as_dict() for ch in changes]
-#             logs_with_history.append(log_dict)
-
-#         projects = session.query(Project).filter(Project.id.in_(project_ids)).all()
-#         project_data = [proj.as_dict() for proj in projects]
-
-#         return jsonify({"logs": logs_with_history, "projects": project_data}), 200
-
-#     except Exception as e:
-#         return jsonify({"error": str(e)}), 500
-#     finally:
-#         safe_close(session)
-
-
-
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        safe_close(session)
 
 
+def filter_daily_logs(employee_id):
+    """
+    Filter daily logs based on optional query parameters.
 
+    Query Parameters:
+      - start_date: string (YYYY-MM-DD, optional)
+      - end_date: string (YYYY-MM-DD, optional)
+      - project_id: int (optional)
+      - status_review: string (optional, e.g., 'Pending', 'Approved', 'Rejected', 'all')
+      - reviewer_id: int (optional)
 
+    Example:
+      /api/daily-logs/filter/12?start_date=2025-07-01&end_date=2025-07-07&project_id=3&status_review=Pending&reviewer_id=5
+    """
+    try:
+        spec = LogFilterSpec.from_args(
+            request.args,
+            allowed=("start_date", "end_date", "project_id", "status_review", "reviewer_id"),
+            employee_id=employee_id,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-# def get_logs_by_reviewer():
-#     """
-#     Query Parameters:
-#       - reviewer_id: int (required)
-#     Example:
-#       /api/daily-logs/by-reviewer?reviewer_id=1
-#     """
-#     reviewer_id = request.args.get("reviewer_id", type=int)
-#     if not reviewer_id:
-#         return jsonify({"error": "reviewer_id is required"}), 400
+    session = get_session()
+    try:
+        logs = query_logs(session, spec, newest_first=True)
+        log_data = [log.as_dict() for log in logs]
 
-#     session = get_session()
-#     try:
-#         query = session.query(DailyLog).filter(DailyLog.reviewer_id == reviewer_id)
-#         logs = query.order_by(DailyLog.log_date.desc()).all()
-#         log_data = [log.as_dict() for log in logs]
+        # Related projects
+        project_ids = list(set(log.project_id for log in logs if log.project_id))
+        projects = session.query(Project).filter(Project.id.in_(project_ids)).all() if project_ids else []
+        project_data = [proj.as_dict() for proj in projects]
 
-#         # Get related projects
-#         project_ids = list(set(log.project_id for log in logs if log.project_id))
-#         projects = session.query(Project).filter(Project.id.in_(project_ids)).all() if project_ids else []
-#         project_data = [proj.as_dict() for proj in projects]
+        return jsonify({"logs": log_data, "projects": project_data}), 200
 
-#         return jsonify({"logs": log_data, "projects": project_data}), 200
-#     except Exception as e:
-#         return jsonify({"error": str(e)}), 500
-#     finally:
-#         safe_close(session)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
+    finally:
+        safe_close(session)
 
 
+def get_weekly_logs(employee_id):
+    try:
+        spec = LogFilterSpec.from_args(
+            request.args,
+            allowed=("start_date", "end_date"),
+            required=("start_date", "end_date"),
+            employee_id=employee_id,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    session = get_session()
+    try:
+        etag, last_modified = log_cache_validators(session, employee_id)
+        if is_not_modified(etag):
+            return not_modified_response(etag, last_modified)
+        logs = query_logs(session, spec)
+        result = [log.as_dict() for log in logs]
+        return add_cache_validators(jsonify(result), etag, last_modified)
+    finally:
+        session.close()
 
 
+def get_all_daily_logs_for_employee(employee_id):
+    """
+    Returns all daily logs for an employee, regardless of reviewer.
+    Optional query params: start_date, end_date, project_id, status_review
+    """
+    try:
+        spec = LogFilterSpec.from_args(
+            request.args,
+            allowed=("start_date", "end_date", "project_id", "status_review"),
+            employee_id=employee_id,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
+    session = get_session()
+    try:
+        logs = query_logs(session, spec, newest_first=True)
+        logs_data = [log.as_dict() for log in logs]
 
+        return jsonify({"logs": logs_data}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        safe_close(session)
 
 
+FEED_TABLES = (("logs", DailyLog), ("changes", DailyLogChange))
 
 
+def _decode_feed_cursor(since):
+    """
+    Per-table feed positions {"logs": (updated_at, id, caught_up), ...}.
 
+    A position continues strictly after (updated_at, id), so a full page
+    always moves forward. Once a table has caught up, the next read starts
+    FEED_OVERLAP_SECONDS before its position instead, to pick up rows from
+    transactions that committed late. Plain ISO timestamps (the old cursor
+    format) count as caught up for both tables.
+    """
+    try:
+        positions = json.loads(base64.urlsafe_b64decode(since.encode()))
+        return {
+            key: (datetime.fromisoformat(positions[key][0]), int(positions[key][1]), bool(positions[key][2]))
+            for key, _ in FEED_TABLES
+        }
+    except (ValueError, TypeError, KeyError, IndexError):
+        since_ts = datetime.fromisoformat(since)  # ValueError: invalid cursor
+        return {key: (since_ts, 0, True) for key, _ in FEED_TABLES}
 
-# def get_reviewer_logs():
-#     try:
-#         reviewer_id = request.args.get("reviewer_id", type=int)
-#         if not reviewer_id:
-#             return jsonify({"error": "Missing reviewer_id"}), 400
 
-#         # Optional filters
-#         start_date = request.args.get("start_date")
-#         end_date = request.args.get("end_date")
-#         project_id = request.args.get("project_id")
-#         status_review = request.args.get("status_review")
+def _encode_feed_cursor(positions):
+    data = {key: [ts.isoformat(), row_id, caught_up] for key, (ts, row_id, caught_up) in positions.items()}
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
 
-#         query = DailyLog.query.filter(DailyLog.reviewer_id == reviewer_id)
 
-#         if start_date:
-#             query = query.filter(DailyLog.log_date >= datetime.strptime(start_date, "%Y-%m-%d"))
-#         if end_date:
-#             query = query.filter(DailyLog.log_date <= datetime.strptime(end_date, "%Y-%m-%d"))
-#         if project_id and project_id != "all":
-#             query = query.filter(DailyLog.project_id == int(project_id))
-#         if status_review and status_review != "all":
-#             query = query.filter(DailyLog.status_review == status_review)
+def _after_position(model, position):
+    updated_at, row_id, caught_up = position
+    if caught_up:
+        return model.updated_at > updated_at - timedelta(seconds=FEED_OVERLAP_SECONDS)
+    return or_(model.updated_at > updated_at, and_(model.updated_at == updated_at, model.id > row_id))
 
-#         logs = query.order_by(DailyLog.log_date.desc()).all()
-#         projects = Project.query.order_by(Project.id.asc()).all()
 
-#         return jsonify({
-#             "logs": [log.to_dict() for log in logs],
-#             "projects": [project.to_dict() for project in projects]
-#         })
+def get_daily_logs_feed():
+    """
+    Incremental sync of DailyLog and DailyLogChange rows.
+
+    Query Parameters:
+      - employee_id: int (optional if reviewer_id given)
+      - reviewer_id: int (optional if employee_id given)
+      - since: cursor returned by the previous call (optional, omit for a full sync)
+      - limit: int (optional, max rows per table, default 500)
+
+    Each table is paged by (updated_at, id), so has_more pages always make
+    progress. Once caught up, the feed re-reads FEED_OVERLAP_SECONDS before
+    the cursor so rows from transactions that committed late are not
+    skipped; clients must apply rows idempotently by id.
+    """
+    employee_id = request.args.get("employee_id", type=int)
+    reviewer_id = request.args.get("reviewer_id", type=int)
+    since = request.args.get("since")
+    limit = min(request.args.get("limit", 500, type=int), FEED_MAX_LIMIT)
+
+    if not employee_id and not reviewer_id:
+        return jsonify({"error": "employee_id or reviewer_id is required"}), 400
+    if limit <= 0:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+
+    positions = {}
+    if since:
+        try:
+            positions = _decode_feed_cursor(since)
+        except ValueError:
+            return jsonify({"error": "Invalid since cursor"}), 400
 
-#     except Exception as e:
-#         return jsonify({"error": str(e)}), 500
+    session = get_session()
+    try:
+        queries = {
+            "logs": session.query(DailyLog),
+            "changes": session.query(DailyLogChange).join(DailyLog, DailyLogChange.daily_log_id == DailyLog.id),
+        }
+        rows, next_positions, has_more = {}, {}, False
+        for key, model in FEED_TABLES:
+            query = queries[key]
+            if employee_id:
+                query = query.filter(DailyLog.employee_id == employee_id)
+            if reviewer_id:
+                query = query.filter(DailyLog.reviewer_id == reviewer_id)
+            position = positions.get(key)
+            if position:
+                query = query.filter(_after_position(model, position))
+            rows[key] = query.order_by(model.updated_at.asc(), model.id.asc()).limit(limit).all()
+
+            full = len(rows[key]) == limit
+            has_more = has_more or full
+            if rows[key]:
+                last = rows[key][-1]
+                next_positions[key] = (last.updated_at, last.id, not full)
+            elif position:
+                next_positions[key] = (position[0], position[1], True)
+
+        cursor = since
+        if next_positions:
+            # A table with no rows yet continues from the other table's time
+            fallback = (next(iter(next_positions.values()))[0], 0, True)
+            cursor = _encode_feed_cursor({key: next_positions.get(key, fallback) for key, _ in FEED_TABLES})
+
+        return jsonify({
+            "logs": [log.as_dict() for log in rows["logs"]],
+            "changes": [c.as_dict() for c in rows["changes"]],
+            "cursor": cursor,
+            "has_more": has_more
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        safe_close(session)
 
+def stream_reviewer_events():
+    """
+    Server-sent events stream of log submissions and review status changes.
 
+    Query Parameters:
+      - reviewer_id: int (required)
+    Headers:
+      - Last-Event-ID: int (optional, resume after this event on reconnect)
+    """
+    reviewer_id = request.args.get("reviewer_id", type=int)
+    if not reviewer_id:
+        return jsonify({"error": "reviewer_id is required"}), 400
+    last_event_id = request.headers.get("Last-Event-ID", type=int)
+
+    def generate():
+        yield "retry: 5000\n\n"
+        for item in subscribe(reviewer_id, last_event_id):
+            if item is None:
+                yield ": keep-alive\n\n"
+                continue
+            event_id, event = item
+            yield f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -3,6 +3,11 @@ from flask import request, jsonify
 from models.department import Department
 from utils.session_manager import get_session
 from sqlalchemy.exc import IntegrityError
+from utils.timezones import is_valid_timezone
+from utils.employee_search import invalidate_search_index
+from utils.profile_cache import profile_cache
+from utils.bulk_delete import delete_department_rows, archive_department_log_rows
+from datetime import datetime
 
 
 
@@ -24,9 +29,12 @@ def add_department():
         name = data.get("name")
         if not name or not isinstance(name, str) or not name.strip():
             return jsonify({"error": "Department name is required and must be a non-empty string"}), 400
+        tz_name = data.get("timezone")
+        if tz_name is not None and not is_valid_timezone(tz_name):
+            return jsonify({"error": "Invalid timezone"}), 400
         if session.query(Department).filter_by(name=name.strip()).first():
             return jsonify({"error": "Department already exists"}), 400
-        new_dept = Department(name=name.strip())
+        new_dept = Department(name=name.strip(), timezone=tz_name)
         session.add(new_dept)
         session.commit()
         return jsonify(new_dept.as_dict()), 201
@@ -47,13 +55,18 @@ def update_department(dept_id):
         name = data.get("name")
         if not name or not isinstance(name, str) or not name.strip():
             return jsonify({"error": "Department name is required and must be a non-empty string"}), 400
+        if "timezone" in data and data["timezone"] is not None and not is_valid_timezone(data["timezone"]):
+            return jsonify({"error": "Invalid timezone"}), 400
         dept = session.get(Department, dept_id)
         if not dept:
             return jsonify({"error": "Department not found"}), 404
         if session.query(Department).filter(Department.name == name.strip(), Department.id != dept_id).first():
             return jsonify({"error": "Department name already exists"}), 400
         dept.name = name.strip()
+        if "timezone" in data:
+            dept.timezone = data["timezone"]
         session.commit()
+        profile_cache.invalidate_all()
         return jsonify(dept.as_dict()), 200
     except IntegrityError:
         session.rollback()
@@ -70,12 +83,42 @@ def delete_department(dept_id):
         dept = session.get(Department, dept_id)
         if not dept:
             return jsonify({"error": "Department not found"}), 404
-        session.delete(dept)
-        session.commit()
-        return jsonify({"message": "Department deleted successfully"}), 200
+        if request.args.get("dry_run", "").lower() in ("1", "true", "yes"):
+            return jsonify({"dry_run": True, "counts": delete_department_rows(session, dept_id, dry_run=True)}), 200
+        session.expunge(dept)
+        counts = delete_department_rows(session, dept_id)
+        # Deleting a department also deletes its employees
+        invalidate_search_index()
+        profile_cache.invalidate_all()
+        return jsonify({"message": "Department deleted successfully", "counts": counts}), 200
     except Exception as e:
         session.rollback()
         return jsonify({"error": str(e)}), 500
     finally:
         safe_close(session)
 
+
+def archive_department_logs(dept_id):
+    """
+    Move the department's reviewed logs of closed years to the archive.
+    Query params: before (YYYY-MM-DD, optional), dry_run.
+    """
+    session = get_session()
+    try:
+        if not session.get(Department, dept_id):
+            return jsonify({"error": "Department not found"}), 404
+        try:
+            before = request.args.get("before")
+            before = datetime.strptime(before, "%Y-%m-%d").date() if before else None
+            dry_run = request.args.get("dry_run", "").lower() in ("1", "true", "yes")
+            counts = archive_department_log_rows(session, dept_id, before=before, dry_run=dry_run)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        if dry_run:
+            return jsonify({"dry_run": True, "counts": counts}), 200
+        return jsonify({"message": "Department logs archived successfully", "counts": counts}), 200
+    except Exception as e:
+        session.rollback()
+        return jsonify({"error": str(e)}), 500
+    finally:
+        safe_close(session)
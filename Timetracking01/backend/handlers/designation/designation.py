@@ -4,6 +4,9 @@ from models.department import Department
 from utils.session_manager import get_session
 from sqlalchemy.exc import IntegrityError
 from models.designation import Designation
+from utils.employee_search import invalidate_search_index
+from utils.profile_cache import profile_cache
+from utils.bulk_delete import delete_designation_rows
 
 
 
@@ -90,6 +93,7 @@ def update_designation(des_id):
             return jsonify({"error": f"Designation '{title.strip()}' already exists in this department"}), 400
         des.title = title.strip()
         session.commit()
+        profile_cache.invalidate_all()
         return jsonify(des.as_dict()), 200
     except IntegrityError:
         session.rollback()
@@ -107,9 +111,13 @@ def delete_designation(des_id):
         des = session.get(Designation, des_id)
         if not des:
             return jsonify({"error": "Designation not found"}), 404
-        session.delete(des)
-        session.commit()
-        return jsonify({"message": "Designation deleted successfully"}), 200
+        if request.args.get("dry_run", "").lower() in ("1", "true", "yes"):
+            return jsonify({"dry_run": True, "counts": delete_designation_rows(session, des_id, dry_run=True)}), 200
+        session.expunge(des)
+        counts = delete_designation_rows(session, des_id)
+        invalidate_search_index()
+        profile_cache.invalidate_all()
+        return jsonify({"message": "Designation deleted successfully", "counts": counts}), 200
     except Exception as e:
         session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -1,5 +1,5 @@
 from utils.helpers import safe_close 
-from flask import request,jsonify 
+from flask import request,jsonify,make_response 
 from models.employee import Employee 
 from models.department import Department 
 from models.designation import Designation 
@@ -9,9 +9,34 @@ from utils.session_manager import get_session
 from sqlalchemy.exc import SQLAlchemyError
 import re 
 import datetime
-from sqlalchemy import or_
+from sqlalchemy import or_, select, union
+from sqlalchemy.orm import aliased, selectinload
+from utils.hierarchy import get_manager_chain, get_manager_chains
 from sqlalchemy.exc import IntegrityError
-
+from models.employeeproject import EmployeeProject
+from models.managerproject import ManagerProjectAssignment
+from utils.custom_responses import create_json_array_response, create_json_object_response
+from utils.timezones import is_valid_timezone
+from utils.employee_search import search_employee_ids, index_employee
+from utils.profile_cache import profile_cache
+from utils.async_db import run_concurrently
+from utils.fanout import run_sections
+from functools import partial
+
+
+
+def list_employees():
+    """
+    Returns a list of employees with their details.
+    """
+    session = get_session()
+    try:
+        employees = session.query(Employee).all()
+        return create_json_array_response([emp.as_dict() for emp in employees])
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        safe_close(session)
 
 
 def get_employee_profile_with_hierarchy():
@@ -23,21 +48,17 @@ def get_employee_profile_with_hierarchy():
         emp = session.query(Employee).filter(Employee.email.ilike(email)).first()
         if not emp:
             return jsonify({'error': 'Employee not found'}), 404
-        hierarchy = []
-        current = emp
-        visited = set()
-        while current.manager and current.reports_to_id not in visited:
-            manager = current.manager
-            visited.add(manager.id)
-            hierarchy.append({
+        hierarchy = [
+            {
                 'id': manager.id,
                 'employee_name': manager.employee_name,
                 'email': manager.email,
                 'reports_to': manager.reports_to_id,
                 'designation': manager.designation.as_dict() if manager.designation else None,
                 'department': manager.department.as_dict() if manager.department else None
-            })
-            current = manager
+            }
+            for manager in get_manager_chain(session, emp.id)
+        ]
         return jsonify({
             'employee': emp.as_dict(),
             'manager_hierarchy': hierarchy,
@@ -50,48 +71,76 @@ def get_employee_profile_with_hierarchy():
         safe_close(session)
 
 
-#  admin dashboard api 
+def _page_args():
+    """Return (limit, offset) from the query string; limit None means everything."""
+    limit = request.args.get("limit", type=int)
+    offset = request.args.get("offset", 0, type=int)
+    if (limit is not None and limit <= 0) or offset < 0:
+        raise ValueError("limit must be positive and offset must not be negative")
+    return limit, offset
+
+
+def _load_search_page(session, search, limit, offset, **filters):
+    """Ranked search through utils/employee_search; loads only the requested page."""
+    total, page_ids = search_employee_ids(session, search, limit=limit, offset=offset, **filters)
+    position = {employee_id: i for i, employee_id in enumerate(page_ids)}
+    employees = (
+        session.query(Employee)
+        .filter(Employee.id.in_(page_ids))
+        .options(selectinload(Employee.designation), selectinload(Employee.department))
+        .all()
+    ) if page_ids else []
+    employees.sort(key=lambda emp: position[emp.id])
+    return employees, total
+
+
 def get_employees_with_details():
+    """
+    Query Parameters:
+      - search: matched against name and email, best match first (optional)
+      - department_id, designation_id, manager_id: int (optional)
+      - limit, offset: int (optional); the total is sent as X-Total-Count
+    """
     session = get_session()
     try:
         search = request.args.get("search")
         department_id = request.args.get("department_id", type=int)
         designation_id = request.args.get("designation_id", type=int)
         manager_id = request.args.get("manager_id", type=int)
-        query = session.query(Employee)
+        try:
+            limit, offset = _page_args()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         if search:
-            search_term = f"%{search}%"
-            query = query.filter(
-                or_(
-                    Employee.employee_name.ilike(search_term),
-                    Employee.email.ilike(search_term)
-                )
+            employees, total = _load_search_page(
+                session, search, limit, offset,
+                department_id=department_id, designation_id=designation_id, manager_id=manager_id,
             )
-        if department_id:
-            query = query.filter(Employee.department_id == department_id)
-        if designation_id:
-            query = query.filter(Employee.designation_id == designation_id)
-        if manager_id:
-            query = query.filter(Employee.reports_to_id == manager_id)
-        employees = query.all()
+        else:
+            query = session.query(Employee)
+            if department_id:
+                query = query.filter(Employee.department_id == department_id)
+            if designation_id:
+                query = query.filter(Employee.designation_id == designation_id)
+            if manager_id:
+                query = query.filter(Employee.reports_to_id == manager_id)
+            total = query.count() if limit else None
+            query = query.order_by(Employee.id).offset(offset).limit(limit)
+            employees = query.options(selectinload(Employee.designation), selectinload(Employee.department)).all()
+            total = len(employees) if total is None else total
+        chains = get_manager_chains(session, [emp.id for emp in employees])
         result = []
         for emp in employees:
-            hierarchy = []
-            current = emp
-            visited = set()
-            while current.reports_to_id and current.reports_to_id not in visited:
-                visited.add(current.reports_to_id)
-                manager = session.get(Employee, current.reports_to_id)
-                if not manager:
-                    break
-                hierarchy.append({
+            hierarchy = [
+                {
                     "id": manager.id,
                     "employee_name": manager.employee_name,
                     "email": manager.email,
                     "designation": manager.designation.as_dict() if manager.designation else None,
                     "department": manager.department.as_dict() if manager.department else None
-                })
-                current = manager
+                }
+                for manager in chains[emp.id]
+            ]
             result.append({
                 "id": emp.id,
                 "employee_name": emp.employee_name,
@@ -101,7 +150,9 @@ def get_employees_with_details():
                 "reports_to": emp.reports_to_id,
                 "manager_hierarchy": hierarchy
             })
-        return jsonify(result), 200
+        response = make_response(jsonify(result), 200)
+        response.headers["X-Total-Count"] = str(total)
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500
     finally:
@@ -117,11 +168,15 @@ def add_employee():
         reports_to_id = data.get("reports_to_id")
         designation_id = data.get("designation_id")
         department_id = data.get("department_id")
+        tz_name = data.get("timezone")
 
         # Validate required fields
         if not name or not email or not designation_id or not department_id:
             return jsonify({"error": "Missing required fields"}), 400
 
+        if tz_name is not None and not is_valid_timezone(tz_name):
+            return jsonify({"error": "Invalid timezone"}), 400
+
         # Email format validation
         if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
             return jsonify({"error": "Invalid email format"}), 400
@@ -154,10 +209,12 @@ def add_employee():
             email=email.strip(),
             reports_to_id=reports_to_id,
             designation_id=designation_id,
-            department_id=department_id
+            department_id=department_id,
+            timezone=tz_name
         )
         session.add(new_emp)
         session.commit()
+        index_employee(new_emp)
 
         return jsonify({"message": "Employee added successfully"}), 201
 
@@ -171,139 +228,320 @@ def add_employee():
         safe_close(session)
 
 
+def _dashboard_args():
+    """Parse get_dashboard_init's query string; raises ValueError on a bad page or include."""
+    limit, offset = _page_args()
+    return {
+        "include": _dashboard_include(),
+        "search": request.args.get("search"),
+        "department_id": request.args.get("department_id", type=int),
+        "designation_id": request.args.get("designation_id", type=int),
+        "project_id": request.args.get("project_id", type=int),
+        "limit": limit,
+        "offset": offset,
+    }
+
+
+def _dashboard_employees(session, search, department_id, designation_id, project_id, limit, offset):
+    # Project filter: employees who logged time on the project
+    project_employee_ids = None
+    if project_id:
+        project_employee_ids = {
+            emp_id for (emp_id,) in
+            session.query(DailyLog.employee_id).filter(DailyLog.project_id == project_id).distinct()
+        }
 
-
-def get_dashboard_init():
-    session = get_session()
-    try:
-        search = request.args.get("search")
-        department_id = request.args.get("department_id")
-        designation_id = request.args.get("designation_id")
-        project_id = request.args.get("project_id", type=int)
-
-        # Base query
+    if search:
+        employees, total = _load_search_page(
+            session, search, limit, offset,
+            department_id=department_id, designation_id=designation_id, employee_ids=project_employee_ids,
+        )
+    else:
         employee_query = session.query(Employee)
-
-        # Apply search filter
-        if search:
-            search_term = f"%{search}%"
-            employee_query = employee_query.filter(
-                or_(
-                    Employee.employee_name.ilike(search_term),
-                    Employee.email.ilike(search_term),
-                )
-            )
-
-        # Apply department filter
         if department_id:
-            employee_query = employee_query.filter(Employee.department_id == int(department_id))
-
-        # Apply designation filter
+            employee_query = employee_query.filter(Employee.department_id == department_id)
         if designation_id:
-            employee_query = employee_query.filter(Employee.designation_id == int(designation_id))
+            employee_query = employee_query.filter(Employee.designation_id == designation_id)
+        if project_employee_ids is not None:
+            employee_query = employee_query.filter(Employee.id.in_(project_employee_ids))
+        total = employee_query.count() if limit else None
+        employees = employee_query.order_by(Employee.id).offset(offset).limit(limit).options(
+            selectinload(Employee.designation), selectinload(Employee.department)
+        ).all()
+        total = len(employees) if total is None else total
+    chains = get_manager_chains(session, [emp.id for emp in employees])
+    employee_data = []
+    for emp in employees:
+        hierarchy = [
+            {
+                "id": manager.id,
+                "employee_name": manager.employee_name,
+                "email": manager.email,
+                "designation": manager.designation.as_dict() if manager.designation else None,
+                "department": manager.department.as_dict() if manager.department else None,
+            }
+            for manager in chains[emp.id]
+        ]
+
+        employee_data.append({
+            "id": emp.id,
+            "employee_name": emp.employee_name,
+            "email": emp.email,
+            "department": emp.department.as_dict() if emp.department else None,
+            "designation": emp.designation.as_dict() if emp.designation else None,
+            "reports_to": emp.reports_to_id,
+            "manager_hierarchy": hierarchy,
+        })
+    return {"employees": employee_data, "total_employees": total}
+
+
+def _all_as_dicts(model):
+    def load(session):
+        return [obj.as_dict() for obj in session.query(model).all()]
+    return load
+
+
+# Reference lists sent alongside the employee page
+DASHBOARD_LISTS = (("departments", Department), ("designations", Designation), ("projects", Project))
+
+
+def _dashboard_include():
+    """
+    Reference lists named in ?include=departments,projects (all of them when
+    absent, none for include=). The employee page is always sent.
+    """
+    include = request.args.get("include")
+    if include is None:
+        return [key for key, _ in DASHBOARD_LISTS]
+    names = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = set(names) - {key for key, _ in DASHBOARD_LISTS}
+    if unknown:
+        raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}")
+    return [key for key, _ in DASHBOARD_LISTS if key in names]
+
+
+def _dashboard_sections(include, **args):
+    lists = dict(DASHBOARD_LISTS)
+    return [("employees", partial(_dashboard_employees, **args))] + [
+        (key, _all_as_dicts(lists[key])) for key in include
+    ]
+
+
+def _stream_sections(sections):
+    """Fields of each section as it completes; failed sections are reported under "errors"."""
+    errors = {}
+    for name, result, error in sections:
+        if error is not None:
+            errors[name] = str(error)
+        elif isinstance(result, dict):
+            yield from result.items()
+        else:
+            yield name, result
+    if errors:
+        yield "errors", errors
 
-        # Apply project filter via subquery
-        if project_id:
-            subquery = session.query(DailyLog.employee_id).filter(DailyLog.project_id == project_id).distinct()
-            employee_query = employee_query.filter(Employee.id.in_(subquery))
 
-        # Fetch filtered employees
-        employees = employee_query.all()
-        employee_data = []
-        for emp in employees:
-            hierarchy = []
-            current = emp
-            visited = set()
-            while current.reports_to_id and current.reports_to_id not in visited:
-                visited.add(current.reports_to_id)
-                manager = session.query(Employee).filter_by(id=current.reports_to_id).first()
-                if not manager:
-                    break
-                hierarchy.append({
-                    "id": manager.id,
-                    "employee_name": manager.employee_name,
-                    "email": manager.email,
-                    "designation": manager.designation.as_dict() if manager.designation else None,
-                    "department": manager.department.as_dict() if manager.department else None,
-                })
-                current = manager
+def get_dashboard_init():
+    """
+    The employee page and the requested reference lists, each loaded on its
+    own pooled connection at the same time (utils/fanout.py) and streamed
+    as soon as it is ready, so key order follows completion order.
+    """
+    try:
+        args = _dashboard_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    sections = run_sections(_dashboard_sections(**args))
+    return create_json_object_response(_stream_sections(sections), flush_chunks=True)
 
-            employee_data.append({
-                "id": emp.id,
-                "employee_name": emp.employee_name,
-                "email": emp.email,
-                "department": emp.department.as_dict() if emp.department else None,
-                "designation": emp.designation.as_dict() if emp.designation else None,
-                "reports_to": emp.reports_to_id,
-                "manager_hierarchy": hierarchy,
-            })
 
-        # Other data
-        departments = session.query(Department).all()
-        department_data = [dept.as_dict() for dept in departments]
+async def get_dashboard_init_async():
+    """get_dashboard_init with the employee page and the three lists fetched concurrently."""
+    try:
+        args = _dashboard_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
 
-        designations = session.query(Designation).all()
-        designation_data = [des.as_dict() for des in designations]
+    sections = _dashboard_sections(**args)
+    results = await run_concurrently(*[fn for _, fn in sections])
+    response = dict(results[0])
+    response.update(zip([name for name, _ in sections[1:]], results[1:]))
+    return jsonify(response), 200
 
-        projects = session.query(Project).all()
-        project_data = [proj.as_dict() for proj in projects]
 
-        response = {
-            "employees": employee_data,
-            "departments": department_data,
-            "designations": designation_data,
-            "projects": project_data,
-        }
+def get_employee_details(employee_id):
+    session = get_session()
+    try:
+        emp = session.query(Employee).filter_by(id=employee_id).first()
+        if not emp:
+            return jsonify({"error": "Employee not found"}), 404
 
-        return jsonify(response), 200
+        # Build manager hierarchy
+        hierarchy = [
+            {
+                "id": manager.id,
+                "employee_name": manager.employee_name,
+                "email": manager.email,
+                "designation": manager.designation.as_dict() if manager.designation else None,
+                "department": manager.department.as_dict() if manager.department else None,
+            }
+            for manager in get_manager_chain(session, emp.id)
+        ]
+
+        # Get related projects (from daily logs)
+        project_ids = (
+            session.query(DailyLog.project_id)
+            .filter(DailyLog.employee_id == employee_id, DailyLog.project_id.isnot(None))
+            .distinct()
+            .all()
+        )
+        project_ids = [pid[0] for pid in project_ids]
+        projects = (
+            session.query(Project)
+            .filter(Project.id.in_(project_ids))
+            .all()
+        )
+        project_data = [proj.as_dict() for proj in projects]
 
+        return jsonify({
+            "id": emp.id,
+            "employee_name": emp.employee_name,
+            "email": emp.email,
+            "department": emp.department.as_dict() if emp.department else None,
+            "designation": emp.designation.as_dict() if emp.designation else None,
+            "reports_to": emp.reports_to_id,
+            "manager_hierarchy": hierarchy,
+            "projects": project_data,  # <-- Only related projects
+        }), 200
     finally:
         safe_close(session)
 
 
+def get_manager_hierarchy(employee_id, session):
+    return [
+        {
+            'id': manager.id,
+            'employee_name': manager.employee_name,
+            'email': manager.email,
+            'designation': {'title': manager.designation.title} if manager.designation else None
+        }
+        for manager in get_manager_chain(session, employee_id)
+    ]
+
+
+def _profile_base(session, email):
+    """The employee with department, designation and manager name, or None."""
+    manager = aliased(Employee)
+    row = (
+        session.query(Employee, Department, Designation, manager.employee_name)
+        .outerjoin(Department, Department.id == Employee.department_id)
+        .outerjoin(Designation, Designation.id == Employee.designation_id)
+        .outerjoin(manager, manager.id == Employee.reports_to_id)
+        .filter(Employee.email == email)
+        .first()
+    )
+    if row is None:
+        return None
+    employee, department, designation, manager_name = row
+    return {
+        'employee': {
+            'id': employee.id,
+            'employee_name': employee.employee_name,
+            'email': employee.email,
+            'reports_to': manager_name
+        },
+        'department': {'id': department.id, 'name': department.name} if department else None,
+        'designation': {'id': designation.id, 'title': designation.title} if designation else None,
+    }
+
+
+def _profile_projects(employee_id, session):
+    # Projects the employee manages, is assigned to under a manager, or is a member of
+    assigned_project_ids = union(
+        select(ManagerProjectAssignment.project_id).where(
+            or_(
+                ManagerProjectAssignment.manager_id == employee_id,
+                ManagerProjectAssignment.employee_id == employee_id
+            )
+        ),
+        select(EmployeeProject.project_id).where(EmployeeProject.employee_id == employee_id)
+    )
+    projects = session.query(Project).filter(Project.id.in_(assigned_project_ids)).order_by(Project.id).all()
+    return [p.as_dict() for p in projects]
+
+
+def assemble_employee_profile(session, email):
+    """
+    Build the /api/employee-info payload in three round trips: the employee
+    with department, designation and manager name; the manager chain; and
+    the union of the employee's project assignments.
+    """
+    profile = _profile_base(session, email)
+    if profile is None:
+        return None
+    employee_id = profile['employee']['id']
+    profile['projects'] = _profile_projects(employee_id, session)
+    profile['manager_hierarchy'] = get_manager_hierarchy(employee_id, session)
+    return profile
 
 
 def get_employee_info():
-    email = request.args.get("email")
+    email = request.args.get('email')
     if not email:
-        return jsonify({"error": "Email is required"}), 400
-    session = get_session()
+        return jsonify({'error': 'Email is required'}), 400
+
+    profile = profile_cache.get(email)
+    if profile is not None:
+        return jsonify(profile), 200
+
+    # A miss usually follows a write that invalidated the entry, and the
+    # cached profile outlives the read-your-writes window: build it from the
+    # primary so a lagging replica cannot put the old one back
+    session = get_session(use_replica=False)
     try:
-        employee = session.query(Employee).filter_by(email=email).first()
-        if not employee:
-            return jsonify({"error": "Employee not found"}), 404
-        hierarchy = []
-        current = employee
-        visited = set()
-        while current.reports_to_id and current.reports_to_id not in visited:
-            visited.add(current.reports_to_id)
-            manager = session.get(Employee, current.reports_to_id)
-            if not manager:
-                break
-            hierarchy.append({
-                "id": manager.id,
-                "employee_name": manager.employee_name,
-                "email": manager.email,
-                "designation": manager.designation.as_dict() if manager.designation else None,
-                "department": manager.department.as_dict() if manager.department else None
-            })
-            current = manager
-        response = {
-            "employee": employee.as_dict(),
-            "department": employee.department.as_dict() if employee.department else None,
-            "designation": employee.designation.as_dict() if employee.designation else None,
-            "projects": [p.as_dict() for p in session.query(Project).all()],
-            "manager_hierarchy": hierarchy
-        }
-        return jsonify(response), 200
+        generation = profile_cache.generation()
+        profile = assemble_employee_profile(session, email)
+        if profile is None:
+            return jsonify({'error': 'Employee not found'}), 404
+        profile_cache.put(email, profile['employee']['id'], profile, generation)
+        return jsonify(profile), 200
+
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        return jsonify({'error': str(e)}), 500
     finally:
         safe_close(session)
 
 
+async def get_employee_info_async():
+    """get_employee_info with the projects and manager chain fetched concurrently."""
+    email = request.args.get('email')
+    if not email:
+        return jsonify({'error': 'Email is required'}), 400
+
+    profile = profile_cache.get(email)
+    if profile is not None:
+        return jsonify(profile), 200
+
+    try:
+        generation = profile_cache.generation()
+        # Built from the primary, as in get_employee_info
+        (profile,) = await run_concurrently(partial(_profile_base, email=email), use_replica=False)
+        if profile is None:
+            return jsonify({'error': 'Employee not found'}), 404
+        employee_id = profile['employee']['id']
+        profile['projects'], profile['manager_hierarchy'] = await run_concurrently(
+            partial(_profile_projects, employee_id),
+            partial(get_manager_hierarchy, employee_id),
+            use_replica=False,
+        )
+        profile_cache.put(email, employee_id, profile, generation)
+        return jsonify(profile), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 
-#  update the reviwer of teh following employee 
 def update_reviewer_for_employee(employee_id):
     session = get_session()
     try:
@@ -330,6 +568,9 @@ def update_reviewer_for_employee(employee_id):
         # Update reports_to_id
         employee.reports_to_id = reviewer_id
         session.commit()
+        index_employee(employee)
+        # Every subordinate's manager chain changes too
+        profile_cache.invalidate_all()
 
         return jsonify({"message": f"Reviewer for employee ID {employee_id} updated to {reviewer_id}"}), 200
 
@@ -1,11 +1,16 @@
 from models.project import Project
+from models.employee import Employee
 from utils.helpers import safe_close
-from flask import Flask, jsonify
+from flask import jsonify
 from utils.session_manager import get_session
-from datetime import datetime
 from flask import request
+from sqlalchemy import or_
 from models.employeeproject import EmployeeProject
-from models.managerproject import ManagerProjectAssignment 
+from models.managerproject import ManagerProjectAssignment
+from utils.profile_cache import profile_cache
+from utils.staffing import assign_triples, remove_triples, parse_triples, staffing_response, touched_employees
+from utils.statements import project_by_id
+from config.config import STAFFING_MAX_ITEMS
 
 
 
@@ -19,6 +24,7 @@ def list_projects():
     finally:
         safe_close(session)
 
+
 def list_projects_for_user():
     session = get_session()
     try:
@@ -61,38 +67,6 @@ def list_projects_for_user():
     finally:
         safe_close(session)
 
-# def add_project():
-#     session = get_session()
-#     try:
-#         data = request.get_json()
-
-#         # Validate input
-#         if not data or 'name' not in data:
-#             return jsonify({'error': 'Project name is required'}), 400
-
-#         # Check for duplicate project name
-#         existing = session.query(Project).filter_by(name=data['name']).first()
-#         if existing:
-#             return jsonify({'error': 'Project with this name already exists'}), 409
-
-#         # Create new Project object
-#         new_project = Project(
-#             name=data['name'],
-#             description=data.get('description', '')
-#         )
-
-#         session.add(new_project)
-#         session.commit()
-
-#         return jsonify({'message': 'Project added successfully', 'project': new_project.as_dict()}), 201
-
-#     except Exception as e:
-#         session.rollback()
-#         return jsonify({'error': str(e)}), 500
-
-#     finally:
-#         safe_close(session)
-
 
 def add_project():
     session = get_session()
@@ -126,6 +100,8 @@ def add_project():
             session.add(manager_assignment)
 
         session.commit()
+        if manager_id:
+            profile_cache.invalidate_employees([manager_id])
 
         return jsonify({
             'message': 'Project added successfully',
@@ -137,4 +113,288 @@ def add_project():
         return jsonify({'error': str(e)}), 500
 
     finally:
-        safe_close(session)
\ No newline at end of file
+        safe_close(session)
+
+
+def get_project(project_id):
+    session = get_session()
+    try:
+        project = project_by_id(session, project_id)
+        if not project:
+            return jsonify({"error": f"Project with ID {project_id} not found"}), 404
+        return jsonify({
+            "id": project.id,
+            "name": project.name
+        }), 200
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch project: {str(e)}"}), 500
+    finally:
+        safe_close(session)
+
+
+def list_projects_with_team():
+    session = get_session()
+    try:
+        projects = session.query(Project).all()
+
+        # Managers come from EmployeeProject, their team members from
+        # ManagerProjectAssignment; load both once instead of per project.
+        managers_by_project = {}
+        for link, name in (
+            session.query(EmployeeProject, Employee.employee_name)
+            .join(Employee, Employee.id == EmployeeProject.employee_id)
+            .order_by(EmployeeProject.id)
+        ):
+            managers_by_project.setdefault(link.project_id, []).append({
+                "id": link.employee_id,
+                "name": name
+            })
+
+        members_by_manager = {}
+        for assignment, name in (
+            session.query(ManagerProjectAssignment, Employee.employee_name)
+            .join(Employee, Employee.id == ManagerProjectAssignment.employee_id)
+            .order_by(ManagerProjectAssignment.id)
+        ):
+            members_by_manager.setdefault((assignment.project_id, assignment.manager_id), []).append({
+                "id": assignment.employee_id,
+                "name": name
+            })
+
+        result = []
+        for project in projects:
+            managers = managers_by_project.get(project.id, [])
+            team_members = []
+            for manager in managers:
+                team_members.extend(members_by_manager.get((project.id, manager["id"]), []))
+
+            result.append({
+                "project_id": project.id,
+                "project_name": project.name,
+                "description": project.description,
+                "managers": managers,
+                "team_members": team_members
+            })
+
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        safe_close(session)
+
+
+def assign_employee():
+    session = get_session()
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return jsonify({"detail": "Invalid or missing JSON body"}), 400
+
+        manager_id = data.get('manager_id')
+        project_id = data.get('project_id')
+        employee_id = data.get('employee_id')
+
+        if not all([manager_id, project_id, employee_id]):
+            return jsonify({"detail": "Missing required fields"}), 400
+
+        # Check project exists
+        project = session.query(Project).filter_by(id=project_id).first()
+        if not project:
+            return jsonify({"detail": "Project not found"}), 404
+
+        # Check manager is a member of the project
+        manager_project = session.query(EmployeeProject.id).filter_by(
+            employee_id=manager_id, project_id=project_id
+        ).first()
+        if not manager_project:
+            return jsonify({"detail": "Manager not assigned to this project"}), 403
+
+        # Prevent duplicate in ManagerProjectAssignment
+        manager_employee_assignment = session.query(ManagerProjectAssignment).filter_by(
+            manager_id=manager_id, project_id=project_id, employee_id=employee_id
+        ).first()
+        if manager_employee_assignment:
+            return jsonify({"detail": "Employee already assigned under this manager for the project"}), 409
+
+        # Only record in ManagerProjectAssignment
+        session.add(ManagerProjectAssignment(
+            manager_id=manager_id,
+            project_id=project_id,
+            employee_id=employee_id
+        ))
+
+        session.commit()
+        profile_cache.invalidate_employees([manager_id, employee_id])
+        return jsonify({"message": "Employee assigned to manager's project successfully"}), 200
+
+    except Exception as e:
+        session.rollback()
+        return jsonify({"detail": f"Failed to assign employee: {str(e)}"}), 500
+    finally:
+        safe_close(session)
+
+
+def list_manager_assignments(manager_id):
+    session = get_session()
+    try:
+        assignments = session.query(ManagerProjectAssignment).filter_by(
+            manager_id=manager_id
+        ).all()
+        return jsonify([a.as_dict() for a in assignments]), 200
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch manager assignments: {str(e)}"}), 500
+    finally:
+        safe_close(session)
+
+
+def remove_employee():
+    session = get_session()
+    try:
+        data = request.get_json(silent=True)
+        manager_id = data.get('manager_id')
+        project_id = data.get('project_id')
+        employee_id = data.get('employee_id')
+
+        if not all([manager_id, project_id, employee_id]):
+            return jsonify({"detail": "Missing required fields"}), 400
+
+        # Remove from ManagerProjectAssignment
+        assignment = session.query(ManagerProjectAssignment).filter_by(
+            manager_id=manager_id,
+            project_id=project_id,
+            employee_id=employee_id
+        ).first()
+
+        if not assignment:
+            return jsonify({"detail": "Assignment not found"}), 404
+
+        session.delete(assignment)
+
+        # Also remove from EmployeeProject
+        emp_proj_assignment = session.query(EmployeeProject).filter_by(
+            employee_id=employee_id,
+            project_id=project_id
+        ).first()
+
+        if emp_proj_assignment:
+            session.delete(emp_proj_assignment)
+
+        session.commit()
+        profile_cache.invalidate_employees([manager_id, employee_id])
+
+        return jsonify({"message": "Employee removed successfully"}), 200
+
+    except Exception as e:
+        session.rollback()
+        return jsonify({"detail": f"Failed to remove employee: {str(e)}"}), 500
+    finally:
+        safe_close(session)
+
+
+def _staffing_items():
+    items = request.get_json(silent=True)
+    if isinstance(items, dict):
+        items = items.get("assignments")
+    if not isinstance(items, list) or not items:
+        return None, (jsonify({"detail": "Expected a non-empty list of assignments"}), 400)
+    if len(items) > STAFFING_MAX_ITEMS:
+        return None, (jsonify({"detail": f"At most {STAFFING_MAX_ITEMS} assignments per request"}), 400)
+    return items, None
+
+
+def bulk_assign_employees():
+    """Assign many (manager_id, project_id, employee_id) triples; reports an outcome per item."""
+    items, error = _staffing_items()
+    if error:
+        return error
+    session = get_session()
+    try:
+        triples = parse_triples(items)
+        statuses = assign_triples(session, triples)
+        session.commit()
+        profile_cache.invalidate_employees(touched_employees(triples, statuses, "assigned"))
+        return jsonify(staffing_response(items, triples, statuses)), 200
+    except Exception as e:
+        session.rollback()
+        return jsonify({"detail": f"Failed to assign employees: {str(e)}"}), 500
+    finally:
+        safe_close(session)
+
+
+def bulk_remove_employees():
+    """Remove many (manager_id, project_id, employee_id) triples; reports an outcome per item."""
+    items, error = _staffing_items()
+    if error:
+        return error
+    session = get_session()
+    try:
+        triples = parse_triples(items)
+        statuses = remove_triples(session, triples)
+        session.commit()
+        profile_cache.invalidate_employees(touched_employees(triples, statuses, "removed"))
+        return jsonify(staffing_response(items, triples, statuses)), 200
+    except Exception as e:
+        session.rollback()
+        return jsonify({"detail": f"Failed to remove employees: {str(e)}"}), 500
+    finally:
+        safe_close(session)
+
+
+def get_employee_projects(employee_id):
+    session = get_session()
+    try:
+        # From ManagerProjectAssignment
+        manager_assignments = session.query(ManagerProjectAssignment).filter(
+            or_(
+                ManagerProjectAssignment.employee_id == employee_id,
+                ManagerProjectAssignment.manager_id == employee_id
+            )
+        ).all()
+
+        # From EmployeeProject
+        employee_assignments = session.query(EmployeeProject).filter_by(
+            employee_id=employee_id
+        ).all()
+
+        # Combine project IDs from both tables
+        project_ids = {a.project_id for a in manager_assignments} | {e.project_id for e in employee_assignments}
+
+        if not project_ids:
+            return jsonify([]), 200
+
+        projects = session.query(Project).filter(Project.id.in_(project_ids)).all()
+
+        result = [{"id": p.id, "name": p.name} for p in projects]
+        return jsonify(result), 200
+
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch projects: {str(e)}"}), 500
+    finally:
+        safe_close(session)
+
+
+def get_project_employees(project_id):
+    session = get_session()
+    try:
+        # Fetch employees assigned to the project via EmployeeProject
+        employee_projects = session.query(EmployeeProject).filter_by(project_id=project_id).all()
+        if not employee_projects:
+            return jsonify([]), 200
+
+        # Fetch employee details
+        employee_ids = [ep.employee_id for ep in employee_projects]
+        employees = session.query(Employee).filter(Employee.id.in_(employee_ids)).all()
+        
+        result = [
+            {
+                "employee_id": emp.id,
+                "employee_name": emp.employee_name
+            }
+            for emp in employees
+        ]
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": f"Failed to fetch project employees: {str(e)}"}), 500
+    finally:
+        safe_close(session)
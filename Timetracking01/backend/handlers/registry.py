@@ -0,0 +1,190 @@
+"""
+Single registry of every API route.
+
+Each (rule, method) pair maps to exactly one handler function. Routes are
+grouped into one blueprint per handler module; register_blueprints() refuses
+to start the app if any pair is registered twice.
+
+Handlers are named as "module:function" strings and wrapped in LazyView, so
+a handler module (and the models it pulls in) is imported on the first
+request that needs it instead of at worker startup.
+
+With ASYNC_HANDLERS on, a handler module may define `<function>_async`
+next to `<function>`; the async twin is served instead (see
+utils/async_db.py).
+"""
+import importlib
+import threading
+from flask import Blueprint, current_app
+from config.config import ASYNC_HANDLERS
+
+HANDLERS = {
+    "employee": "handlers.employee.employee",
+    "dailylogs": "handlers.dailylogs.dailylogs",
+    "dailylogchanges": "handlers.dailylogchanges.dailylogchanges",
+    "department": "handlers.department.department",
+    "designation": "handlers.designation.designation",
+    "project": "handlers.project.project",
+    "admin": "handlers.admin_dashboard.admin",
+}
+
+# Relationships are declared by class name, so the mappers can only be
+# configured once every model module has been imported.
+MODEL_MODULES = (
+    "models.department",
+    "models.designation",
+    "models.employee",
+    "models.project",
+    "models.dailylogs",
+    "models.dailylogchanges",
+    "models.employeeproject",
+    "models.managerproject",
+    "models.employeelogversion",
+    "models.dailylogoccupancy",
+    "models.dailylogarchive",
+    "models.descriptionblob",
+    "models.idempotencykey",
+)
+
+
+ROUTES = {
+    "employees": [
+        ("/api/employees", ["GET"], "employee:list_employees"),
+        ("/api/employees", ["POST"], "employee:add_employee"),
+        ("/api/employees/profile-with-hierarchy", ["GET"], "employee:get_employee_profile_with_hierarchy"),
+        ("/api/employees/with-details", ["GET"], "employee:get_employees_with_details"),
+        ("/api/employees/<int:employee_id>/details", ["GET"], "employee:get_employee_details"),
+        ("/api/employees/update-reviewer/<int:employee_id>", ["PUT"], "employee:update_reviewer_for_employee"),
+        ("/api/employee-info", ["GET"], "employee:get_employee_info"),
+        ("/api/dashboard/init", ["GET"], "employee:get_dashboard_init"),
+    ],
+    "daily_logs": [
+        ("/api/daily-logs/save", ["POST"], "dailylogs:save_daily_logs"),
+        ("/api/daily-logs/autosave/flush", ["POST"], "dailylogs:flush_autosaved_logs"),
+        ("/api/daily-logs/review", ["POST"], "dailylogs:update_log_review_status"),
+        ("/api/daily-logs/by-employee", ["GET"], "dailylogs:get_daily_logs_by_employeee"),
+        ("/api/daily-logs/by-reviewer", ["GET"], "dailylogs:get_daily_logs_by_reviewer"),
+        ("/api/daily-logs/today/<int:employee_id>", ["GET"], "dailylogs:get_todays_logs"),
+        ("/api/daily-logs/latest-seven-days/<int:employee_id>", ["GET"], "dailylogs:get_latest_seven_days_daily_logs"),
+        ("/api/daily-logs/week/<int:employee_id>", ["GET"], "dailylogs:get_weekly_logs"),
+        ("/api/daily-logs/filter/<int:employee_id>", ["GET"], "dailylogs:filter_daily_logs"),
+        ("/api/daily-logs/all-reviewers/<int:employee_id>", ["GET"], "dailylogs:get_all_daily_logs_for_employee"),
+        ("/api/daily-logs/feed", ["GET"], "dailylogs:get_daily_logs_feed"),
+        ("/api/daily-logs/reviewer-stream", ["GET"], "dailylogs:stream_reviewer_events"),
+    ],
+    "daily_log_changes": [
+        ("/api/daily-logs/<int:log_id>/changes", ["GET"], "dailylogchanges:get_daily_log_changes"),
+    ],
+    "departments": [
+        ("/api/departments", ["GET"], "department:get_departments"),
+        ("/api/departments", ["POST"], "department:add_department"),
+        ("/api/departments/<int:dept_id>", ["PUT"], "department:update_department"),
+        ("/api/departments/<int:dept_id>", ["DELETE"], "department:delete_department"),
+        ("/api/departments/<int:dept_id>/archive-logs", ["POST"], "department:archive_department_logs"),
+    ],
+    "designations": [
+        ("/api/designations", ["GET"], "designation:fetch_designations"),
+        ("/api/designations", ["POST"], "designation:add_designation"),
+        ("/api/designations/<int:des_id>", ["PUT"], "designation:update_designation"),
+        ("/api/designations/<int:des_id>", ["DELETE"], "designation:delete_designation"),
+    ],
+    "projects": [
+        ("/api/projects", ["GET"], "project:list_projects"),
+        ("/api/projects", ["POST"], "project:add_project"),
+        ("/api/projects/all", ["GET"], "project:list_projects_with_team"),
+        ("/api/projects/<int:project_id>", ["GET"], "project:get_project"),
+        ("/api/projectss", ["GET"], "project:list_projects_for_user"),
+        ("/api/project_employees/<int:project_id>", ["GET"], "project:get_project_employees"),
+        ("/api/employee_projects/<int:employee_id>", ["GET"], "project:get_employee_projects"),
+        ("/api/manager_projects/<int:manager_id>", ["GET"], "project:list_manager_assignments"),
+        ("/api/manager_project/assign", ["POST"], "project:assign_employee"),
+        ("/api/manager_project/remove", ["DELETE"], "project:remove_employee"),
+        ("/api/manager_project/bulk", ["POST"], "project:bulk_assign_employees"),
+        ("/api/manager_project/bulk", ["DELETE"], "project:bulk_remove_employees"),
+    ],
+    "analytics": [
+        ("/api/analytics/timesheet", ["GET"], "admin:analytics_timesheet"),
+        ("/api/managers/<int:manager_id>/subtree-hours", ["GET"], "admin:subtree_hours_rollup"),
+    ],
+}
+
+
+_models_lock = threading.Lock()
+_models_loaded = False
+
+
+def load_models():
+    global _models_loaded
+    if not _models_loaded:
+        with _models_lock:
+            if not _models_loaded:
+                for module in MODEL_MODULES:
+                    importlib.import_module(module)
+                _models_loaded = True
+
+
+class LazyView:
+    """View function that imports its handler module on first call."""
+
+    def __init__(self, target):
+        self.target = target
+        self.module_key, _, self.__name__ = target.partition(":")
+        self._view = None
+
+    def resolve(self):
+        if self._view is None:
+            load_models()
+            module = importlib.import_module(HANDLERS[self.module_key])
+            view = getattr(module, self.__name__)
+            if ASYNC_HANDLERS:
+                view = getattr(module, self.__name__ + "_async", view)
+            self._view = view
+        return self._view
+
+    def __call__(self, *args, **kwargs):
+        # ensure_sync runs coroutine handlers on an event loop (flask[async])
+        return current_app.ensure_sync(self.resolve())(*args, **kwargs)
+
+
+def preload_views(app):
+    """Import every handler now, e.g. before forking workers that share memory."""
+    for view in app.view_functions.values():
+        if isinstance(view, LazyView):
+            view.resolve()
+
+
+def check_duplicate_routes(rules):
+    """Raise if any (rule, method) pair or endpoint name is registered twice."""
+    seen = {}
+    endpoints = {}
+    for rule, methods, endpoint in rules:
+        if endpoint in endpoints and endpoints[endpoint] != rule:
+            raise RuntimeError(f"Endpoint {endpoint} registered for both {endpoints[endpoint]} and {rule}")
+        endpoints[endpoint] = rule
+        for method in methods:
+            key = (rule, method)
+            if key in seen:
+                raise RuntimeError(f"Duplicate route {method} {rule}: {seen[key]} and {endpoint}")
+            seen[key] = endpoint
+
+
+def create_blueprints():
+    blueprints = []
+    for name, routes in ROUTES.items():
+        blueprint = Blueprint(name, __name__)
+        for rule, methods, target in routes:
+            view = LazyView(target)
+            blueprint.add_url_rule(rule, endpoint=view.__name__, view_func=view, methods=methods)
+        blueprints.append(blueprint)
+    return blueprints
+
+
+def register_blueprints(app):
+    for blueprint in create_blueprints():
+        app.register_blueprint(blueprint)
+    # Check the final URL map so routes added outside the registry count too
+    check_duplicate_routes(
+        (rule.rule, sorted(rule.methods - {"HEAD", "OPTIONS"}), rule.endpoint)
+        for rule in app.url_map.iter_rules()
+        if rule.endpoint != "static"
+    )
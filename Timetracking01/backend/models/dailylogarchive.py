@@ -0,0 +1,58 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Time, Float, DateTime, Index
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import relationship
+from models.base import Base
+from models.dailylogs import DailyLog
+from models.dailylogchanges import DailyLogChange
+
+# Logs of closed years, moved out of daily_logs by archive_logs.py so the hot
+# table only holds recent data (see utils/log_archive.py). Rows keep their
+# original ids and columns; they are read-only.
+
+class ArchivedDailyLog(Base):
+    __tablename__ = 'daily_logs_archive'
+    __table_args__ = (
+        Index('ix_daily_logs_archive_employee_date', 'employee_id', 'log_date'),
+        Index('ix_daily_logs_archive_date', 'log_date'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    employee_id = Column(Integer, ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='SET NULL'), nullable=True)
+    log_date = Column(Date, nullable=False)
+    start_time = Column(Time, nullable=False)
+    end_time = Column(Time, nullable=False)
+    total_hours = Column(Float, nullable=False)
+    task_description = Column(String(255), nullable=False)
+    status_review = Column(String(50), nullable=False)
+    reviewer_id = Column(Integer, ForeignKey('employees.id', ondelete='SET NULL'), nullable=True)
+    rejection_reason = Column(String(255), nullable=True)
+    updated_at = Column(DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"), nullable=False, index=True)
+
+    employee = relationship("Employee", foreign_keys=[employee_id])
+    project = relationship("Project")
+    reviewer = relationship("Employee", foreign_keys=[reviewer_id])
+
+    # Same shape as a live log
+    as_dict = DailyLog.as_dict
+
+
+class ArchivedDailyLogChange(Base):
+    __tablename__ = 'daily_log_changes_archive'
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    daily_log_id = Column(Integer, ForeignKey('daily_logs_archive.id', ondelete='CASCADE'), nullable=False, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete='SET NULL'), nullable=True)
+    changed_at = Column(DateTime, nullable=False)
+    new_description = Column(String(255), nullable=True)
+    description_hash = Column(String(40), ForeignKey('description_blobs.hash'), nullable=True, index=True)
+    status_review = Column(String(50), nullable=False)
+    reviewer_id = Column(Integer, ForeignKey('employees.id', ondelete='SET NULL'), nullable=True)
+    rejection_reason = Column(String(255), nullable=True)
+    updated_at = Column(DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"), nullable=False, index=True)
+
+    reviewer = relationship("Employee", foreign_keys=[reviewer_id])
+    description_blob = relationship("DescriptionBlob", lazy="joined")
+
+    description = DailyLogChange.description
+    as_dict = DailyLogChange.as_dict
@@ -1,4 +1,5 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 from models.base import Base
 from datetime import datetime
@@ -10,14 +11,31 @@ class DailyLogChange(Base):
     daily_log_id = Column(Integer, ForeignKey('daily_logs.id', ondelete='CASCADE'), nullable=False)
     project_id = Column(Integer, ForeignKey('projects.id', ondelete='SET NULL'), nullable=True)
     changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
-    new_description = Column(String(255), nullable=False)
+    # Rows written before description_blobs existed keep their text inline;
+    # newer rows only reference a blob. Read through `description`.
+    new_description = Column(String(255), nullable=True)
+    description_hash = Column(String(40), ForeignKey('description_blobs.hash'), nullable=True, index=True)
     status_review = Column(String(50), nullable=False, default="Pending")  # Status: Pending, Approved, Rejected
     reviewer_id = Column(Integer, ForeignKey('employees.id', ondelete='SET NULL'), nullable=True)  # Tracks who reviewed
     rejection_reason = Column(String(255), nullable=True)  # Reason for rejection, if applicable
+    updated_at = Column(
+        DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+        index=True
+    )
 
     daily_log = relationship("DailyLog", back_populates="daily_log_changes")
     project = relationship("Project", back_populates="daily_log_changes")
     reviewer = relationship("Employee", foreign_keys=[reviewer_id])
+    description_blob = relationship("DescriptionBlob", lazy="joined")
+
+    @property
+    def description(self):
+        if self.new_description is not None:
+            return self.new_description
+        return self.description_blob.body if self.description_blob else None
 
     def as_dict(self):
         return {
@@ -25,9 +43,10 @@ class DailyLogChange(Base):
             "daily_log_id": self.daily_log_id,
             "project_id": self.project_id,
             "changed_at": self.changed_at.isoformat(),
-            "new_description": self.new_description,
+            "new_description": self.description,
             "status_review": self.status_review,
             "reviewer_id": self.reviewer_id,
             "reviewer_name": self.reviewer.employee_name if self.reviewer else None,
-            "rejection_reason": self.rejection_reason
+            "rejection_reason": self.rejection_reason,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
\ No newline at end of file
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, BigInteger, Date, ForeignKey
+from models.base import Base
+
+class DailyLogOccupancy(Base):
+    __tablename__ = 'daily_log_occupancy'
+
+    # Minutes already covered by an employee's logs on one date. Each hour_NN
+    # column is a 60-bit mask (bit m = minute m of that hour), small enough
+    # for a signed BIGINT on every backend, so claiming a range is a single
+    # conditional UPDATE (see utils/occupancy.py).
+    employee_id = Column(Integer, ForeignKey('employees.id', ondelete='CASCADE'), primary_key=True)
+    log_date = Column(Date, primary_key=True)
+    hour_00 = Column(BigInteger, nullable=False, default=0)
+    hour_01 = Column(BigInteger, nullable=False, default=0)
+    hour_02 = Column(BigInteger, nullable=False, default=0)
+    hour_03 = Column(BigInteger, nullable=False, default=0)
+    hour_04 = Column(BigInteger, nullable=False, default=0)
+    hour_05 = Column(BigInteger, nullable=False, default=0)
+    hour_06 = Column(BigInteger, nullable=False, default=0)
+    hour_07 = Column(BigInteger, nullable=False, default=0)
+    hour_08 = Column(BigInteger, nullable=False, default=0)
+    hour_09 = Column(BigInteger, nullable=False, default=0)
+    hour_10 = Column(BigInteger, nullable=False, default=0)
+    hour_11 = Column(BigInteger, nullable=False, default=0)
+    hour_12 = Column(BigInteger, nullable=False, default=0)
+    hour_13 = Column(BigInteger, nullable=False, default=0)
+    hour_14 = Column(BigInteger, nullable=False, default=0)
+    hour_15 = Column(BigInteger, nullable=False, default=0)
+    hour_16 = Column(BigInteger, nullable=False, default=0)
+    hour_17 = Column(BigInteger, nullable=False, default=0)
+    hour_18 = Column(BigInteger, nullable=False, default=0)
+    hour_19 = Column(BigInteger, nullable=False, default=0)
+    hour_20 = Column(BigInteger, nullable=False, default=0)
+    hour_21 = Column(BigInteger, nullable=False, default=0)
+    hour_22 = Column(BigInteger, nullable=False, default=0)
+    hour_23 = Column(BigInteger, nullable=False, default=0)
+
+    def as_dict(self):
+        return {
+            "employee_id": self.employee_id,
+            "log_date": self.log_date.isoformat(),
+            "minutes": [getattr(self, f"hour_{hour:02d}") for hour in range(24)]
+        }
@@ -1,9 +1,17 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Date, Time, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, Date, Time, Float, DateTime, Index
+from sqlalchemy.dialects import mysql
 from sqlalchemy.orm import relationship
 from models.base import Base
+from datetime import datetime
 
 class DailyLog(Base):
     __tablename__ = 'daily_logs'
+    __table_args__ = (
+        # Serves the per-employee date-range filters in utils/filters.py
+        Index('ix_daily_logs_employee_date', 'employee_id', 'log_date'),
+        # Admin analytics filter by date across all employees
+        Index('ix_daily_logs_date', 'log_date'),
+    )
 
     id = Column(Integer, primary_key=True)
     employee_id = Column(Integer, ForeignKey('employees.id', ondelete='CASCADE'), nullable=False)
@@ -16,6 +24,14 @@ class DailyLog(Base):
     status_review = Column(String(50), nullable=False, default="Pending")
     reviewer_id = Column(Integer, ForeignKey('employees.id', ondelete='SET NULL'), nullable=True)
     rejection_reason = Column(String(255), nullable=True)
+    # Bumped on every insert/update; drives the /api/daily-logs/feed cursor
+    updated_at = Column(
+        DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"),
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False,
+        index=True
+    )
 
     employee = relationship(
     "Employee",
@@ -41,7 +57,8 @@ class DailyLog(Base):
             "status_review": self.status_review,
             "reviewer_id": self.reviewer_id,
             "reviewer_name": self.reviewer.employee_name if self.reviewer else None,
-            "rejection_reason": self.rejection_reason
+            "rejection_reason": self.rejection_reason,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
 
 
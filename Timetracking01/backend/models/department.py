@@ -7,13 +7,20 @@ class Department(Base):
 
     id = Column(Integer, primary_key=True)
     name = Column(String(100), unique=True, nullable=False)
+    # IANA zone name; NULL means DEFAULT_TIMEZONE
+    timezone = Column(String(64), nullable=True)
 
     # One-to-many relationships
-    designations = relationship("Designation", back_populates="department", cascade="all, delete-orphan")
-    employees = relationship("Employee", back_populates="department", cascade="all, delete-orphan")
+    # Deletes go through utils/bulk_delete.py; passive_deletes keeps a plain
+    # session.delete() from loading every child row first
+    designations = relationship("Designation", back_populates="department", cascade="all, delete-orphan",
+                                passive_deletes=True)
+    employees = relationship("Employee", back_populates="department", cascade="all, delete-orphan",
+                             passive_deletes=True)
 
     def as_dict(self):
         return {
             "id": self.id,
-            "name": self.name
+            "name": self.name,
+            "timezone": self.timezone
         }
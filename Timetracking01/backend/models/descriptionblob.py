@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, String
+from models.base import Base
+
+class DescriptionBlob(Base):
+    __tablename__ = 'description_blobs'
+
+    # Task descriptions referenced by daily_log_changes, stored once per
+    # distinct text (see utils/history.py)
+    hash = Column(String(40), primary_key=True)  # sha1 hex of body
+    body = Column(String(255), nullable=False)
+    # Last time a save referenced the blob; compaction keeps recently used
+    # blobs even when nothing references them yet
+    used_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def as_dict(self):
+        return {"hash": self.hash, "body": self.body}
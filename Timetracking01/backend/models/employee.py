@@ -8,10 +8,12 @@ class Employee(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     employee_name = Column(String(100), nullable=False)
-    email = Column(String(100), nullable=False)
+    email = Column(String(100), nullable=False, index=True)
     department_id = Column(Integer, ForeignKey('departments.id', ondelete='CASCADE'))
     designation_id = Column(Integer, ForeignKey('designations.id', ondelete='SET NULL'))
     reports_to_id = Column(Integer, ForeignKey('employees.id'), nullable=True)
+    # IANA zone name, e.g. "Europe/Berlin"; NULL means use the department's
+    timezone = Column(String(64), nullable=True)
 
     department = relationship("Department", back_populates="employees")
     designation = relationship("Designation", back_populates="employees")
@@ -28,7 +30,8 @@ class Employee(Base):
     employee_projects = relationship(
         "EmployeeProject",
         back_populates="employee",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        passive_deletes=True
     )
 
     def as_dict(self):
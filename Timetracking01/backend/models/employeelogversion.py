@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from models.base import Base
+from datetime import datetime
+
+class EmployeeLogVersion(Base):
+    __tablename__ = 'employee_log_versions'
+
+    # One row per employee, bumped on every write to that employee's daily logs
+    employee_id = Column(Integer, ForeignKey('employees.id', ondelete='CASCADE'), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def as_dict(self):
+        return {
+            "employee_id": self.employee_id,
+            "version": self.version,
+            "updated_at": self.updated_at.isoformat()
+        }
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from models.base import Base
+from datetime import datetime
+
+class IdempotencyKey(Base):
+    __tablename__ = 'idempotency_keys'
+
+    # Outcome of a request sent with an Idempotency-Key header, replayed to
+    # retries of it for IDEMPOTENCY_TTL_SECONDS (see utils/idempotency.py)
+    key = Column(String(128), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # sha256 of method, path, query and body
+    status_code = Column(Integer, nullable=True)  # NULL while the first request is running
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def as_dict(self):
+        return {
+            "key": self.key,
+            "status_code": self.status_code,
+            "created_at": self.created_at.isoformat()
+        }
@@ -0,0 +1,64 @@
+import itertools
+import os
+import shutil
+import sys
+
+import pytest
+
+# Tests import backend modules the way the app does (config.config, utils.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+
+
+@pytest.fixture
+def app_db(tmp_path, monkeypatch):
+    """Primary SQLite database behind get_session(), with department 1, employee 1 and project 1."""
+    from handlers.registry import load_models
+    from models.base import Base
+    from models.department import Department
+    from models.employee import Employee
+    from models.project import Project
+    from utils import session_manager
+
+    load_models()
+    path = tmp_path / "primary.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Department.__table__).values(id=1, name="Eng"))
+        conn.execute(insert(Employee.__table__).values(id=1, employee_name="Alice", email="alice@x.com", department_id=1))
+        conn.execute(insert(Project.__table__).values(id=1, name="P", description=""))
+    monkeypatch.setitem(session_manager.SessionLocal.kw, "bind", engine)
+    yield engine, path
+    engine.dispose()
+
+
+@pytest.fixture
+def lagging_replica(app_db, tmp_path, monkeypatch):
+    """Call to configure one read replica: a copy of the primary as it is now, which never catches up."""
+    from utils import replica_routing, session_manager
+
+    engines = []
+
+    def snapshot():
+        replica_path = tmp_path / f"replica{len(engines)}.db"
+        shutil.copy(app_db[1], replica_path)
+        uri = f"sqlite:///{replica_path}"
+        engines.append(create_engine(uri))
+        monkeypatch.setattr(replica_routing, "SQLALCHEMY_REPLICA_URIS", [uri])
+        monkeypatch.setattr(session_manager, "SQLALCHEMY_REPLICA_URIS", [uri])
+        monkeypatch.setattr(session_manager, "replica_engines", [engines[-1]])
+        monkeypatch.setattr(session_manager, "_replica_cycle", itertools.cycle([engines[-1]]))
+
+    yield snapshot
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def api_client(app_db):
+    from app import app
+
+    # Without cookies, like the frontend, which calls the API cross-site
+    return app.test_client(use_cookies=False)
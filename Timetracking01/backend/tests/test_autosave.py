@@ -0,0 +1,29 @@
+from datetime import time
+
+import pytest
+from sqlalchemy import insert
+
+from config.config import DEFAULT_TIMEZONE
+from models.dailylogs import DailyLog
+from utils.timezones import local_today
+
+
+@pytest.mark.parametrize("path", ["/api/daily-logs/today/1", "/api/daily-logs/latest-seven-days/1"])
+def test_buffered_edit_is_visible_in_the_next_read_with_a_lagging_replica(app_db, lagging_replica, api_client, path):
+    engine, _ = app_db
+    today = local_today(DEFAULT_TIMEZONE).local_date
+    with engine.begin() as conn:
+        conn.execute(insert(DailyLog.__table__).values(
+            id=1, employee_id=1, project_id=1, log_date=today, start_time=time(9), end_time=time(10),
+            total_hours=1.0, task_description="before", status_review="Pending",
+        ))
+    lagging_replica()
+
+    edit = {"id": 1, "employee_id": 1, "log_date": today.isoformat(), "project_id": 1,
+            "start_time": "09:00", "end_time": "10:00", "total_hours": 1, "task_description": "after"}
+    assert api_client.post("/api/daily-logs/save?autosave=1", json=[edit]).status_code == 202
+    # The autosave answer's read-primary window is not echoed back
+    response = api_client.get(path)
+
+    assert response.status_code == 200
+    assert [log["task_description"] for log in response.get_json()] == ["after"]
@@ -0,0 +1,62 @@
+from datetime import date, datetime, time, timedelta
+import pytest
+from sqlalchemy import create_engine, insert, update
+
+pa = pytest.importorskip("pyarrow")
+import pyarrow.dataset as ds
+
+import export_snapshot
+from handlers.registry import load_models
+from models.base import Base
+from models.dailylogs import DailyLog
+from models.department import Department
+from models.employee import Employee
+from models.project import Project
+
+
+@pytest.fixture
+def database(tmp_path):
+    load_models()
+    uri = f"sqlite:///{tmp_path / 'tms.db'}"
+    engine = create_engine(uri)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Department.__table__).values(id=1, name="Eng"))
+        conn.execute(insert(Employee.__table__).values(id=1, employee_name="A", email="a@x.com", department_id=1))
+        conn.execute(insert(Project.__table__).values(id=1, name="P", description=""))
+        # Log 3 is the newest write, so the September logs fall outside the
+        # overlap window the next incremental run re-reads anyway
+        for log_id, day, age in ((1, date(2026, 9, 10), 60), (2, date(2026, 9, 20), 60), (3, date(2026, 11, 2), 30)):
+            conn.execute(insert(DailyLog.__table__).values(
+                id=log_id, employee_id=1, project_id=1, log_date=day, start_time=time(9), end_time=time(10),
+                total_hours=1.0, task_description="t", status_review="Pending",
+                updated_at=datetime.utcnow() - timedelta(minutes=age),
+            ))
+    yield engine, uri
+    engine.dispose()
+
+
+def _exported_logs(out_dir, fmt):
+    table = ds.dataset(
+        str(out_dir / "daily_logs"), format="ipc" if fmt == "arrow" else "parquet", partitioning="hive"
+    ).to_table()
+    return sorted(zip(table.column("id").to_pylist(), map(str, table.column("month").to_pylist())))
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_log_moved_to_another_month_leaves_no_stale_copy(database, tmp_path, fmt):
+    engine, uri = database
+    out_dir = tmp_path / "snapshot"
+    export_snapshot.export_snapshot(str(out_dir), fmt, database_uri=uri)
+    assert _exported_logs(out_dir, fmt) == [(1, "2026-09"), (2, "2026-09"), (3, "2026-11")]
+
+    with engine.begin() as conn:
+        conn.execute(
+            update(DailyLog.__table__).where(DailyLog.__table__.c.id == 1)
+            .values(log_date=date(2026, 8, 10), updated_at=datetime.utcnow())
+        )
+    summary = export_snapshot.export_snapshot(str(out_dir), fmt, database_uri=uri)
+
+    assert "2026-09" in summary["daily_logs"]
+    assert _exported_logs(out_dir, fmt) == [(1, "2026-08"), (2, "2026-09"), (3, "2026-11")]
+
@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from config.config import HISTORY_BLOB_GRACE_SECONDS
+from handlers.registry import load_models
+from models.base import Base
+from utils.history import blobs, compact_history, description_hash, store_description
+
+
+@pytest.fixture
+def session(tmp_path):
+    load_models()
+    engine = create_engine(f"sqlite:///{tmp_path / 'tms.db'}")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _add_blob(session, text, age_seconds):
+    session.execute(insert(blobs).values(
+        hash=description_hash(text), body=text, used_at=datetime.utcnow() - timedelta(seconds=age_seconds),
+    ))
+    session.commit()
+
+
+def _blob_hashes(session):
+    return set(session.execute(select(blobs.c.hash)).scalars())
+
+
+def test_compaction_keeps_unreferenced_blobs_within_grace_period(session):
+    _add_blob(session, "old", HISTORY_BLOB_GRACE_SECONDS * 2)
+    # Picked by a save whose change row is not committed yet
+    digest = store_description(session, "in flight")
+    session.commit()
+
+    counts = compact_history(session)
+
+    assert counts["blobs_deleted"] == 1
+    assert _blob_hashes(session) == {digest}
+
+
+def test_reusing_a_stale_blob_protects_it_from_compaction(session):
+    _add_blob(session, "Standup", HISTORY_BLOB_GRACE_SECONDS * 2)
+    digest = store_description(session, "Standup")
+    session.commit()
+
+    compact_history(session)
+
+    assert _blob_hashes(session) == {digest}
+
+
+def test_store_description_re_adds_a_deleted_blob(session):
+    _add_blob(session, "Standup", HISTORY_BLOB_GRACE_SECONDS * 2)
+    compact_history(session)
+    assert _blob_hashes(session) == set()
+
+    digest = store_description(session, "Standup")
+    session.commit()
+
+    assert session.execute(select(blobs.c.body).where(blobs.c.hash == digest)).scalar() == "Standup"
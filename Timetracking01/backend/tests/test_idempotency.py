@@ -0,0 +1,127 @@
+from datetime import date
+
+import pytest
+from flask import Flask, jsonify, request
+from sqlalchemy import create_engine, func, select
+
+from handlers.registry import load_models
+from models.base import Base
+from models.dailylogs import DailyLog
+from utils import idempotency, session_manager
+from utils.idempotency import KEY_HEADER, REPLAYED_HEADER, idempotent
+
+
+@pytest.fixture
+def client(tmp_path):
+    load_models()
+    engine = create_engine(f"sqlite:///{tmp_path / 'tms.db'}")
+    Base.metadata.create_all(engine)
+    previous_bind = session_manager.SessionLocal.kw.get("bind")
+    session_manager.SessionLocal.configure(bind=engine)
+
+    app = Flask(__name__)
+    app.calls = []
+
+    @app.route("/api/save", methods=["POST"])
+    @idempotent
+    def save():
+        app.calls.append(request.get_json())
+        if app.config.get("on_call"):
+            app.config["on_call"]()
+        return jsonify({"saved": len(app.calls)}), 201
+
+    try:
+        yield app.test_client()
+    finally:
+        session_manager.SessionLocal.configure(bind=previous_bind)
+        engine.dispose()
+
+
+def test_retry_replays_the_stored_outcome(client):
+    first = client.post("/api/save", json={"log": 1}, headers={KEY_HEADER: "k1"})
+    retry = client.post("/api/save", json={"log": 1}, headers={KEY_HEADER: "k1"})
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.get_json() == first.get_json() == {"saved": 1}
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert len(client.application.calls) == 1
+
+
+def test_retry_while_first_request_runs_gets_409(client):
+    retries = []
+    client.application.config["on_call"] = lambda: retries.append(
+        client.post("/api/save", json={"log": 1}, headers={KEY_HEADER: "k1"})
+    )
+
+    first = client.post("/api/save", json={"log": 1}, headers={KEY_HEADER: "k1"})
+
+    assert first.status_code == 201
+    assert retries[0].status_code == 409
+    assert retries[0].headers["Retry-After"] == "1"
+    assert len(client.application.calls) == 1
+
+
+def test_key_reused_for_a_different_body_gets_422(client):
+    client.post("/api/save", json={"log": 1}, headers={KEY_HEADER: "k1"})
+    other = client.post("/api/save", json={"log": 2}, headers={KEY_HEADER: "k1"})
+
+    assert other.status_code == 422
+    assert len(client.application.calls) == 1
+
+
+def test_requests_without_a_key_run_every_time(client):
+    client.post("/api/save", json={"log": 1})
+    client.post("/api/save", json={"log": 1})
+
+    assert len(client.application.calls) == 2
+
+
+class WorkerDied(BaseException):
+    """Stands in for the process being killed; Flask does not turn it into a response."""
+
+
+SAVE = [{"id": None, "employee_id": 1, "log_date": date.today().isoformat(), "project_id": 1,
+         "start_time": "09:00", "end_time": "10:00", "total_hours": 1, "task_description": "t"}]
+
+
+def _log_count(app_db):
+    with app_db[0].connect() as conn:
+        return conn.execute(select(func.count()).select_from(DailyLog.__table__)).scalar()
+
+
+def test_save_committed_before_the_worker_died_is_replayed(app_db, api_client, monkeypatch):
+    def die(*args):
+        raise WorkerDied()
+
+    with monkeypatch.context() as patch:
+        patch.setattr(idempotency, "_finish", die)
+        with pytest.raises(WorkerDied):
+            api_client.post("/api/daily-logs/save", json=SAVE, headers={KEY_HEADER: "k1"})
+    assert _log_count(app_db) == 1
+
+    # Long after: an unfinished claim would be taken over and the save run again
+    monkeypatch.setattr(idempotency, "IDEMPOTENCY_LOCK_SECONDS", 0)
+    retry = api_client.post("/api/daily-logs/save", json=SAVE, headers={KEY_HEADER: "k1"})
+
+    assert retry.status_code == 200
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert retry.get_json() == {"message": "Logs saved successfully"}
+    assert _log_count(app_db) == 1
+
+
+def test_save_failing_after_its_commit_is_replayed(app_db, api_client, monkeypatch):
+    from handlers.dailylogs import dailylogs
+
+    def fail(*args):
+        raise RuntimeError("event relay down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(dailylogs, "publish", fail)
+        first = api_client.post("/api/daily-logs/save", json=SAVE, headers={KEY_HEADER: "k1"})
+    assert first.status_code == 500
+
+    retry = api_client.post("/api/daily-logs/save", json=SAVE, headers={KEY_HEADER: "k1"})
+
+    assert retry.status_code == 200
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert _log_count(app_db) == 1
@@ -0,0 +1,36 @@
+from datetime import date, time
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from models.dailylogs import DailyLog
+from utils.log_archive import archive_closed_logs, hot_start
+
+
+@pytest.fixture
+def archived_and_hot_logs(app_db):
+    engine, _ = app_db
+    with engine.begin() as conn:
+        for log_id, day in ((1, date(2019, 3, 4)), (2, hot_start())):
+            conn.execute(insert(DailyLog.__table__).values(
+                id=log_id, employee_id=1, project_id=1, log_date=day, start_time=time(9), end_time=time(10),
+                total_hours=1.0, task_description="t", status_review="Approved",
+            ))
+    with Session(engine) as session:
+        assert archive_closed_logs(session)["daily_logs"] == 1
+
+
+@pytest.mark.parametrize("path", ["/api/daily-logs/all-reviewers/1", "/api/analytics/timesheet?employee_id=1"])
+def test_unbounded_listings_include_archived_logs(archived_and_hot_logs, api_client, path):
+    response = api_client.get(path)
+
+    assert response.status_code == 200
+    assert sorted(log["id"] for log in response.get_json()["logs"]) == [1, 2]
+
+
+def test_bounded_recent_range_reads_the_hot_table_only(archived_and_hot_logs, api_client):
+    response = api_client.get(f"/api/analytics/timesheet?employee_id=1&start_date={hot_start().isoformat()}")
+
+    assert [log["id"] for log in response.get_json()["logs"]] == [2]
+    assert response.get_json()["total_logs"] == 1
@@ -0,0 +1,20 @@
+from sqlalchemy import update
+
+from models.employee import Employee
+from utils.profile_cache import profile_cache
+
+
+def test_profile_rebuilt_after_a_write_ignores_a_lagging_replica(app_db, lagging_replica, api_client):
+    engine, _ = app_db
+    profile_cache.invalidate_all()
+    lagging_replica()
+    with engine.begin() as conn:
+        conn.execute(update(Employee.__table__).where(Employee.__table__.c.id == 1).values(employee_name="Alicia"))
+    profile_cache.invalidate_employees([1])
+
+    first = api_client.get("/api/employee-info?email=alice@x.com")
+    cached = api_client.get("/api/employee-info?email=alice@x.com")
+
+    assert first.status_code == cached.status_code == 200
+    assert first.get_json()["employee"]["employee_name"] == "Alicia"
+    assert cached.get_json()["employee"]["employee_name"] == "Alicia"
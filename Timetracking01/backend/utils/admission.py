@@ -0,0 +1,138 @@
+"""
+Admission control: per-class concurrency limits so reporting requests
+cannot take the connections and threads interactive requests need.
+
+Every routed request is classified by endpoint:
+- "reporting": ADMISSION_REPORTING_ENDPOINTS (analytics by default)
+- exempt: ADMISSION_EXEMPT_ENDPOINTS (long-lived streams, which would hold
+  a slot for their whole life)
+- "interactive": everything else
+
+Each class has a limit of concurrent requests per worker process
+(ADMISSION_REPORTING_LIMIT / ADMISSION_INTERACTIVE_LIMIT, 0 = unlimited).
+A request over the limit waits up to ADMISSION_QUEUE_SECONDS for a slot,
+with at most ADMISSION_MAX_QUEUED waiting per class. Beyond that it gets
+503 with Retry-After. A slot is held until the response is built, or for
+streamed bodies until they have been sent (or the client went away).
+
+Kept free of SQLAlchemy, like utils/replica_routing.py, so registering the
+hooks does not slow startup.
+"""
+import threading
+from flask import g, jsonify, request
+from config.config import (
+    ADMISSION_REPORTING_ENDPOINTS,
+    ADMISSION_EXEMPT_ENDPOINTS,
+    ADMISSION_REPORTING_LIMIT,
+    ADMISSION_INTERACTIVE_LIMIT,
+    ADMISSION_QUEUE_SECONDS,
+    ADMISSION_MAX_QUEUED,
+    ADMISSION_RETRY_AFTER_SECONDS,
+)
+
+
+class AdmissionLane:
+    """Concurrency limit and bounded wait queue for one traffic class."""
+
+    def __init__(self, name, limit, queue_seconds, max_queued):
+        self.name = name
+        self.limit = limit
+        self.queue_seconds = queue_seconds
+        self.max_queued = max_queued
+        self._slots = threading.BoundedSemaphore(limit) if limit else None
+        self._queued = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a slot, waiting up to queue_seconds; returns False when the request must be rejected."""
+        if self._slots is None:
+            return True
+        if self._slots.acquire(blocking=False):
+            return True
+        with self._lock:
+            if self._queued >= self.max_queued:
+                return False
+            self._queued += 1
+        try:
+            return self._slots.acquire(timeout=self.queue_seconds)
+        finally:
+            with self._lock:
+                self._queued -= 1
+
+    def release(self):
+        if self._slots is not None:
+            self._slots.release()
+
+
+LANES = {
+    "reporting": AdmissionLane("reporting", ADMISSION_REPORTING_LIMIT, ADMISSION_QUEUE_SECONDS, ADMISSION_MAX_QUEUED),
+    "interactive": AdmissionLane("interactive", ADMISSION_INTERACTIVE_LIMIT, ADMISSION_QUEUE_SECONDS, ADMISSION_MAX_QUEUED),
+}
+
+
+def classify(endpoint):
+    """Traffic class of a "blueprint.view" endpoint, or None when it is not admission-controlled."""
+    if endpoint is None or endpoint in ADMISSION_EXEMPT_ENDPOINTS:
+        return None
+    if endpoint in ADMISSION_REPORTING_ENDPOINTS:
+        return "reporting"
+    return "interactive"
+
+
+def _release():
+    lane = g.pop("admission_lane", None)
+    if lane is not None:
+        lane.release()
+
+
+def admit():
+    """before_request hook: take a slot in the request's lane, or answer 503."""
+    lane = LANES.get(classify(request.endpoint))
+    if lane is None or request.method == "OPTIONS":
+        return None
+    if not lane.acquire():
+        response = jsonify({"error": f"Too many concurrent {lane.name} requests, retry later"})
+        response.headers["Retry-After"] = str(ADMISSION_RETRY_AFTER_SECONDS)
+        return response, 503
+    g.admission_lane = lane
+    return None
+
+
+class _ReleasingBody:
+    """Streamed response body that frees its lane slot once exhausted or closed."""
+
+    def __init__(self, body, lane):
+        self._body = body
+        self._lane = lane
+
+    def __iter__(self):
+        try:
+            yield from self._body
+        finally:
+            self.close()
+
+    def close(self):
+        # Servers call close() (the ASGI adapter does not); either path frees the slot once
+        lane, self._lane = self._lane, None
+        if lane is not None:
+            lane.release()
+            if hasattr(self._body, "close"):
+                self._body.close()
+
+
+def hold_until_sent(response):
+    """after_request hook: free the slot now, or once a streamed body has been sent."""
+    lane = g.pop("admission_lane", None)
+    if lane is not None:
+        if response.is_streamed:
+            response.response = _ReleasingBody(response.response, lane)
+        else:
+            lane.release()
+    return response
+
+
+def init_admission_control(app):
+    app.before_request(admit)
+    app.after_request(hold_until_sent)
+    # Requests that fail before after_request runs
+    app.teardown_request(lambda exc: _release())
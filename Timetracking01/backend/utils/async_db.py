@@ -0,0 +1,102 @@
+"""
+Async database access for ASYNC_HANDLERS mode.
+
+Handlers that define an async twin (`<name>_async`, picked up by
+handlers/registry.py) use run_concurrently() to run independent queries at
+the same time, each on its own connection of an async engine (aiomysql,
+aiosqlite or asyncpg, derived from the sync URI). The query functions are
+the same plain `fn(session)` code the sync handlers use; they run through
+AsyncSession.run_sync, so lazy loads keep working.
+
+Flask runs every async view on a fresh event loop, and async driver
+connections cannot move between loops. So the queries run on one
+long-lived loop per worker (its own thread), where each URI has a pooled
+async engine; the view awaits them from its own loop.
+
+This is not an async server: under asgi.py, WsgiToAsgi still runs each
+request on a thread that stays blocked until the response is built, async
+twins included. The twins only overlap the queries of one request; they
+do not let a worker serve more requests at once.
+"""
+import asyncio
+import itertools
+import threading
+from config.config import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_REPLICA_URIS, ASYNC_DATABASE_URI, QUERY_CACHE_SIZE
+from utils.replica_routing import request_can_use_replica
+
+
+ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "mysql+pymysql": "mysql+aiomysql",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+_loop = None
+_replica_cycle = itertools.cycle(SQLALCHEMY_REPLICA_URIS) if SQLALCHEMY_REPLICA_URIS else None
+
+
+def async_database_uri(uri):
+    """Swap a sync driver for its async counterpart, e.g. mysql+pymysql:// -> mysql+aiomysql://."""
+    scheme, sep, rest = uri.partition("://")
+    return ASYNC_DRIVERS.get(scheme, scheme) + sep + rest
+
+
+def get_async_engine(uri):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = _engines.get(uri)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(uri)
+            if engine is None:
+                engine = _engines[uri] = create_async_engine(
+                    async_database_uri(uri), pool_pre_ping=True, query_cache_size=QUERY_CACHE_SIZE
+                )
+    return engine
+
+
+def _engine_loop():
+    """The worker's event loop for async engines, started on first use."""
+    global _loop
+    if _loop is None:
+        with _engines_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="async-db", daemon=True).start()
+                _loop = loop
+    return _loop
+
+
+def _request_uri(use_replica=None):
+    """Primary URI, or the next replica's when use_replica (default: utils/replica_routing.py) allows."""
+    if use_replica is None:
+        use_replica = request_can_use_replica()
+    if use_replica and _replica_cycle is not None:
+        return next(_replica_cycle)
+    return ASYNC_DATABASE_URI or SQLALCHEMY_DATABASE_URI
+
+
+async def _gather(uri, fns):
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    engine = get_async_engine(uri)
+
+    async def run(fn):
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            return await session.run_sync(fn)
+
+    return await asyncio.gather(*[run(fn) for fn in fns])
+
+
+async def run_concurrently(*fns, use_replica=None):
+    """
+    Run each fn(session) on its own async session at the same time; returns
+    their results in order. use_replica works as in get_session().
+    """
+    future = asyncio.run_coroutine_threadsafe(_gather(_request_uri(use_replica), fns), _engine_loop())
+    return await asyncio.wrap_future(future)
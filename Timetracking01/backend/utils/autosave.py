@@ -0,0 +1,145 @@
+"""
+Per-worker coalescing buffer for today-page autosaves.
+
+POST /api/daily-logs/save?autosave=1 validates the posted logs and parks
+edits of existing logs here, keyed by (employee_id, log_id); a later edit
+of the same log replaces the earlier one. An entry is written once its
+log has had no edit for AUTOSAVE_DEBOUNCE_SECONDS, or
+AUTOSAVE_MAX_DELAY_SECONDS after its first buffered edit while the user
+keeps typing, so a burst of edits becomes one transaction and at most one
+history row.
+
+The today page (frontend/app/today/page.js) autosaves edits of saved logs
+about a second after the user stops typing; its Save button still writes
+immediately. An employee's entries are also flushed before an explicit
+save, before their today/seven-day views are read, on POST
+/api/daily-logs/autosave/flush (sent by the today page, with any edits it
+has not posted yet, when the page is hidden or closed) and when the worker
+exits. A flush request only reaches the worker that serves it; entries on
+other workers are written by their flush thread. Flush errors (e.g. an
+overlap) are kept and returned with the employee's next autosave or flush
+response.
+
+Entries live only in the worker's memory until written. A clean exit
+flushes them (atexit), but a crash or kill (OOM, SIGKILL, a deploy that
+does not wait for shutdown) loses edits that were already answered with
+202, up to AUTOSAVE_MAX_DELAY_SECONDS of typing per log.
+
+Each entry carries the time it was received; the writer skips it if the
+log was saved after that, e.g. by another worker.
+
+Views that flush before reading must read the primary when the flush (or
+a recent background flush, see written_within()) wrote something: the
+write happens after the autosave response, so the client's read-your-writes
+window (utils/replica_routing.py) may not cover it.
+"""
+import atexit
+import threading
+import time
+from datetime import datetime
+from config.config import AUTOSAVE_DEBOUNCE_SECONDS, AUTOSAVE_MAX_DELAY_SECONDS
+
+
+class AutosaveBuffer:
+    def __init__(self, debounce_seconds, max_delay_seconds):
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._pending = {}  # employee_id -> {log_id: [first_at, last_at, fields]}
+        self._errors = {}  # employee_id -> [message, ...]
+        self._written_at = {}  # employee_id -> monotonic time of the last flush
+        self._lock = threading.Lock()
+        self._writer = None
+
+    def start(self, writer):
+        """
+        Set writer(logs) -> None or (error, status), which writes one
+        employee's logs in a transaction, and start the flush thread.
+        """
+        with self._lock:
+            if self._writer is not None:
+                return
+            self._writer = writer
+        threading.Thread(target=self._run, name="autosave-flush", daemon=True).start()
+        atexit.register(self.flush_all)
+
+    def add(self, logs):
+        """Buffer parsed logs that have an id; returns how many were buffered."""
+        now = time.monotonic()
+        received_at = datetime.utcnow()
+        with self._lock:
+            for fields in logs:
+                by_log = self._pending.setdefault(fields["employee_id"], {})
+                entry = by_log.get(fields["id"])
+                fields = dict(fields, received_at=received_at)
+                if entry is None:
+                    by_log[fields["id"]] = [now, now, fields]
+                else:
+                    entry[1:] = [now, fields]
+        return len(logs)
+
+    def _pop(self, employee_id, log_ids=None):
+        by_log = self._pending.get(employee_id, {})
+        logs = [by_log.pop(log_id)[2] for log_id in list(by_log if log_ids is None else log_ids)]
+        if not by_log:
+            self._pending.pop(employee_id, None)
+        return logs
+
+    def pop_due(self):
+        """Take the entries whose debounce window or maximum delay has passed, grouped by employee."""
+        now = time.monotonic()
+        groups = {}
+        with self._lock:
+            for employee_id, by_log in list(self._pending.items()):
+                due = [
+                    log_id for log_id, (first_at, last_at, _) in by_log.items()
+                    if now - last_at >= self.debounce_seconds or now - first_at >= self.max_delay_seconds
+                ]
+                if due:
+                    groups[employee_id] = self._pop(employee_id, due)
+        return groups
+
+    def pop_employees(self, employee_ids):
+        with self._lock:
+            return {
+                employee_id: self._pop(employee_id)
+                for employee_id in employee_ids if employee_id in self._pending
+            }
+
+    def pop_errors(self, employee_ids):
+        with self._lock:
+            return [message for employee_id in employee_ids for message in self._errors.pop(employee_id, [])]
+
+    def flush(self, groups):
+        """Write each employee's logs in its own transaction, keeping errors for the next response."""
+        for employee_id, logs in groups.items():
+            error = self._writer(logs) if logs else None
+            with self._lock:
+                if logs:
+                    self._written_at[employee_id] = time.monotonic()
+                if error:
+                    self._errors.setdefault(employee_id, []).append(error[0])
+
+    def flush_employees(self, employee_ids):
+        """Write the employees' buffered entries now; returns whether there were any."""
+        groups = self.pop_employees(employee_ids) if self._pending else {}
+        self.flush(groups)
+        return any(groups.values())
+
+    def written_within(self, employee_ids, seconds):
+        """Whether this worker flushed entries of any of the employees in the last `seconds`."""
+        since = time.monotonic() - seconds
+        with self._lock:
+            return any(self._written_at.get(employee_id, since) > since for employee_id in employee_ids)
+
+    def flush_all(self):
+        self.flush_employees(list(self._pending))
+
+    def _run(self):
+        tick = min(self.debounce_seconds, self.max_delay_seconds) / 2
+        while True:
+            time.sleep(tick)
+            if self._pending:
+                self.flush(self.pop_due())
+
+
+autosave_buffer = AutosaveBuffer(AUTOSAVE_DEBOUNCE_SECONDS, AUTOSAVE_MAX_DELAY_SECONDS)
@@ -0,0 +1,243 @@
+"""
+Set-based deletes for departments and designations, and archiving of a
+department's closed logs.
+
+Deleting through the ORM loads every employee, designation and log into
+the session and deletes them one by one. These functions issue chunked
+Core DELETE/UPDATE statements instead, children before parents, and commit
+after each chunk so no single transaction holds locks for long. Dependents
+are removed explicitly rather than left to ON DELETE, which SQLite only
+enforces when foreign keys are switched on.
+
+A failure part-way leaves the department or designation itself in place
+with fewer dependents, so the delete can simply be retried. dry_run=True
+only counts what would be affected.
+
+archive_department_log_rows() moves a department's reviewed logs of closed
+years to the archive with the same chunked statements as archive_logs.py
+(utils/log_archive.py), e.g. ahead of the yearly run for a large
+department. Deleting a department removes archived logs too.
+"""
+from sqlalchemy import delete, func, select, update
+from config.config import DELETE_CHUNK_SIZE
+from models.dailylogarchive import ArchivedDailyLog, ArchivedDailyLogChange
+from models.dailylogchanges import DailyLogChange
+from models.dailylogoccupancy import DailyLogOccupancy
+from models.dailylogs import DailyLog
+from models.department import Department
+from models.designation import Designation
+from models.employee import Employee
+from models.employeelogversion import EmployeeLogVersion
+from models.employeeproject import EmployeeProject
+from models.managerproject import ManagerProjectAssignment
+from utils.employee_search import remove_employee
+from utils.log_archive import archive_closed_logs
+from utils.log_versions import bump_log_versions
+
+
+employees = Employee.__table__
+designations = Designation.__table__
+daily_logs = DailyLog.__table__
+daily_log_changes = DailyLogChange.__table__
+employee_projects = EmployeeProject.__table__
+manager_projects = ManagerProjectAssignment.__table__
+# (logs, their changes): hot and archive
+LOG_TABLES = (
+    (daily_logs, daily_log_changes),
+    (ArchivedDailyLog.__table__, ArchivedDailyLogChange.__table__),
+)
+
+
+def _chunks(ids, size=DELETE_CHUNK_SIZE):
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _count(session, table, *where):
+    return session.execute(select(func.count()).select_from(table).where(*where)).scalar()
+
+
+def _scalars(session, statement):
+    return [value for (value,) in session.execute(statement)]
+
+
+def _update_in_chunks(session, table, where, values):
+    """UPDATE matching rows DELETE_CHUNK_SIZE at a time, committing each chunk."""
+    total = 0
+    while True:
+        ids = _scalars(session, select(table.c.id).where(*where).limit(DELETE_CHUNK_SIZE))
+        if not ids:
+            return total
+        total += session.execute(update(table).where(table.c.id.in_(ids)).values(**values)).rowcount
+        session.commit()
+
+
+def _delete_logs(session, employee_ids, counts):
+    for logs, changes in LOG_TABLES:
+        while True:
+            log_ids = _scalars(
+                session, select(logs.c.id).where(logs.c.employee_id.in_(employee_ids)).limit(DELETE_CHUNK_SIZE)
+            )
+            if not log_ids:
+                break
+            counts["daily_log_changes"] += session.execute(
+                delete(changes).where(changes.c.daily_log_id.in_(log_ids))
+            ).rowcount
+            counts["daily_logs"] += session.execute(delete(logs).where(logs.c.id.in_(log_ids))).rowcount
+            session.commit()
+
+
+def _clear_reviewer(session, employee_ids, kept, counts):
+    """Null out reviews by deleted employees on logs that are kept, bumping their owners' log versions."""
+    owners = _scalars(
+        session,
+        select(daily_logs.c.employee_id).distinct()
+        .where(daily_logs.c.reviewer_id.in_(employee_ids), kept)
+    )
+    owners += _scalars(
+        session,
+        select(daily_logs.c.employee_id).distinct()
+        .join(daily_log_changes, daily_log_changes.c.daily_log_id == daily_logs.c.id)
+        .where(daily_log_changes.c.reviewer_id.in_(employee_ids), kept)
+    )
+    # Logs of employees still to be deleted are left alone; they go with their chunk
+    counts["reviews_cleared"] += session.execute(
+        update(daily_logs).where(daily_logs.c.reviewer_id.in_(employee_ids), kept).values(reviewer_id=None)
+    ).rowcount
+    kept_logs = select(daily_logs.c.id).where(kept).scalar_subquery()
+    counts["reviews_cleared"] += session.execute(
+        update(daily_log_changes)
+        .where(daily_log_changes.c.reviewer_id.in_(employee_ids), daily_log_changes.c.daily_log_id.in_(kept_logs))
+        .values(reviewer_id=None)
+    ).rowcount
+    if owners:
+        bump_log_versions(session, owners)
+    # Archived logs are read-only history: drop the reference without counting it
+    for logs, changes in LOG_TABLES[1:]:
+        session.execute(update(logs).where(logs.c.reviewer_id.in_(employee_ids)).values(reviewer_id=None))
+        session.execute(update(changes).where(changes.c.reviewer_id.in_(employee_ids)).values(reviewer_id=None))
+
+
+def _delete_employee_chunk(session, employee_ids, kept, counts):
+    _delete_logs(session, employee_ids, counts)
+    _clear_reviewer(session, employee_ids, kept, counts)
+    counts["employee_projects"] += session.execute(
+        delete(employee_projects).where(employee_projects.c.employee_id.in_(employee_ids))
+    ).rowcount
+    counts["manager_project_assignments"] += session.execute(
+        delete(manager_projects).where(
+            manager_projects.c.employee_id.in_(employee_ids) | manager_projects.c.manager_id.in_(employee_ids)
+        )
+    ).rowcount
+    session.execute(delete(DailyLogOccupancy).where(DailyLogOccupancy.employee_id.in_(employee_ids)))
+    session.execute(delete(EmployeeLogVersion).where(EmployeeLogVersion.employee_id.in_(employee_ids)))
+    counts["reports_cleared"] += session.execute(
+        update(employees).where(employees.c.reports_to_id.in_(employee_ids)).values(reports_to_id=None)
+    ).rowcount
+    counts["employees"] += session.execute(delete(employees).where(employees.c.id.in_(employee_ids))).rowcount
+    session.commit()
+    # Committed: drop them from this worker's search index, even if a later chunk fails
+    for employee_id in employee_ids:
+        remove_employee(employee_id)
+
+
+def _department_counts(session, dept_id):
+    members = select(employees.c.id).where(employees.c.department_id == dept_id).scalar_subquery()
+    titles = select(designations.c.id).where(designations.c.department_id == dept_id).scalar_subquery()
+    kept_logs = select(daily_logs.c.id).where(daily_logs.c.employee_id.notin_(members)).scalar_subquery()
+    return {
+        "employees": _count(session, employees, employees.c.department_id == dept_id),
+        "designations": _count(session, designations, designations.c.department_id == dept_id),
+        "daily_logs": sum(_count(session, logs, logs.c.employee_id.in_(members)) for logs, _ in LOG_TABLES),
+        "daily_log_changes": sum(
+            _count(session, changes, changes.c.daily_log_id.in_(
+                select(logs.c.id).where(logs.c.employee_id.in_(members)).scalar_subquery()
+            ))
+            for logs, changes in LOG_TABLES
+        ),
+        "employee_projects": _count(session, employee_projects, employee_projects.c.employee_id.in_(members)),
+        "manager_project_assignments": _count(
+            session, manager_projects,
+            manager_projects.c.employee_id.in_(members) | manager_projects.c.manager_id.in_(members)
+        ),
+        "reviews_cleared": (
+            _count(session, daily_logs, daily_logs.c.reviewer_id.in_(members), daily_logs.c.id.in_(kept_logs))
+            + _count(session, daily_log_changes, daily_log_changes.c.reviewer_id.in_(members),
+                     daily_log_changes.c.daily_log_id.in_(kept_logs))
+        ),
+        "reports_cleared": _count(
+            session, employees, employees.c.reports_to_id.in_(members),
+            (employees.c.department_id != dept_id) | employees.c.department_id.is_(None)
+        ),
+        "employees_unassigned": _count(
+            session, employees, employees.c.designation_id.in_(titles),
+            (employees.c.department_id != dept_id) | employees.c.department_id.is_(None)
+        ),
+    }
+
+
+def delete_department_rows(session, dept_id, dry_run=False):
+    """
+    Delete a department with its designations, employees and their logs,
+    project links and assignments. References from other departments
+    (reviews, managers, designations) are set to NULL.
+
+    Returns a dict of affected row counts; with dry_run nothing is changed.
+    """
+    if dry_run:
+        return _department_counts(session, dept_id)
+
+    counts = dict.fromkeys(
+        ("employees", "designations", "daily_logs", "daily_log_changes", "employee_projects",
+         "manager_project_assignments", "reviews_cleared", "reports_cleared", "employees_unassigned"),
+        0,
+    )
+    employee_ids = _scalars(
+        session, select(employees.c.id).where(employees.c.department_id == dept_id).order_by(employees.c.id)
+    )
+    # Break reporting lines inside the department first: rows that reference
+    # each other cannot always be deleted in one statement (e.g. on MySQL)
+    _update_in_chunks(
+        session, employees,
+        (employees.c.department_id == dept_id, employees.c.reports_to_id.isnot(None)),
+        {"reports_to_id": None},
+    )
+    members = select(employees.c.id).where(employees.c.department_id == dept_id).scalar_subquery()
+    kept = daily_logs.c.employee_id.notin_(members)
+    for chunk in _chunks(employee_ids):
+        _delete_employee_chunk(session, chunk, kept, counts)
+
+    designation_ids = _scalars(session, select(designations.c.id).where(designations.c.department_id == dept_id))
+    if designation_ids:
+        counts["employees_unassigned"] = _update_in_chunks(
+            session, employees, (employees.c.designation_id.in_(designation_ids),), {"designation_id": None}
+        )
+        counts["designations"] = session.execute(
+            delete(designations).where(designations.c.id.in_(designation_ids))
+        ).rowcount
+    session.execute(delete(Department).where(Department.id == dept_id))
+    session.commit()
+    return counts
+
+
+def archive_department_log_rows(session, dept_id, before=None, dry_run=False):
+    """
+    Archive the department's employees' reviewed logs dated before `before`
+    (default and latest: utils.log_archive.hot_start()). Returns affected
+    row counts; with dry_run nothing is changed. Raises ValueError for a
+    `before` past hot_start().
+    """
+    members = select(employees.c.id).where(employees.c.department_id == dept_id)
+    return archive_closed_logs(session, before=before, dry_run=dry_run, employee_ids=members)
+
+
+def delete_designation_rows(session, des_id, dry_run=False):
+    """Delete a designation, unassigning (not deleting) its employees. Returns affected row counts."""
+    if dry_run:
+        return {"employees_unassigned": _count(session, employees, employees.c.designation_id == des_id)}
+    unassigned = _update_in_chunks(
+        session, employees, (employees.c.designation_id == des_id,), {"designation_id": None}
+    )
+    session.execute(delete(Designation).where(Designation.id == des_id))
+    session.commit()
+    return {"employees_unassigned": unassigned}
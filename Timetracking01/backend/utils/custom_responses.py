@@ -1,6 +1,25 @@
-from typing import Dict
+from typing import Dict, Iterable, Iterator
 from http import HTTPStatus
-from flask import jsonify, make_response
+import gzip
+import zlib
+from flask import jsonify, make_response, request, current_app, Response
+from flask.json.provider import DefaultJSONProvider
+from config.config import RESPONSE_COMPRESSION_MIN_BYTES, RESPONSE_GZIP_LEVEL, RESPONSE_BROTLI_QUALITY
+
+try:
+    import orjson
+except ImportError:  # stdlib json via DefaultJSONProvider
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/plain", "text/html", "text/csv"}
+STREAM_BATCH_SIZE = 200
+
 
 def create_response(status: HTTPStatus, body: Dict):
     response = make_response(jsonify(body), status.value)
@@ -13,3 +32,145 @@ def create_error_response(error: str, message: str, status_code: HTTPStatus):
         "message": message,
         "code" : status_code
     })
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() backend that encodes with orjson when it is installed.
+
+    Output matches the stdlib provider: keys are sorted and date/datetime
+    values fall back to Flask's default serializer.
+    """
+
+    def dumps(self, obj, **kwargs):
+        # jsonify() always passes compact separators; anything else (indent
+        # in debug mode, custom cls) goes through the stdlib encoder.
+        if orjson is None or set(kwargs) - {"separators"}:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        ).decode()
+
+
+def _negotiate_encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def _compressor(encoding):
+    """Return (compress, sync, finish) callables for incremental encoding; sync emits everything buffered so far."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=RESPONSE_BROTLI_QUALITY)
+        return compressor.process, compressor.flush, compressor.finish
+    compressor = zlib.compressobj(RESPONSE_GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 = gzip container
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def compress_response(response):
+    """after_request hook: gzip/brotli-encode large buffered responses."""
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < RESPONSE_COMPRESSION_MIN_BYTES:
+        return response
+    encoding = _negotiate_encoding()
+    if not encoding:
+        return response
+    if encoding == "br":
+        data = brotli.compress(data, quality=RESPONSE_BROTLI_QUALITY)
+    else:
+        data = gzip.compress(data, compresslevel=RESPONSE_GZIP_LEVEL)
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def create_streamed_response(chunks: Iterable[str], status: HTTPStatus = HTTPStatus.OK, flush_chunks=False):
+    """
+    Stream pre-encoded JSON text chunks, compressing on the fly when the client allows it.
+
+    flush_chunks sends each chunk as soon as it is produced instead of
+    letting the compressor buffer it (slightly larger output).
+    """
+    encoding = _negotiate_encoding()
+
+    def generate() -> Iterator[bytes]:
+        if not encoding:
+            for chunk in chunks:
+                yield chunk.encode()
+            return
+        compress, sync, finish = _compressor(encoding)
+        for chunk in chunks:
+            out = compress(chunk.encode())
+            if flush_chunks:
+                out += sync()
+            if out:
+                yield out
+        yield finish()
+
+    response = Response(generate(), status=status.value, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def stream_json_array(items: Iterable, dumps=None) -> Iterator[str]:
+    """Encode a list item by item instead of building one large string."""
+    # Bind the encoder now: the generator runs after the app context is gone.
+    return _iter_json_array(items, dumps or current_app.json.dumps)
+
+
+def _iter_json_array(items, dumps):
+    batch = []
+    first = True
+    yield "["
+    for item in items:
+        batch.append(dumps(item))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield ("" if first else ",") + ",".join(batch)
+            first = False
+            batch = []
+    if batch:
+        yield ("" if first else ",") + ",".join(batch)
+    yield "]"
+
+
+def stream_json_object(fields: Iterable, dumps=None) -> Iterator[str]:
+    """Encode (key, value) pairs as one JSON object; list values are streamed."""
+    return _iter_json_object(fields, dumps or current_app.json.dumps)
+
+
+def _iter_json_object(fields, dumps):
+    yield "{"
+    for index, (key, value) in enumerate(fields):
+        yield ("," if index else "") + dumps(key) + ":"
+        if isinstance(value, list):
+            yield from _iter_json_array(value, dumps)
+        else:
+            yield dumps(value)
+    yield "}"
+
+
+def create_json_array_response(items: Iterable, status: HTTPStatus = HTTPStatus.OK):
+    return create_streamed_response(stream_json_array(items), status)
+
+
+def create_json_object_response(fields: Iterable, status: HTTPStatus = HTTPStatus.OK, flush_chunks=False):
+    return create_streamed_response(stream_json_object(fields), status, flush_chunks)
+
+
+def init_response_encoding(app):
+    """Route every jsonify() through FastJSONProvider and compress large responses."""
+    app.json_provider_class = FastJSONProvider
+    app.json = FastJSONProvider(app)
+    app.after_request(compress_response)
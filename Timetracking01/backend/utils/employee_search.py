@@ -0,0 +1,281 @@
+"""
+Ranked employee search by name or email.
+
+The default "memory" backend keeps a per-worker index of every employee:
+trigram postings for substring matches (3+ characters) and a sorted token
+list for prefix matches (1-2 characters, typeahead). Postings are
+append-only; each candidate is re-checked against the employee's current
+text, so renames and deletes never return stale hits. The worker's own
+writes are applied through index_employee()/remove_employee(); a full
+rebuild every EMPLOYEE_SEARCH_REFRESH_SECONDS picks up other workers'
+writes and drops dead postings.
+
+The "database" backend uses an SQLite FTS5 trigram table for terms of 3+
+characters and plain LIKE otherwise. MySQL FULLTEXT is not used: it only
+matches word prefixes and skips short tokens and stopwords, so it would
+miss substring matches.
+
+Ranking: exact name/email, then name prefix, then word or email prefix,
+then any substring; ties by name.
+"""
+import bisect
+import heapq
+import re
+import threading
+import time
+from sqlalchemy import case, func, or_, text
+from config.config import EMPLOYEE_SEARCH_BACKEND, EMPLOYEE_SEARCH_REFRESH_SECONDS
+from models.employee import Employee
+
+
+_TOKEN_SPLIT = re.compile(r"[\s@._+-]+")
+
+
+def _trigrams(value):
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+def _tokens(name, email):
+    tokens = set(_TOKEN_SPLIT.split(name)) | set(_TOKEN_SPLIT.split(email)) | {name, email}
+    tokens.discard("")
+    return tokens
+
+
+class EmployeeSearchIndex:
+    def __init__(self):
+        # id -> (name_lower, email_lower, display_name, department_id, designation_id, reports_to_id, tokens)
+        self.docs = {}
+        self.postings = {}
+        self.tokens = []
+        # Ids upserted or removed since the build; only their postings can be stale
+        self.changed = set()
+        self.built_at = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, session):
+        index = cls()
+        rows = session.query(
+            Employee.id, Employee.employee_name, Employee.email,
+            Employee.department_id, Employee.designation_id, Employee.reports_to_id,
+        )
+        for row in rows:
+            index.tokens.extend(index._add(*row))
+        index.tokens.sort()
+        index.built_at = time.monotonic()
+        return index
+
+    def _add(self, employee_id, name, email, department_id, designation_id, reports_to_id):
+        name_l, email_l = (name or "").lower(), (email or "").lower()
+        tokens = tuple(_tokens(name_l, email_l))
+        self.docs[employee_id] = (name_l, email_l, name or "", department_id, designation_id, reports_to_id, tokens)
+        for gram in _trigrams(name_l) | _trigrams(email_l):
+            self.postings.setdefault(gram, []).append(employee_id)
+        return [(token, employee_id) for token in tokens]
+
+    def upsert(self, employee_id, name, email, department_id, designation_id, reports_to_id):
+        with self._lock:
+            self.changed.add(employee_id)
+            for entry in self._add(employee_id, name, email, department_id, designation_id, reports_to_id):
+                bisect.insort(self.tokens, entry)
+
+    def remove(self, employee_id):
+        with self._lock:
+            self.changed.add(employee_id)
+            self.docs.pop(employee_id, None)
+
+    def _prefix_ids(self, term):
+        """Ids with a name/email token starting with term (may include stale ids from self.changed)."""
+        # upsert()/remove() mutate tokens and changed from other threads
+        with self._lock:
+            start = bisect.bisect_left(self.tokens, (term,))
+            end = bisect.bisect_left(self.tokens, (term + "\U0010ffff",), start)
+            ids = {employee_id for _, employee_id in self.tokens[start:end]}
+            stale = ids & self.changed
+        for employee_id in stale:
+            doc = self.docs.get(employee_id)
+            if doc is None or not any(token.startswith(term) for token in doc[6]):
+                ids.discard(employee_id)
+        return ids
+
+    def search(self, term, predicate=None, limit=None, offset=0):
+        """Return (total, ids) with ids the requested page of matches, best first."""
+        term = term.strip().lower()
+        prefix_ids = self._prefix_ids(term)
+        if len(term) >= 3:
+            lists = [self.postings.get(gram, ()) for gram in _trigrams(term)]
+            candidates = set(min(lists, key=len))
+        else:
+            candidates = prefix_ids
+        docs = self.docs
+        buckets = ([], [], [], [])
+        for employee_id in candidates:
+            doc = docs.get(employee_id)
+            if doc is None:
+                continue
+            name = doc[0]
+            if employee_id in prefix_ids:
+                if name.startswith(term):
+                    rank = 0 if name == term else 1
+                else:
+                    rank = 0 if doc[1] == term else 2
+            elif term in name or term in doc[1]:
+                rank = 3
+            else:
+                continue
+            if predicate is not None and not predicate(employee_id, doc):
+                continue
+            buckets[rank].append(employee_id)
+        total = sum(len(bucket) for bucket in buckets)
+        # Only order as much as the page needs; broad terms match most rows
+        wanted = None if limit is None else offset + limit
+        ordered = []
+        for bucket in buckets:
+            if wanted is None:
+                ordered.extend(sorted(bucket, key=lambda employee_id: (docs[employee_id][0], employee_id)))
+                continue
+            need = wanted - len(ordered)
+            if need <= 0:
+                break
+            ordered.extend(heapq.nsmallest(need, bucket, key=lambda employee_id: (docs[employee_id][0], employee_id)))
+        return total, ordered[offset:wanted]
+
+
+_index = None
+_index_lock = threading.Lock()
+_refreshing = threading.Event()
+
+
+def _refresh_in_background():
+    from utils.session_manager import get_session
+    from utils.helpers import safe_close
+
+    global _index
+    session = get_session()
+    try:
+        _index = EmployeeSearchIndex.build(session)
+    finally:
+        safe_close(session)
+        _refreshing.clear()
+
+
+def get_search_index(session):
+    """Return the worker's index, building it on first use and refreshing it in the background when old."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EmployeeSearchIndex.build(session)
+    elif time.monotonic() - _index.built_at > EMPLOYEE_SEARCH_REFRESH_SECONDS and not _refreshing.is_set():
+        _refreshing.set()
+        threading.Thread(target=_refresh_in_background, daemon=True).start()
+    return _index
+
+
+def index_employee(employee):
+    """Apply a committed insert or update to this worker's index."""
+    if _index is not None:
+        _index.upsert(
+            employee.id, employee.employee_name, employee.email,
+            employee.department_id, employee.designation_id, employee.reports_to_id,
+        )
+
+
+def remove_employee(employee_id):
+    if _index is not None:
+        _index.remove(employee_id)
+
+
+def invalidate_search_index():
+    """Drop the index after bulk changes (e.g. a department delete cascading to employees)."""
+    global _index
+    _index = None
+
+
+def _memory_search(session, term, department_id, designation_id, manager_id, employee_ids, limit, offset):
+    def predicate(employee_id, doc):
+        return (
+            (department_id is None or doc[3] == department_id)
+            and (designation_id is None or doc[4] == designation_id)
+            and (manager_id is None or doc[5] == manager_id)
+            and (employee_ids is None or employee_id in employee_ids)
+        )
+
+    unfiltered = department_id is None and designation_id is None and manager_id is None and employee_ids is None
+    return get_search_index(session).search(term, None if unfiltered else predicate, limit, offset)
+
+
+_SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS employees_fts USING fts5("
+    "employee_name, email, content='employees', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS employees_fts_ai AFTER INSERT ON employees BEGIN "
+    "INSERT INTO employees_fts(rowid, employee_name, email) VALUES (new.id, new.employee_name, new.email); END",
+    "CREATE TRIGGER IF NOT EXISTS employees_fts_ad AFTER DELETE ON employees BEGIN "
+    "INSERT INTO employees_fts(employees_fts, rowid, employee_name, email) "
+    "VALUES ('delete', old.id, old.employee_name, old.email); END",
+    "CREATE TRIGGER IF NOT EXISTS employees_fts_au AFTER UPDATE ON employees BEGIN "
+    "INSERT INTO employees_fts(employees_fts, rowid, employee_name, email) "
+    "VALUES ('delete', old.id, old.employee_name, old.email); "
+    "INSERT INTO employees_fts(rowid, employee_name, email) VALUES (new.id, new.employee_name, new.email); END",
+)
+_sqlite_fts_ready = False
+
+
+def ensure_sqlite_fts(session):
+    """Create the FTS5 table and its sync triggers once, indexing existing rows."""
+    global _sqlite_fts_ready
+    if _sqlite_fts_ready:
+        return
+    exists = session.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'employees_fts'")).first()
+    for statement in _SQLITE_FTS_DDL:
+        session.execute(text(statement))
+    if not exists:
+        session.execute(text("INSERT INTO employees_fts(employees_fts) VALUES ('rebuild')"))
+    session.commit()
+    _sqlite_fts_ready = True
+
+
+def _database_match(session, term):
+    if session.get_bind().dialect.name == "sqlite" and len(term) >= 3:
+        ensure_sqlite_fts(session)
+        phrase = '"' + term.replace('"', '""') + '"'
+        return Employee.id.in_(
+            text("SELECT rowid FROM employees_fts WHERE employees_fts MATCH :q").bindparams(q=phrase)
+        )
+    pattern = f"%{term}%"
+    return or_(Employee.employee_name.ilike(pattern), Employee.email.ilike(pattern))
+
+
+def _database_search(session, term, department_id, designation_id, manager_id, employee_ids, limit, offset):
+    query = session.query(Employee.id).filter(_database_match(session, term))
+    if department_id is not None:
+        query = query.filter(Employee.department_id == department_id)
+    if designation_id is not None:
+        query = query.filter(Employee.designation_id == designation_id)
+    if manager_id is not None:
+        query = query.filter(Employee.reports_to_id == manager_id)
+    if employee_ids is not None:
+        query = query.filter(Employee.id.in_(employee_ids))
+    name = func.lower(Employee.employee_name)
+    rank = case(
+        (or_(name == term, func.lower(Employee.email) == term), 0),
+        (name.like(f"{term}%"), 1),
+        else_=2,
+    )
+    total = query.count()
+    page = query.order_by(rank, name, Employee.id).offset(offset).limit(limit)
+    return total, [employee_id for (employee_id,) in page]
+
+
+def search_employee_ids(session, term, department_id=None, designation_id=None, manager_id=None,
+                        employee_ids=None, limit=None, offset=0):
+    """
+    Return (total, ids): how many employees' name or email contains term,
+    and the ids of the requested page, best match first.
+
+    employee_ids optionally restricts the result to a precomputed set
+    (e.g. employees who logged time on a project).
+    """
+    term = term.strip().lower()
+    search = _database_search if EMPLOYEE_SEARCH_BACKEND == "database" else _memory_search
+    return search(session, term, department_id, designation_id, manager_id, employee_ids, limit, offset)
@@ -0,0 +1,152 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import deque
+from config.config import (
+    EVENT_RELAY_PATH,
+    EVENT_RELAY_POLL_SECONDS,
+    EVENT_RELAY_RETENTION_SECONDS,
+    EVENT_STREAM_HEARTBEAT_SECONDS,
+)
+
+
+class MemoryEventStore:
+    """Keeps the most recent events of this process in a ring buffer."""
+
+    def __init__(self, maxlen=1000):
+        self._events = deque(maxlen=maxlen)
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    def append(self, reviewer_id, event):
+        with self._lock:
+            self._last_id += 1
+            self._events.append((self._last_id, reviewer_id, event))
+            return self._last_id
+
+    def read(self, reviewer_id, after_id):
+        with self._lock:
+            return [(eid, ev) for eid, rid, ev in self._events if eid > after_id and rid == reviewer_id]
+
+    def last_id(self):
+        with self._lock:
+            return self._last_id
+
+
+class SQLiteEventRelay:
+    """Shares events between worker processes through a local SQLite file."""
+
+    def __init__(self, path, retention_seconds):
+        self.path = path
+        self.retention_seconds = retention_seconds
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS reviewer_events ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "reviewer_id INTEGER NOT NULL, "
+                "payload TEXT NOT NULL, "
+                "created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_reviewer_events_reviewer "
+                "ON reviewer_events (reviewer_id, id)"
+            )
+
+    def _connect(self):
+        # sqlite3 connections are not shared across threads; open one per call
+        return sqlite3.connect(self.path, timeout=5)
+
+    def append(self, reviewer_id, event):
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "INSERT INTO reviewer_events (reviewer_id, payload, created_at) VALUES (?, ?, ?)",
+                (reviewer_id, json.dumps(event), now),
+            )
+            event_id = cur.lastrowid
+            if event_id % 100 == 0:
+                conn.execute(
+                    "DELETE FROM reviewer_events WHERE created_at < ?",
+                    (now - self.retention_seconds,),
+                )
+            return event_id
+
+    def read(self, reviewer_id, after_id):
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, payload FROM reviewer_events WHERE reviewer_id = ? AND id > ? ORDER BY id",
+                (reviewer_id, after_id),
+            ).fetchall()
+        return [(eid, json.loads(payload)) for eid, payload in rows]
+
+    def last_id(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(id) FROM reviewer_events").fetchone()
+        return row[0] or 0
+
+
+_store = None
+_store_lock = threading.Lock()
+_wakeup = threading.Condition()
+# Bumped by every local publish, so a subscriber can tell whether one
+# happened since its last read
+_generation = 0
+
+
+def get_event_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if EVENT_RELAY_PATH:
+                    _store = SQLiteEventRelay(EVENT_RELAY_PATH, EVENT_RELAY_RETENTION_SECONDS)
+                else:
+                    _store = MemoryEventStore()
+    return _store
+
+
+def publish(reviewer_id, event):
+    """Publish an event to every stream subscribed to reviewer_id."""
+    if not reviewer_id:
+        return None
+    global _generation
+    event_id = get_event_store().append(reviewer_id, event)
+    with _wakeup:
+        _generation += 1
+        _wakeup.notify_all()
+    return event_id
+
+
+def subscribe(reviewer_id, last_event_id=None):
+    """
+    Yield (event_id, event) tuples for reviewer_id as they are published.
+
+    Yields None when nothing arrived for EVENT_STREAM_HEARTBEAT_SECONDS so the
+    caller can send a keep-alive. Events from other workers are picked up by
+    polling the relay every EVENT_RELAY_POLL_SECONDS.
+    """
+    store = get_event_store()
+    after_id = last_event_id if last_event_id is not None else store.last_id()
+    poll = EVENT_RELAY_POLL_SECONDS if EVENT_RELAY_PATH else EVENT_STREAM_HEARTBEAT_SECONDS
+    idle = 0.0
+    while True:
+        # The read (possibly a relay query) runs outside the lock; a publish
+        # after it bumps _generation, so the wait below returns at once.
+        with _wakeup:
+            seen = _generation
+        events = store.read(reviewer_id, after_id)
+        if not events:
+            started = time.monotonic()
+            with _wakeup:
+                _wakeup.wait_for(lambda: _generation != seen, timeout=poll)
+            idle += time.monotonic() - started
+        if events:
+            idle = 0.0
+            for event_id, event in events:
+                after_id = event_id
+                yield event_id, event
+        elif idle >= EVENT_STREAM_HEARTBEAT_SECONDS:
+            idle = 0.0
+            yield None
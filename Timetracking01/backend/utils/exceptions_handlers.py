@@ -1,15 +1,34 @@
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from psycopg2.errors import NotNullViolation, UniqueViolation
+import importlib
 import re
 import logging
-from botocore.exceptions import BotoCoreError, ClientError
-from functools import wraps
+from functools import lru_cache, wraps
 from utils.custom_responses import create_error_response
 from http import HTTPStatus
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+
+@lru_cache(maxsize=None)
+def _optional_module(module_name):
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+
+def _is_instance(exc, module_name, *class_names):
+    """isinstance() against an optional dependency's exception classes.
+
+    The module is only imported once an exception needs classifying, so
+    psycopg2 and botocore are never loaded just to start the app.
+    """
+    module = _optional_module(module_name)
+    if module is None:
+        return False
+    return isinstance(exc, tuple(getattr(module, name) for name in class_names))
+
 def handle_exceptions(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
@@ -22,7 +41,7 @@ def handle_exceptions(func):
             if session:
                 session.rollback()  # Rollback the transaction on integrity errors
 
-            if isinstance(e.orig, NotNullViolation):
+            if _is_instance(e.orig, "psycopg2.errors", "NotNullViolation"):
                 match = re.search(r'null value in column "(.*?)"', str(e.orig))
                 missing_column = match.group(1) if match else "unknown field"
                 return create_error_response(
@@ -31,7 +50,7 @@ def handle_exceptions(func):
                     HTTPStatus.BAD_REQUEST
                 )
             
-            if isinstance(e.orig, UniqueViolation):
+            if _is_instance(e.orig, "psycopg2.errors", "UniqueViolation"):
                 match = re.search(r'Key \((.*?)\)=\((.*?)\) already exists', str(e.orig))
                 field = match.group(1) if match else "duplicate field"
                 return create_error_response(
@@ -64,15 +83,15 @@ def handle_exceptions(func):
                 HTTPStatus.BAD_REQUEST
             )
 
-        except (BotoCoreError, ClientError) as e:
-            logger.error(f"AWS error: {e}")  # Log AWS errors
-            return create_error_response(
-                "AWS Error",
-                "An error occurred while processing your request.",
-                HTTPStatus.INTERNAL_SERVER_ERROR
-            )
-
         except Exception as e:
+            if _is_instance(e, "botocore.exceptions", "BotoCoreError", "ClientError"):
+                logger.error(f"AWS error: {e}")  # Log AWS errors
+                return create_error_response(
+                    "AWS Error",
+                    "An error occurred while processing your request.",
+                    HTTPStatus.INTERNAL_SERVER_ERROR
+                )
+
             if session:
                 session.rollback()  # Rollback for any unexpected errors
 
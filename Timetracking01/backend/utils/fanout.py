@@ -0,0 +1,53 @@
+"""
+Run the independent sections of a composite endpoint in parallel.
+
+Each section is a plain fn(session) run on a shared thread pool with its
+own session, so sections use separate pooled connections. FANOUT_WORKERS
+bounds how many connections fan-out holds across all requests. Results are
+yielded as sections finish, ready to be streamed.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from config.config import FANOUT_WORKERS
+from utils.helpers import safe_close
+from utils.replica_routing import request_can_use_replica
+from utils.session_manager import get_session
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=FANOUT_WORKERS, thread_name_prefix="fanout")
+    return _executor
+
+
+def _run(fn, use_replica):
+    session = get_session(use_replica=use_replica)
+    try:
+        return fn(session)
+    finally:
+        safe_close(session)
+
+
+def run_sections(sections):
+    """
+    Start every (name, fn) section now; return a generator of (name, result,
+    error) in completion order. error is the exception a section raised, or None.
+    """
+    # Workers have no request context: decide replica routing here
+    use_replica = request_can_use_replica()
+    executor = get_executor()
+    futures = {executor.submit(_run, fn, use_replica): name for name, fn in sections}
+
+    def completed():
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], (None if error else future.result()), error
+
+    return completed()
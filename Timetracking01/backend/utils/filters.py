@@ -0,0 +1,102 @@
+"""
+Shared query-string filters for the daily log listing endpoints.
+
+LogFilterSpec.from_args() parses request args into typed values once and
+raises ValueError on bad input, which handlers turn into a 400. apply()
+adds plain column comparisons only (no functions or casts on the columns),
+so the (employee_id, log_date) index can serve every endpoint.
+"""
+from collections import namedtuple
+from datetime import datetime
+from models.dailylogs import DailyLog
+
+
+REVIEW_STATUSES = ("Pending", "Approved", "Rejected")
+_STATUS_LOOKUP = {status.lower(): status for status in REVIEW_STATUSES}
+
+FILTER_FIELDS = ("employee_id", "project_id", "reviewer_id", "start_date", "end_date", "status_review")
+_INT_FIELDS = ("employee_id", "project_id", "reviewer_id")
+_DATE_FIELDS = ("start_date", "end_date")
+
+
+def parse_date_arg(name, value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a date in YYYY-MM-DD format")
+
+
+def parse_int_arg(name, value):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if number <= 0:
+        raise ValueError(f"{name} must be a positive integer")
+    return number
+
+
+def parse_status_arg(value):
+    """Return the canonical status, or None for "all"."""
+    if value.lower() == "all":
+        return None
+    status = _STATUS_LOOKUP.get(value.lower())
+    if status is None:
+        raise ValueError(f"status_review must be one of {', '.join(REVIEW_STATUSES)} or all")
+    return status
+
+
+class LogFilterSpec(namedtuple("LogFilterSpec", FILTER_FIELDS)):
+    __slots__ = ()
+
+    @classmethod
+    def from_args(cls, args, allowed=FILTER_FIELDS, required=(), **fixed):
+        """
+        Build a spec from request args.
+
+        Only `allowed` fields are read from args; `fixed` values (e.g. an
+        employee_id taken from the URL path) are used as given. Empty
+        strings count as missing.
+        """
+        values = dict.fromkeys(FILTER_FIELDS)
+        for name in allowed:
+            raw = args.get(name)
+            if raw is None or raw == "":
+                continue
+            if name in _INT_FIELDS:
+                values[name] = parse_int_arg(name, raw)
+            elif name in _DATE_FIELDS:
+                values[name] = parse_date_arg(name, raw)
+            else:
+                values[name] = parse_status_arg(raw)
+        values.update(fixed)
+        missing = [name for name in required if values[name] is None]
+        if missing:
+            raise ValueError(f"Missing {' or '.join(missing)}")
+        if values["start_date"] and values["end_date"] and values["start_date"] > values["end_date"]:
+            raise ValueError("start_date must not be after end_date")
+        return cls(**values)
+
+    def without(self, *names):
+        return self._replace(**dict.fromkeys(names))
+
+    def predicates(self, model=DailyLog):
+        """Filter clauses on model: DailyLog, ArchivedDailyLog or a table/subquery's .c."""
+        clauses = []
+        if self.employee_id is not None:
+            clauses.append(model.employee_id == self.employee_id)
+        if self.start_date is not None:
+            clauses.append(model.log_date >= self.start_date)
+        if self.end_date is not None:
+            clauses.append(model.log_date <= self.end_date)
+        if self.project_id is not None:
+            clauses.append(model.project_id == self.project_id)
+        if self.reviewer_id is not None:
+            clauses.append(model.reviewer_id == self.reviewer_id)
+        if self.status_review is not None:
+            clauses.append(model.status_review == self.status_review)
+        return clauses
+
+    def apply(self, query, model=DailyLog):
+        clauses = self.predicates(model)
+        return query.filter(*clauses) if clauses else query
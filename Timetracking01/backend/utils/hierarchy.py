@@ -0,0 +1,153 @@
+"""
+Reporting-hierarchy queries over employees.reports_to_id.
+
+Each lookup is a single WITH RECURSIVE query (MySQL 8+ and SQLite 3.8.3+).
+Every row carries a ",id,id," path so a reports_to cycle stops at the first
+repeated id, and max_depth caps how far a walk can go.
+"""
+from sqlalchemy import select, cast, literal, String
+from sqlalchemy.orm import aliased, joinedload
+from models.employee import Employee
+from config.config import HIERARCHY_MAX_DEPTH
+
+# Room for HIERARCHY_MAX_DEPTH ids in the cycle-guard path column. MySQL
+# sizes recursive CTE columns from the anchor member, so it must be explicit.
+PATH_LENGTH = 2000
+
+
+def _id_text(column):
+    return cast(column, String)
+
+
+def _manager_chain_cte(employee_ids, max_depth):
+    anchor = (
+        select(
+            Employee.id.label("origin_id"),
+            Employee.reports_to_id.label("manager_id"),
+            literal(1).label("depth"),
+            cast(
+                literal(",") + _id_text(Employee.id) + "," + _id_text(Employee.reports_to_id) + ",",
+                String(PATH_LENGTH)
+            ).label("path"),
+        )
+        .where(Employee.id.in_(employee_ids), Employee.reports_to_id.isnot(None))
+    )
+    chain = anchor.cte("manager_chain", recursive=True)
+    parent = aliased(Employee)
+    step = (
+        select(
+            chain.c.origin_id,
+            parent.reports_to_id,
+            chain.c.depth + 1,
+            chain.c.path + _id_text(parent.reports_to_id) + ",",
+        )
+        .join(parent, parent.id == chain.c.manager_id)
+        .where(
+            parent.reports_to_id.isnot(None),
+            chain.c.depth < max_depth,
+            ~chain.c.path.contains("," + _id_text(parent.reports_to_id) + ","),
+        )
+    )
+    return chain.union_all(step)
+
+
+def _subtree_cte(manager_ids, max_depth):
+    anchor = (
+        select(
+            Employee.id.label("root_id"),
+            Employee.id.label("employee_id"),
+            Employee.reports_to_id.label("reports_to_id"),
+            literal(0).label("depth"),
+            cast(literal(",") + _id_text(Employee.id) + ",", String(PATH_LENGTH)).label("path"),
+        )
+        .where(Employee.id.in_(manager_ids))
+    )
+    tree = anchor.cte("reporting_tree", recursive=True)
+    child = aliased(Employee)
+    step = (
+        select(
+            tree.c.root_id,
+            child.id,
+            child.reports_to_id,
+            tree.c.depth + 1,
+            tree.c.path + _id_text(child.id) + ",",
+        )
+        .join(child, child.reports_to_id == tree.c.employee_id)
+        .where(
+            tree.c.depth < max_depth,
+            ~tree.c.path.contains("," + _id_text(child.id) + ","),
+        )
+    )
+    return tree.union_all(step)
+
+
+def get_manager_chain_ids(session, employee_ids, max_depth=HIERARCHY_MAX_DEPTH):
+    """Return {employee_id: [manager_id, ...]} ordered nearest manager first."""
+    employee_ids = list(set(employee_ids))
+    chains = {employee_id: [] for employee_id in employee_ids}
+    if not employee_ids:
+        return chains
+    chain = _manager_chain_cte(employee_ids, max_depth)
+    rows = session.execute(
+        select(chain.c.origin_id, chain.c.manager_id).order_by(chain.c.origin_id, chain.c.depth)
+    )
+    for origin_id, manager_id in rows:
+        chains[origin_id].append(manager_id)
+    return chains
+
+
+def get_manager_chains(session, employee_ids, max_depth=HIERARCHY_MAX_DEPTH):
+    """
+    Return {employee_id: [Employee, ...]} ordered nearest manager first.
+
+    Managers come back with designation and department loaded, so callers can
+    serialize the whole chain without further queries.
+    """
+    chain_ids = get_manager_chain_ids(session, employee_ids, max_depth)
+    manager_ids = {manager_id for ids in chain_ids.values() for manager_id in ids}
+    managers = {}
+    if manager_ids:
+        managers = {
+            m.id: m for m in session.query(Employee)
+            .options(joinedload(Employee.designation), joinedload(Employee.department))
+            .filter(Employee.id.in_(manager_ids))
+        }
+    return {
+        employee_id: [managers[m] for m in ids if m in managers]
+        for employee_id, ids in chain_ids.items()
+    }
+
+
+def get_manager_chain(session, employee_id, max_depth=HIERARCHY_MAX_DEPTH):
+    """Return the upward chain of Employee rows for one employee."""
+    return get_manager_chains(session, [employee_id], max_depth)[employee_id]
+
+
+def get_subtrees(session, manager_ids, max_depth=HIERARCHY_MAX_DEPTH):
+    """
+    Return {manager_id: [(employee_id, reports_to_id, depth), ...]} listing
+    every direct and indirect report, ordered by depth.
+    """
+    manager_ids = list(set(manager_ids))
+    subtrees = {manager_id: [] for manager_id in manager_ids}
+    if not manager_ids:
+        return subtrees
+    tree = _subtree_cte(manager_ids, max_depth)
+    rows = session.execute(
+        select(tree.c.root_id, tree.c.employee_id, tree.c.reports_to_id, tree.c.depth)
+        .where(tree.c.depth > 0)
+        .order_by(tree.c.root_id, tree.c.depth, tree.c.employee_id)
+    )
+    for root_id, employee_id, reports_to_id, depth in rows:
+        subtrees[root_id].append((employee_id, reports_to_id, depth))
+    return subtrees
+
+
+def get_subtree(session, manager_id, max_depth=HIERARCHY_MAX_DEPTH):
+    """Return [(employee_id, reports_to_id, depth), ...] under one manager."""
+    return get_subtrees(session, [manager_id], max_depth)[manager_id]
+
+
+def subtree_cte(manager_id, max_depth=HIERARCHY_MAX_DEPTH):
+    """Recursive CTE of a manager's reports, for joining into aggregate queries."""
+    return _subtree_cte([manager_id], max_depth)
@@ -0,0 +1,154 @@
+"""
+Storage for daily log change history.
+
+Every create and every description edit adds a daily_log_changes row.
+The text is stored once per distinct description in description_blobs,
+keyed by its sha1, and the change row only holds the hash; timesheet
+descriptions repeat a lot ("Standup", "Code review"), so most saves add no
+text at all. Rows from before the blob table keep their inline
+new_description until compact_history() moves it into a blob.
+
+compact_history() also squashes the history of approved logs that have not
+changed for HISTORY_COMPACT_AFTER_DAYS: the first (as submitted) and latest
+versions are kept, intermediate edits are dropped, and blobs nothing
+references any more are deleted. A save may pick an existing blob before
+its change row is committed, so store_description() refreshes the blob's
+used_at (re-adding the blob if compaction just deleted it), and only blobs
+unused for HISTORY_BLOB_GRACE_SECONDS are deleted.
+"""
+import hashlib
+from datetime import datetime, timedelta
+from sqlalchemy import delete, exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from config.config import HISTORY_COMPACT_AFTER_DAYS, HISTORY_COMPACT_CHUNK_SIZE, HISTORY_BLOB_GRACE_SECONDS
+from models.dailylogarchive import ArchivedDailyLog, ArchivedDailyLogChange
+from models.dailylogchanges import DailyLogChange
+from models.dailylogs import DailyLog
+from models.descriptionblob import DescriptionBlob
+
+
+HISTORY_TABLES = (
+    (DailyLog.__table__, DailyLogChange.__table__),
+    (ArchivedDailyLog.__table__, ArchivedDailyLogChange.__table__),
+)
+blobs = DescriptionBlob.__table__
+
+
+def description_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def store_description(session, text):
+    """
+    Return the blob hash for text, adding the blob inside the caller's
+    transaction if it is new. A blob last used more than half the grace
+    period ago is touched, so compaction cannot delete it before the
+    caller's change row is committed.
+    """
+    known = session.info.setdefault("description_hashes", set())
+    digest = description_hash(text)
+    if digest in known:
+        return digest
+    now = datetime.utcnow()
+    used_at = session.execute(select(blobs.c.used_at).where(blobs.c.hash == digest)).scalar()
+    if used_at is None or used_at < now - timedelta(seconds=HISTORY_BLOB_GRACE_SECONDS / 2):
+        # The UPDATE waits for a compaction deleting the blob; if it is gone, add it back
+        if not session.execute(update(blobs).where(blobs.c.hash == digest).values(used_at=now)).rowcount:
+            try:
+                with session.begin_nested():
+                    session.execute(insert(blobs).values(hash=digest, body=text, used_at=now))
+            except IntegrityError:
+                pass  # added concurrently
+    known.add(digest)
+    return digest
+
+
+def record_change(session, log, reviewer_id):
+    """Add the history row for a created or re-described log."""
+    change = DailyLogChange(
+        daily_log_id=log.id,
+        project_id=log.project_id,
+        description_hash=store_description(session, log.task_description),
+        changed_at=datetime.utcnow(),
+        reviewer_id=reviewer_id
+    )
+    session.add(change)
+    return change
+
+
+def _move_inline_descriptions(session, changes, counts):
+    while True:
+        rows = session.execute(
+            select(changes.c.id, changes.c.new_description)
+            .where(changes.c.new_description.isnot(None))
+            .limit(HISTORY_COMPACT_CHUNK_SIZE)
+        ).all()
+        if not rows:
+            return
+        for change_id, text in rows:
+            session.execute(
+                update(changes).where(changes.c.id == change_id)
+                .values(description_hash=store_description(session, text), new_description=None)
+            )
+        counts["descriptions_moved"] += len(rows)
+        session.commit()
+
+
+def _squash_approved(session, logs, changes, cutoff, counts):
+    last_log_id = 0
+    while True:
+        log_ids = [
+            log_id for (log_id,) in session.execute(
+                select(logs.c.id)
+                .where(logs.c.status_review == "Approved", logs.c.updated_at < cutoff, logs.c.id > last_log_id)
+                .order_by(logs.c.id)
+                .limit(HISTORY_COMPACT_CHUNK_SIZE)
+            )
+        ]
+        if not log_ids:
+            return
+        last_log_id = log_ids[-1]
+        # Logs with more than two versions, and the first/latest change of each
+        squashed, keep = [], set()
+        for log_id, first_id, latest_id in session.execute(
+            select(changes.c.daily_log_id, func.min(changes.c.id), func.max(changes.c.id))
+            .where(changes.c.daily_log_id.in_(log_ids))
+            .group_by(changes.c.daily_log_id)
+            .having(func.count() > 2)
+        ):
+            squashed.append(log_id)
+            keep.update((first_id, latest_id))
+        if squashed:
+            counts["versions_dropped"] += session.execute(
+                delete(changes).where(changes.c.daily_log_id.in_(squashed), changes.c.id.notin_(keep))
+            ).rowcount
+            session.commit()
+
+
+def _delete_orphan_blobs(session, counts):
+    cutoff = datetime.utcnow() - timedelta(seconds=HISTORY_BLOB_GRACE_SECONDS)
+    orphaned = [blobs.c.used_at < cutoff] + [
+        ~exists().where(changes.c.description_hash == blobs.c.hash) for _, changes in HISTORY_TABLES
+    ]
+    while True:
+        hashes = session.execute(
+            select(blobs.c.hash).where(*orphaned).limit(HISTORY_COMPACT_CHUNK_SIZE)
+        ).scalars().all()
+        if not hashes:
+            return
+        # Re-checked on delete: a save may have used one of them since
+        counts["blobs_deleted"] += session.execute(
+            delete(blobs).where(blobs.c.hash.in_(hashes), *orphaned)
+        ).rowcount
+        session.commit()
+
+
+def compact_history(session, older_than_days=HISTORY_COMPACT_AFTER_DAYS):
+    """Run every compaction step on hot and archived history; returns counts per step."""
+    counts = {"descriptions_moved": 0, "versions_dropped": 0, "blobs_deleted": 0}
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    for logs, changes in HISTORY_TABLES:
+        _move_inline_descriptions(session, changes, counts)
+        _squash_approved(session, logs, changes, cutoff, counts)
+    _delete_orphan_blobs(session, counts)
+    return counts
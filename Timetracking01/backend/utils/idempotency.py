@@ -0,0 +1,171 @@
+"""
+Idempotency-Key support for write endpoints that clients retry on timeout.
+
+A request sent with an Idempotency-Key header first claims the key in
+idempotency_keys (committed before the handler runs, so concurrent retries
+see the claim). Its status and JSON body are stored once the handler
+returns, and retries with the same key get that stored outcome back,
+marked with Idempotent-Replayed: true, without running the handler again.
+
+- a retry while the first request is still running gets 409 with Retry-After
+- reusing a key for a different request (method, path, query or body) is a 422
+- 5xx outcomes are not stored, so the retry runs the handler again
+
+Handlers whose writes must not repeat call stage_outcome() in their own
+transaction, so the outcome commits together with the writes. Otherwise a
+worker dying (or anything failing) between the handler's commit and the
+outcome being stored would leave the claim unfinished, and a retry would
+run the writes again. A staged outcome is final: it is replayed even when
+the response actually sent was a 5xx.
+
+Outcomes are kept for IDEMPOTENCY_TTL_SECONDS. A claim whose request never
+finished (e.g. the worker died) can be taken over after
+IDEMPOTENCY_LOCK_SECONDS. Expired rows are purged in small batches as new
+keys are claimed.
+"""
+import hashlib
+import itertools
+from datetime import datetime, timedelta
+from functools import wraps
+from flask import Response, g, jsonify, make_response, request
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from config.config import IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_LOCK_SECONDS
+from models.idempotencykey import IdempotencyKey
+from utils.helpers import safe_close
+from utils.session_manager import get_session
+
+
+KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 128
+# Every PURGE_EVERY claims in a worker, delete up to PURGE_BATCH expired keys
+PURGE_EVERY = 100
+PURGE_BATCH = 1000
+
+_claims = itertools.count(1)
+
+
+def request_hash():
+    digest = hashlib.sha256()
+    for part in (request.method.encode(), request.path.encode(), request.query_string, request.get_data()):
+        digest.update(part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _claim(session, key, digest):
+    """Claim key for this request; returns None once claimed, else the row holding it (None if it vanished meanwhile)."""
+    now = datetime.utcnow()
+    session.add(IdempotencyKey(key=key, request_hash=digest, created_at=now))
+    try:
+        session.commit()
+        return None
+    except IntegrityError:
+        session.rollback()
+
+    row = session.get(IdempotencyKey, key)
+    if row is None:
+        return IdempotencyKey(key=key, request_hash=digest)  # purged meanwhile: report it as in progress
+    keep_seconds = IDEMPOTENCY_LOCK_SECONDS if row.status_code is None else IDEMPOTENCY_TTL_SECONDS
+    if row.created_at >= now - timedelta(seconds=keep_seconds):
+        return row
+    # Expired outcome or abandoned claim; only one of several retries gets it
+    taken = session.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key, IdempotencyKey.created_at == row.created_at)
+        .values(request_hash=digest, status_code=None, response_body=None, created_at=now)
+    ).rowcount
+    session.commit()
+    if taken:
+        return None
+    session.expire_all()
+    return session.get(IdempotencyKey, key) or IdempotencyKey(key=key, request_hash=digest)
+
+
+def _purge_expired(session):
+    cutoff = datetime.utcnow() - timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+    keys = session.execute(
+        select(IdempotencyKey.key).where(IdempotencyKey.created_at < cutoff).limit(PURGE_BATCH)
+    ).scalars().all()
+    if keys:
+        session.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(keys)))
+        session.commit()
+
+
+def _outcome(row, digest):
+    """Response for a request whose key is already held by row."""
+    if row.request_hash != digest:
+        return jsonify({"error": f"{KEY_HEADER} was already used for a different request"}), 422
+    if row.status_code is None:
+        response = jsonify({"error": "A request with this Idempotency-Key is still in progress"})
+        response.headers["Retry-After"] = "1"
+        return response, 409
+    response = Response(row.response_body, status=row.status_code, mimetype="application/json")
+    response.headers[REPLAYED_HEADER] = "true"
+    return response
+
+
+def stage_outcome(session, status_code, body):
+    """
+    Store the outcome (status, JSON body) of the current request's
+    Idempotency-Key claim in the caller's transaction. No-op for requests
+    without a key.
+    """
+    claim = g.get("idempotency_claim")
+    if claim is None:
+        return
+    key, digest = claim
+    session.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key, IdempotencyKey.request_hash == digest, IdempotencyKey.status_code.is_(None))
+        .values(status_code=status_code, response_body=jsonify(body).get_data(as_text=True))
+    )
+
+
+def _finish(key, digest, response):
+    """Store the outcome, or release the claim when it must not be replayed; a staged outcome is kept."""
+    session = get_session(use_replica=False)
+    try:
+        claimed = (IdempotencyKey.key == key, IdempotencyKey.request_hash == digest, IdempotencyKey.status_code.is_(None))
+        if response is None or response.status_code >= 500 or response.is_streamed:
+            session.execute(delete(IdempotencyKey).where(*claimed))
+        else:
+            session.execute(
+                update(IdempotencyKey).where(*claimed)
+                .values(status_code=response.status_code, response_body=response.get_data(as_text=True))
+            )
+        session.commit()
+    finally:
+        safe_close(session)
+
+
+def idempotent(view):
+    """Replay the stored outcome of view for requests that repeat an Idempotency-Key."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(KEY_HEADER)
+        if key is None:
+            return view(*args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return jsonify({"error": f"{KEY_HEADER} must be 1 to {MAX_KEY_LENGTH} characters"}), 400
+        digest = request_hash()
+
+        session = get_session(use_replica=False)
+        try:
+            row = _claim(session, key, digest)
+            if row is not None:
+                return _outcome(row, digest)
+            if next(_claims) % PURGE_EVERY == 0:
+                _purge_expired(session)
+        finally:
+            safe_close(session)
+
+        g.idempotency_claim = (key, digest)
+        response = None
+        try:
+            response = make_response(view(*args, **kwargs))
+            return response
+        finally:
+            _finish(key, digest, response)
+    return wrapper
@@ -0,0 +1,141 @@
+"""
+Hot/archive split for daily logs.
+
+daily_logs holds the open years: the current year and the previous
+LOG_ARCHIVE_KEEP_YEARS - 1. Reviewed logs of closed years are moved to
+daily_logs_archive (with their history rows) by archive_logs.py, so the
+per-employee index ranges behind today/seven-day/week views stay short.
+
+Listing endpoints read the archive only when the requested date range
+reaches before hot_start(): it starts before it, or has no start date (an
+unbounded query means all time). Ranges inside the open years serve the
+hot table alone. Pending logs are never archived, so they can still be
+reviewed.
+"""
+from datetime import date, datetime
+from sqlalchemy import delete, func, insert, select, union_all
+from config.config import LOG_ARCHIVE_KEEP_YEARS, LOG_ARCHIVE_CHUNK_SIZE
+from models.dailylogarchive import ArchivedDailyLog, ArchivedDailyLogChange
+from models.dailylogchanges import DailyLogChange
+from models.dailylogs import DailyLog
+from utils.log_versions import bump_log_versions
+
+
+LOG_TABLES = (DailyLog.__table__, ArchivedDailyLog.__table__)
+
+
+def hot_start(today=None):
+    """First date kept in the hot table."""
+    today = today or datetime.utcnow().date()
+    return date(today.year - LOG_ARCHIVE_KEEP_YEARS + 1, 1, 1)
+
+
+def reaches_archive(spec):
+    """Whether spec's date range can include archived logs; no start_date means all time."""
+    return spec.start_date is None or spec.start_date < hot_start()
+
+
+def log_models(spec):
+    """(log model, change model) pairs to read for spec: the hot tables, plus the archive when needed."""
+    pairs = [(DailyLog, DailyLogChange)]
+    if reaches_archive(spec):
+        pairs.append((ArchivedDailyLog, ArchivedDailyLogChange))
+    return pairs
+
+
+def query_logs(session, spec, newest_first=False, employee_ids=None):
+    """
+    DailyLog/ArchivedDailyLog objects matching spec (and employee_ids, if
+    given), from the archive only when the date range needs it.
+    """
+    models = [model for model, _ in log_models(spec)]
+    logs = []
+    for model in models:
+        query = spec.apply(session.query(model), model)
+        if employee_ids is not None:
+            query = query.filter(model.employee_id.in_(employee_ids))
+        if newest_first:
+            query = query.order_by(model.log_date.desc())
+        logs.extend(query.all())
+    if newest_first and len(models) > 1:
+        logs.sort(key=lambda log: log.log_date, reverse=True)
+    return logs
+
+
+def log_source(spec, *columns):
+    """
+    Selectable with the given daily_logs columns, for aggregates: the hot
+    table itself, or a UNION ALL of hot and archive rows matching spec's
+    dates when the range reaches the archive.
+    """
+    if not reaches_archive(spec):
+        return DailyLog.__table__
+    date_only = spec.without("employee_id", "project_id", "reviewer_id", "status_review")
+    selects = [
+        select(*[table.c[name] for name in columns]).where(*date_only.predicates(table.c))
+        for table in LOG_TABLES
+    ]
+    return union_all(*selects).subquery("daily_logs_all")
+
+
+def _closed_log_ids(session, before, limit, *where):
+    return [
+        log_id for (log_id,) in session.execute(
+            select(DailyLog.id)
+            .where(DailyLog.log_date < before, DailyLog.status_review != "Pending", *where)
+            .order_by(DailyLog.id)
+            .limit(limit)
+        )
+    ]
+
+
+def _copy(session, source, target, where):
+    columns = [column.name for column in target.columns]
+    session.execute(
+        insert(target).from_select(columns, select(*[source.c[name] for name in columns]).where(where))
+    )
+
+
+def archive_closed_logs(session, before=None, dry_run=False, chunk_size=LOG_ARCHIVE_CHUNK_SIZE, employee_ids=None):
+    """
+    Move reviewed logs dated before `before` (default hot_start()) and their
+    history rows to the archive, committing every chunk_size logs.
+    employee_ids (ids or a select of them) limits it to those employees.
+    Occupancy rows are kept, so overlap checks still see archived logs.
+    The owners' log versions are bumped, so cached views revalidate.
+    Returns {"before", "daily_logs", "daily_log_changes"} counts.
+
+    Raises ValueError for a `before` later than hot_start(): listings only
+    read the archive for dates before it, so such logs would vanish.
+    """
+    boundary = hot_start()
+    if before is not None and before > boundary:
+        raise ValueError(f"before must not be later than {boundary.isoformat()}, the start of the hot table")
+    before = before or boundary
+    logs, changes = DailyLog.__table__, DailyLogChange.__table__
+    scope = () if employee_ids is None else (logs.c.employee_id.in_(employee_ids),)
+    if dry_run:
+        closed = (logs.c.log_date < before, logs.c.status_review != "Pending", *scope)
+        return {
+            "before": before.isoformat(),
+            "daily_logs": session.execute(select(func.count()).select_from(logs).where(*closed)).scalar(),
+            "daily_log_changes": session.execute(
+                select(func.count()).select_from(changes)
+                .where(changes.c.daily_log_id.in_(select(logs.c.id).where(*closed)))
+            ).scalar(),
+        }
+
+    counts = {"before": before.isoformat(), "daily_logs": 0, "daily_log_changes": 0}
+    while True:
+        log_ids = _closed_log_ids(session, before, chunk_size, *scope)
+        if not log_ids:
+            return counts
+        owners = session.execute(select(logs.c.employee_id).where(logs.c.id.in_(log_ids)).distinct()).scalars().all()
+        _copy(session, logs, ArchivedDailyLog.__table__, logs.c.id.in_(log_ids))
+        _copy(session, changes, ArchivedDailyLogChange.__table__, changes.c.daily_log_id.in_(log_ids))
+        counts["daily_log_changes"] += session.execute(
+            delete(changes).where(changes.c.daily_log_id.in_(log_ids))
+        ).rowcount
+        counts["daily_logs"] += session.execute(delete(logs).where(logs.c.id.in_(log_ids))).rowcount
+        bump_log_versions(session, owners)
+        session.commit()
@@ -0,0 +1,69 @@
+import hashlib
+from datetime import datetime
+from flask import request, make_response
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from models.employeelogversion import EmployeeLogVersion
+
+
+def bump_log_versions(session, employee_ids):
+    """Increment the log version of each employee inside the caller's transaction."""
+    now = datetime.utcnow().replace(microsecond=0)
+    for employee_id in sorted(set(employee_ids)):
+        result = session.execute(
+            update(EmployeeLogVersion)
+            .where(EmployeeLogVersion.employee_id == employee_id)
+            .values(version=EmployeeLogVersion.version + 1, updated_at=now)
+        )
+        if result.rowcount:
+            continue
+        try:
+            with session.begin_nested():
+                session.add(EmployeeLogVersion(employee_id=employee_id, version=1, updated_at=now))
+        except IntegrityError:
+            # Another request created the row first; bump it instead
+            session.execute(
+                update(EmployeeLogVersion)
+                .where(EmployeeLogVersion.employee_id == employee_id)
+                .values(version=EmployeeLogVersion.version + 1, updated_at=now)
+            )
+
+
+def log_cache_validators(session, employee_id, *variant):
+    """
+    Return (etag, last_modified) for an employee's log views.
+
+    Only the version row is read. The request path/query and any extra
+    variant (e.g. the current date for rolling windows) are folded into the
+    ETag so different views of the same employee never share a tag.
+    """
+    row = session.get(EmployeeLogVersion, employee_id)
+    version = row.version if row else 0
+    last_modified = row.updated_at if row else None
+    key = f"{employee_id}:{version}:{request.full_path}:{':'.join(str(v) for v in variant)}"
+    etag = hashlib.sha1(key.encode()).hexdigest()[:20]
+    return etag, last_modified
+
+
+def is_not_modified(etag):
+    """
+    Evaluate If-None-Match. If-Modified-Since alone is not honoured:
+    Last-Modified has one-second resolution, so a client whose copy predates
+    a write made in the same second would get a stale 304. The ETag carries
+    the version and changes on every write.
+    """
+    return bool(request.if_none_match) and request.if_none_match.contains_weak(etag)
+
+
+def add_cache_validators(response, etag, last_modified=None):
+    response = make_response(response)
+    response.set_etag(etag, weak=True)
+    if last_modified:
+        response.last_modified = last_modified
+    # Clients may keep the body but must revalidate before reuse
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified_response(etag, last_modified=None):
+    return add_cache_validators(make_response("", 304), etag, last_modified)
@@ -0,0 +1,124 @@
+"""
+Atomic overlap checks for daily logs.
+
+Each (employee, date) has one daily_log_occupancy row of minute bitmaps.
+claim_log_interval() releases a log's old minutes and claims its new ones
+in a single conditional UPDATE per date, which only matches when none of
+the new minutes are taken. Concurrent saves are serialized by the row lock
+(the database lock on SQLite), so two overlapping logs cannot both commit.
+
+Rows are created lazily from the existing logs the first time a date is
+touched, so databases that predate the table need no backfill.
+"""
+from datetime import timedelta
+from sqlalchemy import and_, update
+from sqlalchemy.exc import IntegrityError
+from models.dailylogoccupancy import DailyLogOccupancy
+from models.dailylogs import DailyLog
+
+
+MINUTES_PER_DAY = 24 * 60
+HOUR_COLUMNS = [f"hour_{hour:02d}" for hour in range(24)]
+FULL_HOUR = (1 << 60) - 1
+
+
+def _minute(value):
+    return value.hour * 60 + value.minute
+
+
+def log_segments(log_date, start_time, end_time):
+    """Split a log into (date, start_minute, end_minute) pieces; overnight logs spill into the next date."""
+    start, end = _minute(start_time), _minute(end_time)
+    if end > start:
+        return [(log_date, start, end)]
+    segments = [(log_date, start, MINUTES_PER_DAY)]
+    if end:
+        segments.append((log_date + timedelta(days=1), 0, end))
+    return segments
+
+
+def _add_range(masks, start, end):
+    for hour in range(start // 60, (end - 1) // 60 + 1):
+        low = max(start, hour * 60) - hour * 60
+        high = min(end, hour * 60 + 60) - hour * 60
+        masks[hour] |= ((1 << (high - low)) - 1) << low
+
+
+def masks_by_date(intervals):
+    """Map date -> 24 hour masks for a list of (log_date, start_time, end_time)."""
+    result = {}
+    for log_date, start_time, end_time in intervals:
+        for day, start, end in log_segments(log_date, start_time, end_time):
+            _add_range(result.setdefault(day, [0] * 24), start, end)
+    return result
+
+
+def _build_row(session, employee_id, day):
+    # The day before is included for logs that run past midnight
+    logs = (
+        session.query(DailyLog.log_date, DailyLog.start_time, DailyLog.end_time)
+        .filter(
+            DailyLog.employee_id == employee_id,
+            DailyLog.log_date >= day - timedelta(days=1),
+            DailyLog.log_date <= day,
+        )
+        .all()
+    )
+    masks = masks_by_date(logs).get(day, [0] * 24)
+    return DailyLogOccupancy(
+        employee_id=employee_id,
+        log_date=day,
+        **dict(zip(HOUR_COLUMNS, masks))
+    )
+
+
+def _ensure_row(session, employee_id, day):
+    """Create the occupancy row from existing logs; return False if it already existed (e.g. added concurrently)."""
+    try:
+        with session.begin_nested():
+            session.add(_build_row(session, employee_id, day))
+        return True
+    except IntegrityError:
+        return False
+
+
+def _update_day(session, employee_id, day, release, claim):
+    table = DailyLogOccupancy.__table__
+    values = {}
+    conditions = [table.c.employee_id == employee_id, table.c.log_date == day]
+    for name, old, new in zip(HOUR_COLUMNS, release, claim):
+        if not old and not new:
+            continue
+        column = table.c[name]
+        keep = FULL_HOUR ^ old
+        values[name] = column.op("&")(keep).op("|")(new)
+        if new:
+            conditions.append(column.op("&")(keep).op("&")(new) == 0)
+    if not values:
+        return True
+    statement = update(table).where(and_(*conditions)).values(**values)
+    if session.execute(statement).rowcount:
+        return True
+    # No match: either the row does not exist yet or the claim overlaps.
+    # Create the row (a concurrent request may just have inserted it, which
+    # is as good) and retry; missing again means a real overlap.
+    _ensure_row(session, employee_id, day)
+    return bool(session.execute(statement).rowcount)
+
+
+def claim_log_interval(session, employee_id, new=None, old=None):
+    """
+    Move an employee's claimed minutes from `old` to `new` inside the caller's transaction.
+
+    `new` and `old` are (log_date, start_time, end_time) tuples or None.
+    Returns the first date whose minutes were already taken, or None on
+    success. On a conflict the caller must roll back, since earlier dates
+    may already have been updated.
+    """
+    claims = masks_by_date([new] if new else [])
+    releases = masks_by_date([old] if old else [])
+    for day in sorted(set(claims) | set(releases)):
+        empty = [0] * 24
+        if not _update_day(session, employee_id, day, releases.get(day, empty), claims.get(day, empty)):
+            return day
+    return None
@@ -0,0 +1,64 @@
+"""
+Per-worker cache of assembled /api/employee-info profiles, keyed by email.
+
+Entries expire after PROFILE_CACHE_TTL_SECONDS. Writes handled by this
+worker invalidate them right away: invalidate_employees() for changes to
+specific employees (e.g. project assignments), invalidate_all() for changes
+that can touch many profiles (department/designation edits, reporting-line
+changes, which alter every subordinate's manager chain).
+
+Hits are served without looking at replica routing, so profiles are only
+ever built from the primary (see handlers/employee/employee.py).
+"""
+import threading
+import time
+from collections import OrderedDict
+from config.config import PROFILE_CACHE_TTL_SECONDS, PROFILE_CACHE_MAX_ENTRIES
+
+
+class ProfileCache:
+    def __init__(self, ttl_seconds, max_entries):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # email -> (expires_at, employee_id, profile)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, email):
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[email]
+                return None
+            self._entries.move_to_end(email)
+            return entry[2]
+
+    def generation(self):
+        """Read before assembling a profile and pass to put(), so a concurrent invalidation wins."""
+        return self._generation
+
+    def put(self, email, employee_id, profile, generation):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[email] = (time.monotonic() + self.ttl_seconds, employee_id, profile)
+            self._entries.move_to_end(email)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_employees(self, employee_ids):
+        employee_ids = set(employee_ids)
+        with self._lock:
+            self._generation += 1
+            for email in [email for email, entry in self._entries.items() if entry[1] in employee_ids]:
+                del self._entries[email]
+
+    def invalidate_all(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+profile_cache = ProfileCache(PROFILE_CACHE_TTL_SECONDS, PROFILE_CACHE_MAX_ENTRIES)
@@ -0,0 +1,76 @@
+"""
+Which requests may read from a replica.
+
+GET/HEAD requests go to a replica unless the client wrote something within
+the last REPLICA_STICKY_SECONDS (read-your-writes). Every successful write
+answers with an X-Read-Primary-Until header (a Unix timestamp, exposed to
+browsers through CORS); clients echo it back as X-Read-Primary and their
+reads go to the primary until then; a flag value ("1", "true") always
+selects the primary. Same-site clients also get the deadline as a cookie,
+but the frontend calls the API cross-site without credentials, so it
+relies on the header (frontend/lib/api.js).
+
+The incremental feed and conditional GETs (If-None-Match; log views ignore
+If-Modified-Since, see utils/log_versions.py) always read the primary:
+replica lag can exceed FEED_OVERLAP_SECONDS, and a lagging replica would
+confirm a stale ETag.
+
+Kept apart from utils/session_manager.py so app startup can register the
+hook without importing SQLAlchemy.
+"""
+import time
+from flask import has_request_context, request
+from config.config import SQLALCHEMY_REPLICA_URIS, REPLICA_STICKY_SECONDS
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PRIMARY_COOKIE = "tms_primary_until"
+PRIMARY_HEADER = "X-Read-Primary"
+PRIMARY_UNTIL_HEADER = "X-Read-Primary-Until"
+CONDITIONAL_HEADERS = ("If-None-Match",)
+PRIMARY_ENDPOINTS = {"daily_logs.get_daily_logs_feed"}
+
+
+def _primary_until(value):
+    """Deadline from an echoed header or cookie; flags such as "1" or "true" mean "always"."""
+    if not value:
+        return 0
+    if value.lower() in ("1", "true", "yes"):
+        return float("inf")
+    try:
+        return float(value)
+    except ValueError:
+        return float("inf")
+
+
+def request_can_use_replica():
+    if not SQLALCHEMY_REPLICA_URIS or not has_request_context():
+        return False
+    if request.method not in SAFE_METHODS or request.endpoint in PRIMARY_ENDPOINTS:
+        return False
+    if any(header in request.headers for header in CONDITIONAL_HEADERS):
+        return False
+    primary_until = max(
+        _primary_until(request.headers.get(PRIMARY_HEADER)),
+        _primary_until(request.cookies.get(PRIMARY_COOKIE)),
+    )
+    return primary_until < time.time()
+
+
+def mark_primary_reads(response):
+    """after_request hook: pin the client to the primary for a while after a successful write."""
+    if SQLALCHEMY_REPLICA_URIS and request.method not in SAFE_METHODS and response.status_code < 400:
+        primary_until = f"{time.time() + REPLICA_STICKY_SECONDS:.3f}"
+        response.headers[PRIMARY_UNTIL_HEADER] = primary_until
+        response.set_cookie(
+            PRIMARY_COOKIE,
+            primary_until,
+            max_age=int(REPLICA_STICKY_SECONDS) + 1,
+            httponly=True,
+            samesite="Lax",
+        )
+    return response
+
+
+def init_replica_routing(app):
+    app.after_request(mark_primary_reads)
@@ -1,10 +1,58 @@
+import itertools
+import threading
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from config.config import SQLALCHEMY_DATABASE_URI
+from config.config import SQLALCHEMY_DATABASE_URI, SQLALCHEMY_REPLICA_URIS, QUERY_CACHE_SIZE
+from utils.replica_routing import request_can_use_replica
 
-engine = create_engine(SQLALCHEMY_DATABASE_URI)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# The engine (and its DB driver) is created on first use rather than at
+# import time, so starting a worker does not pay for it.
+engine = None
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+_engine_lock = threading.Lock()
 
-def get_session():
-    """Utility function to get a new SQLAlchemy session."""
-    return SessionLocal()
\ No newline at end of file
+# Read replicas (SQLALCHEMY_REPLICA_URIS), used round-robin for the
+# requests utils/replica_routing.py allows
+replica_engines = None
+_replica_cycle = None
+
+
+def get_engine():
+    global engine
+    if engine is None:
+        with _engine_lock:
+            if engine is None:
+                engine = create_engine(SQLALCHEMY_DATABASE_URI, query_cache_size=QUERY_CACHE_SIZE)
+    return engine
+
+
+def get_replica_engine():
+    """Return the next replica engine, or None when no replicas are configured."""
+    global replica_engines, _replica_cycle
+    if not SQLALCHEMY_REPLICA_URIS:
+        return None
+    if replica_engines is None:
+        with _engine_lock:
+            if replica_engines is None:
+                engines = [create_engine(uri, pool_pre_ping=True, query_cache_size=QUERY_CACHE_SIZE) for uri in SQLALCHEMY_REPLICA_URIS]
+                _replica_cycle = itertools.cycle(engines)
+                replica_engines = engines
+    return next(_replica_cycle)
+
+
+def get_session(use_replica=None):
+    """
+    Utility function to get a new SQLAlchemy session.
+
+    By default the session is bound to a replica for read-only requests
+    (see utils/replica_routing.py) and to the primary otherwise. Pass
+    use_replica=False for a session that must see or make writes.
+    """
+    if SessionLocal.kw.get("bind") is None:
+        SessionLocal.configure(bind=get_engine())
+    if use_replica is None:
+        use_replica = request_can_use_replica()
+    replica = get_replica_engine() if use_replica else None
+    if replica is not None:
+        return SessionLocal(bind=replica)
+    return SessionLocal()
@@ -0,0 +1,177 @@
+"""
+Bulk manager/project/employee staffing.
+
+Each request's (manager_id, project_id, employee_id) triples are checked
+with a handful of set queries, whatever their number, and the new rows go
+in with one INSERT that skips rows a concurrent request already added
+(ON CONFLICT DO NOTHING on PostgreSQL/SQLite, ON DUPLICATE KEY UPDATE on
+MySQL). Every item gets its own outcome; one bad item does not fail the
+others.
+"""
+from collections import Counter
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.exc import IntegrityError
+from models.employee import Employee
+from models.employeeproject import EmployeeProject
+from models.managerproject import ManagerProjectAssignment
+from models.project import Project
+
+
+TRIPLE_FIELDS = ("manager_id", "project_id", "employee_id")
+
+assignments = ManagerProjectAssignment.__table__
+employee_projects = EmployeeProject.__table__
+
+
+def parse_triples(items):
+    """Return one (manager_id, project_id, employee_id) tuple per item, or None where the item is malformed."""
+    triples = []
+    for item in items:
+        try:
+            triple = tuple(int(item[field]) for field in TRIPLE_FIELDS)
+        except (KeyError, TypeError, ValueError):
+            triple = None
+        if triple is not None and min(triple) <= 0:
+            triple = None
+        triples.append(triple)
+    return triples
+
+
+def _existing(session, column, values):
+    if not values:
+        return set()
+    return {value for (value,) in session.execute(select(column).where(column.in_(values)))}
+
+
+def _existing_pairs(session, table, first, second, pairs):
+    if not pairs:
+        return set()
+    columns = (table.c[first], table.c[second])
+    return set(session.execute(select(*columns).where(tuple_(*columns).in_(pairs))).all())
+
+
+def _existing_triples(session, triples):
+    if not triples:
+        return set()
+    columns = [assignments.c[field] for field in TRIPLE_FIELDS]
+    return set(session.execute(select(*columns).where(tuple_(*columns).in_(triples))).all())
+
+
+def _insert_ignoring_duplicates(session, rows):
+    dialect = session.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        session.execute(dialect_insert(assignments).values(rows).on_conflict_do_nothing())
+    elif dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        statement = dialect_insert(assignments).values(rows)
+        session.execute(statement.on_duplicate_key_update(manager_id=statement.inserted.manager_id))
+    else:
+        for row in rows:
+            try:
+                with session.begin_nested():
+                    session.execute(insert(assignments).values(row))
+            except IntegrityError:
+                pass
+
+
+def assign_triples(session, triples):
+    """
+    Add a ManagerProjectAssignment for every valid triple.
+
+    Returns a status per triple: assigned, already_assigned, duplicate (repeated
+    earlier in the same request), invalid, project_not_found,
+    manager_not_found, employee_not_found or manager_not_on_project.
+    The caller commits.
+    """
+    valid = [triple for triple in triples if triple]
+    projects = _existing(session, Project.id, {project_id for _, project_id, _ in valid})
+    people = _existing(session, Employee.id, {m for m, _, _ in valid} | {e for _, _, e in valid})
+    # A manager may staff a project they are a member of
+    manager_projects = _existing_pairs(
+        session, employee_projects, "employee_id", "project_id",
+        list({(manager_id, project_id) for manager_id, project_id, _ in valid}),
+    )
+    assigned = _existing_triples(session, list(set(valid)))
+
+    statuses, rows, seen = [], [], set()
+    for triple in triples:
+        if triple is None:
+            statuses.append("invalid")
+            continue
+        manager_id, project_id, employee_id = triple
+        if project_id not in projects:
+            status = "project_not_found"
+        elif manager_id not in people:
+            status = "manager_not_found"
+        elif employee_id not in people:
+            status = "employee_not_found"
+        elif (manager_id, project_id) not in manager_projects:
+            status = "manager_not_on_project"
+        elif triple in assigned:
+            status = "already_assigned"
+        elif triple in seen:
+            status = "duplicate"
+        else:
+            status = "assigned"
+            seen.add(triple)
+            rows.append(dict(zip(TRIPLE_FIELDS, triple)))
+        statuses.append(status)
+    if rows:
+        _insert_ignoring_duplicates(session, rows)
+    return statuses
+
+
+def remove_triples(session, triples):
+    """
+    Delete the ManagerProjectAssignment of every triple, and the employee's
+    EmployeeProject row for that project. Returns removed, not_found,
+    duplicate or invalid per triple. The caller commits.
+    """
+    valid = list({triple for triple in triples if triple})
+    found = _existing_triples(session, valid)
+    statuses, seen = [], set()
+    for triple in triples:
+        if triple is None:
+            statuses.append("invalid")
+        elif triple in seen:
+            statuses.append("duplicate")
+        elif triple in found:
+            statuses.append("removed")
+            seen.add(triple)
+        else:
+            statuses.append("not_found")
+    if seen:
+        columns = [assignments.c[field] for field in TRIPLE_FIELDS]
+        session.execute(delete(assignments).where(tuple_(*columns).in_(list(seen))))
+        pairs = list({(employee_id, project_id) for _, project_id, employee_id in seen})
+        session.execute(
+            delete(employee_projects)
+            .where(tuple_(employee_projects.c.employee_id, employee_projects.c.project_id).in_(pairs))
+        )
+    return statuses
+
+
+def staffing_response(items, triples, statuses):
+    """Build the per-item results and a status summary for a bulk response."""
+    results = []
+    for index, (item, triple, status) in enumerate(zip(items, triples, statuses)):
+        result = {"index": index, "status": status}
+        if triple:
+            result.update(zip(TRIPLE_FIELDS, triple))
+        elif isinstance(item, dict):
+            result.update({field: item.get(field) for field in TRIPLE_FIELDS})
+        results.append(result)
+    return {"results": results, "summary": dict(Counter(statuses))}
+
+
+def touched_employees(triples, statuses, ok):
+    """Manager and employee ids of the triples whose status is ok (for cache invalidation)."""
+    ids = set()
+    for triple, status in zip(triples, statuses):
+        if status == ok:
+            ids.update((triple[0], triple[2]))
+    return ids
@@ -0,0 +1,84 @@
+"""
+Import-time breakdown for worker startup.
+
+Set STARTUP_PROFILE=1 and the app factory logs how long each top-level
+package took to import, plus the wall time of each startup phase. The
+numbers are self time (children excluded), the same split as
+`python -X importtime`, rolled up per top-level package.
+"""
+import builtins
+import logging
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class ImportProfiler:
+    def __init__(self):
+        self.package_times = defaultdict(float)
+        self.phase_times = []
+        self._stack = []
+        self._original_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only first-time imports cost anything; skip the sys.modules hits
+        if level or name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            children = self._stack.pop()
+            self.package_times[name.partition(".")[0]] += elapsed - children
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    def start(self):
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times.append((name, time.perf_counter() - started))
+
+    def report(self, top=15):
+        lines = ["Startup breakdown:"]
+        for name, seconds in self.phase_times:
+            lines.append(f"  phase  {name:<28} {seconds * 1000:8.1f} ms")
+        ranked = sorted(self.package_times.items(), key=lambda item: item[1], reverse=True)
+        for name, seconds in ranked[:top]:
+            lines.append(f"  import {name:<28} {seconds * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+class _NullProfiler:
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    def report(self, top=15):
+        return ""
+
+
+def get_profiler(enabled):
+    return ImportProfiler() if enabled else _NullProfiler()
@@ -0,0 +1,74 @@
+"""
+Prebuilt statements for the small, frequent reads behind the project and
+today/seven-day views.
+
+Query-API code rebuilds its statement and recomputes the statement's cache
+key on every call. These are built once at import with bindparam()
+placeholders, so a call only binds values: the cache key is memoized on the
+statement and the compiled form comes from the engine's cache
+(QUERY_CACHE_SIZE entries). This is the SQLAlchemy 2 replacement for baked
+queries; lambda_stmt() measured slower than this for ORM selects (see
+bench_queries.py). Keep statements here fixed-shape; lists go through
+expanding bind parameters.
+"""
+from sqlalchemy import bindparam, func, select
+from models.dailylogchanges import DailyLogChange
+from models.dailylogs import DailyLog
+from models.department import Department
+from models.employee import Employee
+from models.project import Project
+
+
+PROJECT_BY_ID = select(Project).where(Project.id == bindparam("project_id"))
+
+EMPLOYEE_TIMEZONE = (
+    select(func.coalesce(Employee.timezone, Department.timezone))
+    .select_from(Employee)
+    .outerjoin(Department, Department.id == Employee.department_id)
+    .where(Employee.id == bindparam("employee_id"))
+)
+
+LOGS_ON_DAY = select(DailyLog).where(
+    DailyLog.employee_id == bindparam("employee_id"), DailyLog.log_date == bindparam("day")
+)
+
+LOGS_BETWEEN = (
+    select(DailyLog)
+    .where(
+        DailyLog.employee_id == bindparam("employee_id"),
+        DailyLog.log_date >= bindparam("start"),
+        DailyLog.log_date <= bindparam("end")
+    )
+    .order_by(DailyLog.log_date.desc())
+)
+
+CHANGES_FOR_LOGS = (
+    select(DailyLogChange)
+    .where(DailyLogChange.daily_log_id.in_(bindparam("log_ids", expanding=True)))
+    .order_by(DailyLogChange.id)
+)
+
+
+def project_by_id(session, project_id):
+    return session.execute(PROJECT_BY_ID, {"project_id": project_id}).scalar_one_or_none()
+
+
+def employee_timezone_row(session, employee_id):
+    """(employee or department zone,) for the employee, or None if they do not exist."""
+    return session.execute(EMPLOYEE_TIMEZONE, {"employee_id": employee_id}).first()
+
+
+def logs_on_day(session, employee_id, day):
+    return session.execute(LOGS_ON_DAY, {"employee_id": employee_id, "day": day}).scalars().all()
+
+
+def logs_between(session, employee_id, start, end):
+    """The employee's logs dated start..end inclusive, newest first."""
+    return session.execute(
+        LOGS_BETWEEN, {"employee_id": employee_id, "start": start, "end": end}
+    ).scalars().all()
+
+
+def changes_for_logs(session, log_ids):
+    """History rows of the given logs, oldest first."""
+    return session.execute(CHANGES_FOR_LOGS, {"log_ids": list(log_ids)}).scalars().all()
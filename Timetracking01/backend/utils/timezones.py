@@ -0,0 +1,72 @@
+"""
+Timezone resolution for "today"-relative log views.
+
+An employee's zone is their own `timezone` column, falling back to their
+department's and then DEFAULT_TIMEZONE. tzinfo objects, per-day UTC
+boundaries and each zone's current local date are cached; the local date is
+recomputed only once the cached day's UTC end has passed.
+"""
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+from functools import lru_cache
+import pytz
+from config.config import DEFAULT_TIMEZONE
+from utils.statements import employee_timezone_row
+
+
+# One local calendar day as a half-open [start_utc, end_utc) range of naive
+# UTC datetimes, the way timestamps are stored in the database.
+DayWindow = namedtuple("DayWindow", ["local_date", "start_utc", "end_utc"])
+
+_today_cache = {}
+_today_lock = threading.Lock()
+
+
+def is_valid_timezone(name):
+    return isinstance(name, str) and name in pytz.all_timezones_set
+
+
+@lru_cache(maxsize=None)
+def get_tzinfo(name):
+    """Return the cached tzinfo for name, or DEFAULT_TIMEZONE's if name is unknown."""
+    if not is_valid_timezone(name):
+        name = DEFAULT_TIMEZONE
+    return pytz.timezone(name)
+
+
+def _to_naive_utc(tz, local_dt):
+    # localize() picks the right offset for the date, including DST changes
+    return tz.localize(local_dt).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=4096)
+def day_window(tz_name, day):
+    tz = get_tzinfo(tz_name)
+    start = datetime.combine(day, datetime.min.time())
+    return DayWindow(
+        day,
+        _to_naive_utc(tz, start),
+        _to_naive_utc(tz, start + timedelta(days=1)),
+    )
+
+
+def local_today(tz_name):
+    """Return the DayWindow for the current local date in tz_name."""
+    tz_name = tz_name if is_valid_timezone(tz_name) else DEFAULT_TIMEZONE
+    now = datetime.utcnow()
+    window = _today_cache.get(tz_name)
+    if window is None or not (window.start_utc <= now < window.end_utc):
+        today = pytz.utc.localize(now).astimezone(get_tzinfo(tz_name)).date()
+        window = day_window(tz_name, today)
+        with _today_lock:
+            _today_cache[tz_name] = window
+    return window
+
+
+def get_employee_timezone(session, employee_id):
+    """Return the employee's effective zone name, or None if the employee does not exist."""
+    row = employee_timezone_row(session, employee_id)
+    if row is None:
+        return None
+    return row[0] or DEFAULT_TIMEZONE
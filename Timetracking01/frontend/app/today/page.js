@@ -1,6 +1,6 @@
 "use client";
 
-import { useState, useEffect, useCallback, useMemo } from "react";
+import { useState, useEffect, useCallback, useMemo, useRef } from "react";
 import { useRouter } from "next/navigation";
 import {
   Clock,
@@ -17,10 +17,14 @@ import Header from "../../components/header";
 import Sidebar from "../../components/sidebar";
 import Footer from "../../components/footer";
 import DateFilterDropdown from "../../components/datefilterdropdown";
+import { apiFetch, idempotentFetch } from "@/lib/api";
 
 const BASE_URL = process.env.NEXT_PUBLIC_BACKEND_URL || "http://127.0.0.1:5000";
 const CURRENT_EMAIL = process.env.NEXT_PUBLIC_EMAIL || "";
 const AUTH_TOKEN = process.env.NEXT_PUBLIC_AUTH_TOKEN || "";
+// Edits of saved logs are autosaved this long after the last keystroke; the
+// backend coalesces them further before writing (utils/autosave.py)
+const AUTOSAVE_DELAY_MS = 1000;
 
 const toastConfig = {
   position: "top-right",
@@ -186,6 +190,32 @@ function checkDuplicateEntry(logs, currentLog, currentIdx) {
   return null;
 }
 
+function isSavableLog(log) {
+  return Boolean(
+    log.project_id &&
+    isValidTime(log.start_time) &&
+    isValidTime(log.end_time) &&
+    log.description &&
+    !log.error &&
+    getTotalMinutes(log.start_time, log.end_time) > 0
+  );
+}
+
+function buildLogPayload(log, date, employee) {
+  return {
+    id: String(log.id).startsWith("temp-") ? null : parseInt(log.id, 10),
+    employee_id: employee.id,
+    log_date: date,
+    project_id: parseInt(log.project_id, 10),
+    start_time: log.start_time,
+    end_time: log.end_time,
+    total_hours: getTotalMinutes(log.start_time, log.end_time) / 60,
+    task_description: log.description,
+    status_review: "pending",
+    reviewer_id: employee.reviewer_id || null, // Ensure this is included
+  };
+}
+
 // DailyLogChangesDialog Component
 const DailyLogChangesDialog = ({ open, onOpenChange, logChanges, projects }) => {
   const getProjectName = (pid) => {
@@ -600,7 +630,7 @@ export default function TodayTimesheet() {
     const fetchEmployeeData = async () => {
       setLoading(true);
       try {
-        const response = await fetch(
+        const response = await apiFetch(
           `${BASE_URL}/api/employee-info?email=${encodeURIComponent(CURRENT_EMAIL)}`,
           {
             method: "GET",
@@ -636,7 +666,7 @@ export default function TodayTimesheet() {
     if (!employee?.id) return;
     setLoading(true);
     try {
-      const response = await fetch(`${BASE_URL}/api/daily-logs/today/${employee.id}`, {
+      const response = await apiFetch(`${BASE_URL}/api/daily-logs/today/${employee.id}`, {
         method: "GET",
         headers: {
           "Content-Type": "application/json",
@@ -697,6 +727,65 @@ export default function TodayTimesheet() {
     }
   }, [employee?.id, fetchTodayLogs]);
 
+  // Autosave edits of saved logs once the user pauses typing
+  const unsentEdits = useRef(null);
+  useEffect(() => {
+    if (!employee?.id) return;
+    const date = todayDateObj.date;
+    const edited = (logsByDay[date] || [])
+      .filter((log) => log.isEdited && !String(log.id).startsWith("temp-") && isSavableLog(log))
+      .map((log) => buildLogPayload(log, date, employee));
+    if (edited.length === 0) return;
+    unsentEdits.current = edited;
+    const timer = setTimeout(async () => {
+      unsentEdits.current = null;
+      try {
+        const res = await apiFetch(`${BASE_URL}/api/daily-logs/save?autosave=1`, {
+          method: "POST",
+          headers: {
+            "Content-Type": "application/json",
+            "Authorization": `Bearer ${AUTH_TOKEN}`,
+          },
+          body: JSON.stringify(edited),
+        });
+        const data = await res.json();
+        if (!res.ok) {
+          throw new Error(data.error || "Failed to autosave");
+        }
+        (data.errors || []).forEach((message) => {
+          toast.error(`Autosave failed: ${message}`, { ...toastConfig });
+        });
+      } catch (error) {
+        toast.error(`Error autosaving log: ${error.message}`, {
+          ...toastConfig,
+        });
+      }
+    }, AUTOSAVE_DELAY_MS);
+    return () => clearTimeout(timer);
+  }, [logsByDay, employee, todayDateObj.date]);
+
+  // Write buffered autosaves (and edits not posted yet) when the page is
+  // hidden or closed. sendBeacon survives unload; its text/plain body avoids
+  // a CORS preflight.
+  useEffect(() => {
+    if (!employee?.id) return;
+    const flush = () => {
+      const body = { employee_id: employee.id, logs: unsentEdits.current || [] };
+      unsentEdits.current = null;
+      navigator.sendBeacon(`${BASE_URL}/api/daily-logs/autosave/flush`, JSON.stringify(body));
+    };
+    const flushIfHidden = () => {
+      if (document.visibilityState === "hidden") flush();
+    };
+    window.addEventListener("pagehide", flush);
+    document.addEventListener("visibilitychange", flushIfHidden);
+    return () => {
+      window.removeEventListener("pagehide", flush);
+      document.removeEventListener("visibilitychange", flushIfHidden);
+      flush(); // navigating away inside the app
+    };
+  }, [employee?.id]);
+
   const handleSaveLog = async (date, idx) => {
     if (!isValidDate(date)) {
       toast.error("Invalid date for saving logs.", {
@@ -734,25 +823,12 @@ export default function TodayTimesheet() {
       return;
     }
 
-    const totalHoursFloat = totalMinutes / 60;
-const payload = [
-  {
-    id: String(log.id).startsWith("temp-") ? null : parseInt(log.id, 10),
-    employee_id: employee.id,
-    log_date: date,
-    project_id: parseInt(log.project_id, 10),
-    start_time: log.start_time,
-    end_time: log.end_time,
-    total_hours: totalHoursFloat,
-    task_description: log.description,
-    status_review: "pending",
-    reviewer_id: employee.reviewer_id || null, // Ensure this is included
-  },
-];
+    const payload = [buildLogPayload(log, date, employee)];
 
     setLoading(true);
     try {
-      const res = await fetch(`${BASE_URL}/api/daily-logs/save`, {
+      // One key per save; retries after a lost response reuse it
+      const res = await idempotentFetch(`${BASE_URL}/api/daily-logs/save`, {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
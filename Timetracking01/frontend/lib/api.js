@@ -0,0 +1,60 @@
+// fetch() for the backend API with read-your-writes across replicas.
+//
+// After a successful write the backend returns X-Read-Primary-Until; until
+// that time this module sends it back as X-Read-Primary so reads go to the
+// primary DB instead of a possibly lagging replica. The API is cross-site
+// and called without credentials, so a cookie would not work here.
+
+const PRIMARY_UNTIL_KEY = "tms_read_primary_until";
+
+function readPrimaryUntil() {
+  if (typeof window === "undefined") return 0;
+  return Number(window.sessionStorage.getItem(PRIMARY_UNTIL_KEY)) || 0;
+}
+
+export async function apiFetch(url, options = {}) {
+  const headers = { ...(options.headers || {}) };
+  const primaryUntil = readPrimaryUntil();
+  if (primaryUntil * 1000 > Date.now()) {
+    headers["X-Read-Primary"] = String(primaryUntil);
+  }
+  const response = await fetch(url, { ...options, headers });
+  const until = response.headers.get("X-Read-Primary-Until");
+  if (until && typeof window !== "undefined") {
+    window.sessionStorage.setItem(PRIMARY_UNTIL_KEY, until);
+  }
+  return response;
+}
+
+// Writes the backend may have run although the response was lost (timeout,
+// dropped connection) are retried with the same Idempotency-Key, so the
+// backend runs them once and replays the first outcome (utils/idempotency.py).
+// 409 means the first attempt is still running; 503 comes from admission
+// control before the write ran. Both carry Retry-After.
+const RETRY_STATUSES = [409, 503];
+const MAX_RETRIES = 3;
+
+function newIdempotencyKey() {
+  if (typeof crypto !== "undefined" && crypto.randomUUID) return crypto.randomUUID();
+  // crypto.randomUUID needs a secure context (https or localhost)
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+}
+
+function retryDelayMs(response, attempt) {
+  const retryAfter = Number(response?.headers.get("Retry-After"));
+  return retryAfter > 0 ? retryAfter * 1000 : 500 * 2 ** attempt;
+}
+
+export async function idempotentFetch(url, options = {}) {
+  const headers = { ...(options.headers || {}), "Idempotency-Key": newIdempotencyKey() };
+  for (let attempt = 0; ; attempt++) {
+    let response = null;
+    try {
+      response = await apiFetch(url, { ...options, headers });
+      if (attempt >= MAX_RETRIES || !RETRY_STATUSES.includes(response.status)) return response;
+    } catch (error) {
+      if (attempt >= MAX_RETRIES) throw error; // network error: the request may or may not have run
+    }
+    await new Promise((resolve) => setTimeout(resolve, retryDelayMs(response, attempt)));
+  }
+}